@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Shared helpers for benchmarks and soak tests.
+
+Both need a real Tk display; on machines without one they start a private
+Xvfb server (xvfb-run works as well).
+"""
+import os
+import shutil
+import subprocess
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+from tkinter import scrolledtext
+
+# Add src to path for imports
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+src_dir = os.path.join(parent_dir, 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from wizard import WizardApp, WizardStep, WizardProcess, ProgressBarAdapter
+
+
+def ensure_display(display=":99"):
+    """
+    Start Xvfb if there is no X display.
+    
+    Returns:
+        Xvfb subprocess (terminate it when done) or None if a display exists
+    """
+    if os.environ.get('DISPLAY') or sys.platform in ('win32', 'darwin'):
+        return None
+    
+    xvfb = shutil.which('Xvfb')
+    if not xvfb:
+        raise RuntimeError("No display and Xvfb not found; install Xvfb or run under xvfb-run")
+    
+    server = subprocess.Popen([xvfb, display, '-screen', '0', '1920x1080x24', '-nolisten', 'tcp'],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ['DISPLAY'] = display
+    time.sleep(0.5)  # Give server time to start
+    return server
+
+
+def pump(root, predicate=None, timeout=10.0):
+    """
+    Process Tk events until predicate() is true (or only pending events if no predicate).
+    
+    Returns:
+        True if predicate became true before timeout
+    """
+    deadline = time.perf_counter() + timeout
+    while True:
+        root.update()
+        if predicate is None or predicate():
+            return True
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.0005)
+
+
+def summarize(samples):
+    """Summary of timing samples in seconds -> milliseconds"""
+    ordered = sorted(samples)
+    count = len(ordered)
+    return {
+        'mean_ms': sum(ordered) / count * 1000.0,
+        'min_ms': ordered[0] * 1000.0,
+        'p50_ms': ordered[count // 2] * 1000.0,
+        'p95_ms': ordered[min(count - 1, int(count * 0.95))] * 1000.0,
+        'max_ms': ordered[-1] * 1000.0,
+        'samples': count,
+    }
+
+
+class BenchStep(WizardStep):
+    """Typical form step: title, description, a few inputs"""
+    
+    def __init__(self, wizard_app):
+        super().__init__(wizard_app)
+        self.value = tk.StringVar(master=wizard_app.root, value="value")
+        self.option = tk.BooleanVar(master=wizard_app.root, value=False)
+    
+    def create_content(self, content_frame):
+        ttk.Label(content_frame, text="Benchmark Step", style='Wizard.Title.TLabel').pack(anchor=tk.W)
+        ttk.Label(content_frame, text="Description of the step.",
+                  style='Wizard.Body.TLabel').pack(anchor=tk.W, pady=(0, 10))
+        ttk.Entry(content_frame, textvariable=self.value).pack(fill=tk.X)
+        ttk.Checkbutton(content_frame, text="Option", variable=self.option).pack(anchor=tk.W)
+    
+    def create_process(self):
+        return None
+
+
+class FloodProcess(WizardProcess):
+    """Process writing log lines or progress updates at a given rate"""
+    
+    def __init__(self, count, rate=None, kind="log", **kwargs):
+        """
+        Args:
+            count: number of log lines / progress updates
+            rate: updates per second (None - as fast as possible)
+            kind: "log" or "progress"
+        """
+        super().__init__(**kwargs)
+        self.count = count
+        self.rate = rate
+        self.kind = kind
+        self.finished_at = None
+    
+    def run(self):
+        self.start_time = time.time()
+        started = time.perf_counter()
+        for i in range(self.count):
+            if self.is_cancelled():
+                break
+            if self.kind == "log":
+                self.log("[INFO] line {} of {}".format(i + 1, self.count))
+            else:
+                self.update_progress((i + 1) * 100.0 / self.count)
+            if self.rate:
+                # Pace to requested rate
+                ahead = started + (i + 1) / self.rate - time.perf_counter()
+                if ahead > 0:
+                    time.sleep(ahead)
+        self.finished_at = time.perf_counter()
+        self.set_success(True)
+
+
+class FloodStep(WizardStep):
+    """Step with log console and progress bar running a FloodProcess"""
+    
+    def __init__(self, wizard_app, count, rate=None, kind="log"):
+        super().__init__(wizard_app)
+        self.count = count
+        self.rate = rate
+        self.kind = kind
+    
+    def create_content(self, content_frame):
+        self.progress_var = tk.DoubleVar(master=content_frame)
+        self.progress_bar = ttk.Progressbar(content_frame, variable=self.progress_var, maximum=100)
+        self.progress_bar.pack(fill=tk.X)
+        self.percent_label = ttk.Label(content_frame, text="0%")
+        self.percent_label.pack(anchor=tk.W)
+        self.log_text = scrolledtext.ScrolledText(content_frame, height=10, width=60)
+        self.log_text.pack(fill=tk.BOTH, expand=True)
+    
+    def create_process(self):
+        progress_interface = ProgressBarAdapter(self.progress_bar, progress_var=self.progress_var,
+                                                percent_label=self.percent_label)
+        return FloodProcess(self.count, self.rate, self.kind,
+                            progress_interface=progress_interface,
+                            logger=self.log_text,
+                            state_callback=self._on_process_complete)
+
+
+def build_wizard(step_count, steps_factory=None):
+    """
+    Create Tk root and WizardApp with step_count BenchSteps.
+    
+    Returns:
+        (root, wizard)
+    """
+    root = tk.Tk()
+    wizard = WizardApp(root)
+    if steps_factory is None:
+        steps = [BenchStep(wizard) for _ in range(step_count)]
+    else:
+        steps = steps_factory(wizard)
+    wizard.set_steps(steps)
+    pump(root)
+    return root, wizard
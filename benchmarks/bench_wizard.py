@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for wizard hot paths.
+
+Times show_current_step, update_sidebar and _calculate_optimal_size with 10,
+100 and 1000 steps, WizardProcess.log throughput and update_progress flood
+handling at several rates. Results are written as JSON and can be compared
+with a stored baseline.
+
+Usage:
+    python benchmarks/bench_wizard.py --output results.json
+    python benchmarks/bench_wizard.py --baseline baseline.json --threshold 1.25
+
+Without a display a private Xvfb server is started (or use xvfb-run).
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tkinter as tk
+
+from _harness import ensure_display, pump, summarize, build_wizard, FloodStep
+from wizard import StepStatus
+from wizard.metrics import WIZARD_METRICS
+
+STEP_COUNTS = (10, 100, 1000)
+LOG_RATES = (None, 2000, 200)  # lines per second (None - unthrottled)
+PROGRESS_RATES = (None, 10000, 1000)  # updates per second
+
+
+def bench_navigation(step_count, iterations):
+    """Time show_current_step, update_sidebar and _calculate_optimal_size"""
+    root, wizard = build_wizard(step_count)
+    results = {}
+    try:
+        samples = []
+        for i in range(iterations):
+            wizard.current_step_index = (i % (len(wizard.steps) - 1)) + 1
+            started = time.perf_counter()
+            wizard.show_current_step()
+            samples.append(time.perf_counter() - started)
+            pump(root)
+        results['show_current_step[steps={}]'.format(step_count)] = summarize(samples)
+        
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            wizard.update_sidebar()
+            samples.append(time.perf_counter() - started)
+            pump(root)
+        results['update_sidebar[steps={}]'.format(step_count)] = summarize(samples)
+        
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            wizard._calculate_optimal_size()
+            samples.append(time.perf_counter() - started)
+        results['calculate_optimal_size[steps={}]'.format(step_count)] = summarize(samples)
+    finally:
+        root.destroy()
+    return results
+
+
+def _run_flood(kind, count, rate):
+    """Run FloodStep and return (elapsed seconds until UI caught up, process)"""
+    root, wizard = build_wizard(0, lambda w: [FloodStep(w, count, rate, kind)])
+    try:
+        # Welcome step is first - go to flood step
+        started = time.perf_counter()
+        wizard.next_step()
+        step = wizard.steps[wizard.current_step_index]
+        # Completion callback is queued after all earlier UI updates
+        done = pump(root, lambda: step.status != StepStatus.RUNNING, timeout=120.0)
+        pump(root)  # Apply callbacks still queued
+        elapsed = time.perf_counter() - started
+        if not done:
+            raise RuntimeError("{} flood did not finish".format(kind))
+        return elapsed, step.process
+    finally:
+        root.destroy()
+
+
+def bench_log(count, rate):
+    elapsed, process = _run_flood("log", count, rate)
+    return {
+        'elapsed_ms': elapsed * 1000.0,
+        'lines_per_sec': count / elapsed,
+        'lines': count,
+    }
+
+
+def bench_progress(count, rate):
+    progress_updates = WIZARD_METRICS['progress_updates']
+    before = {outcome: progress_updates.get(outcome=outcome) for outcome in ("applied", "coalesced", "dropped")}
+    elapsed, process = _run_flood("progress", count, rate)
+    after = {outcome: progress_updates.get(outcome=outcome) for outcome in before}
+    return {
+        'elapsed_ms': elapsed * 1000.0,
+        'updates_per_sec': count / elapsed,
+        'updates': count,
+        'applied': after['applied'] - before['applied'],
+        'coalesced': after['coalesced'] - before['coalesced'],
+        'dropped': after['dropped'] - before['dropped'],
+    }
+
+
+def run_all(quick=False):
+    iterations = 5 if quick else 30
+    results = {}
+    for step_count in STEP_COUNTS:
+        print("navigation, {} steps...".format(step_count), file=sys.stderr)
+        results.update(bench_navigation(step_count, iterations))
+    
+    lines = 500 if quick else 5000
+    for rate in LOG_RATES:
+        count = lines if rate is None else min(lines, rate * 2)
+        print("log, rate {}...".format(rate or "max"), file=sys.stderr)
+        results['log[rate={}]'.format(rate or "max")] = bench_log(count, rate)
+    
+    updates = 2000 if quick else 20000
+    for rate in PROGRESS_RATES:
+        count = updates if rate is None else min(updates, rate * 2)
+        print("progress, rate {}...".format(rate or "max"), file=sys.stderr)
+        results['progress[rate={}]'.format(rate or "max")] = bench_progress(count, rate)
+    return results
+
+
+# Metrics compared with baseline: name -> True if higher is better
+COMPARED_METRICS = {
+    'mean_ms': False,
+    'p95_ms': False,
+    'elapsed_ms': False,
+    'lines_per_sec': True,
+    'updates_per_sec': True,
+}
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results with baseline.
+    
+    Returns:
+        List of regression descriptions (slower than baseline by more than threshold)
+    """
+    regressions = []
+    for name, values in sorted(results.items()):
+        base_values = baseline.get('results', {}).get(name)
+        if not base_values:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            if metric not in values or not base_values.get(metric):
+                continue
+            ratio = values[metric] / base_values[metric]
+            if higher_is_better:
+                ratio = 1.0 / ratio if ratio else float('inf')
+            marker = ""
+            if ratio > threshold:
+                marker = "  REGRESSION"
+                regressions.append("{} {}: {:.2f}x worse".format(name, metric, ratio))
+            print("{:45s} {:16s} {:10.2f} -> {:10.2f} ({:.2f}x){}".format(
+                name, metric, base_values[metric], values[metric], ratio, marker), file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wizard hot path benchmarks")
+    parser.add_argument('--output', help="write results JSON to this file")
+    parser.add_argument('--baseline', help="baseline results JSON to compare with")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="fail if a metric is this many times worse than baseline")
+    parser.add_argument('--quick', action='store_true', help="fewer iterations (smoke run)")
+    args = parser.parse_args()
+    
+    xvfb = ensure_display()
+    try:
+        results = run_all(quick=args.quick)
+    finally:
+        if xvfb:
+            xvfb.terminate()
+    
+    report = {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'tk': tk.TkVersion,
+            'platform': platform.platform(),
+            'quick': args.quick,
+        },
+        'results': results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+    
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\n{} regression(s):\n  {}".format(len(regressions), "\n  ".join(regressions)),
+                  file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Soak test and leak detector for long wizard sessions.
+
+Drives thousands of Next/Back cycles through form steps and steps with
+processes (status changes RUNNING -> SUCCESS on every visit). Every cycle it
+records traced Python memory (tracemalloc), the number of Tk widgets, alive
+threads and pending after() callbacks. After warm-up, growth above the
+configured thresholds fails the run and prints the top allocation sites
+(difference of tracemalloc snapshots taken after warm-up and at the end).
+
+Usage:
+    python benchmarks/soak_wizard.py --cycles 2000 --report soak.json
+    python benchmarks/soak_wizard.py --max-memory-growth-kb 1024 --max-widget-growth 0
+
+Without a display a private Xvfb server is started (or use xvfb-run).
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+import tracemalloc
+
+from _harness import ensure_display, pump, build_wizard, BenchStep, FloodStep
+from wizard import StepStatus
+
+
+def count_widgets(widget):
+    """Total number of widgets in the tree below widget"""
+    children = widget.winfo_children()
+    return len(children) + sum(count_widgets(child) for child in children)
+
+
+def pending_after_callbacks(root):
+    return len(root.tk.splitlist(root.tk.call('after', 'info')))
+
+
+def build_steps(wizard):
+    """Form steps mixed with short log/progress processes"""
+    return [
+        BenchStep(wizard),
+        FloodStep(wizard, 20, kind="log"),
+        BenchStep(wizard),
+        FloodStep(wizard, 50, kind="progress"),
+        BenchStep(wizard),
+    ]
+
+
+def wait_idle(root, wizard, timeout=30.0):
+    """Wait until current step process is not running"""
+    def idle():
+        step = wizard.steps[wizard.current_step_index]
+        return step.status != StepStatus.RUNNING
+    if not pump(root, idle, timeout):
+        raise RuntimeError("Step process did not finish within {} s".format(timeout))
+
+
+def run_cycle(root, wizard):
+    """Go forward to the last step before the end step, then back to the first one"""
+    last_index = len(wizard.steps) - 2
+    while wizard.current_step_index < last_index:
+        wait_idle(root, wizard)
+        wizard.next_step()
+        pump(root)
+    while wizard.current_step_index > 0:
+        wait_idle(root, wizard)
+        wizard.prev_step()
+        pump(root)
+    wait_idle(root, wizard)
+
+
+def take_sample(root, cycle):
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        'cycle': cycle,
+        'time': time.time(),
+        'memory_kb': current / 1024.0,
+        'widgets': count_widgets(root),
+        'threads': threading.active_count(),
+        'after_callbacks': pending_after_callbacks(root),
+    }
+
+
+def run_soak(cycles, warmup, report_every):
+    root, wizard = build_wizard(0, build_steps)
+    samples = []
+    try:
+        for cycle in range(warmup):
+            run_cycle(root, wizard)
+        
+        tracemalloc.start(25)
+        baseline_snapshot = tracemalloc.take_snapshot()
+        samples.append(take_sample(root, 0))
+        
+        for cycle in range(1, cycles + 1):
+            run_cycle(root, wizard)
+            # Let finished threads exit before counting
+            pump(root)
+            time.sleep(0.005)
+            samples.append(take_sample(root, cycle))
+            if cycle % report_every == 0 or cycle == cycles:
+                print("cycle {:6d}  mem {:9.1f} KB  widgets {:5d}  threads {:3d}  after {:3d}".format(
+                    cycle, samples[-1]['memory_kb'], samples[-1]['widgets'],
+                    samples[-1]['threads'], samples[-1]['after_callbacks']), file=sys.stderr)
+        
+        final_snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+    finally:
+        root.destroy()
+    
+    top_growth = [str(stat) for stat in final_snapshot.compare_to(baseline_snapshot, 'lineno')[:10]]
+    return samples, top_growth
+
+
+def check_growth(samples, limits):
+    """
+    Compare last sample with the first one.
+    
+    Returns:
+        List of failures (metric grew more than its limit)
+    """
+    first, last = samples[0], samples[-1]
+    failures = []
+    for metric, limit in limits.items():
+        growth = last[metric] - first[metric]
+        if growth > limit:
+            failures.append("{} grew by {:.1f} (limit {})".format(metric, growth, limit))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wizard soak test and leak detector")
+    parser.add_argument('--cycles', type=int, default=1000, help="Next/Back cycles to run")
+    parser.add_argument('--warmup', type=int, default=20, help="cycles before measuring")
+    parser.add_argument('--report-every', type=int, default=50, help="cycles between progress lines")
+    parser.add_argument('--max-memory-growth-kb', type=float, default=2048.0)
+    parser.add_argument('--max-widget-growth', type=int, default=0)
+    parser.add_argument('--max-thread-growth', type=int, default=0)
+    parser.add_argument('--max-after-growth', type=int, default=0)
+    parser.add_argument('--report', help="write samples JSON to this file")
+    args = parser.parse_args()
+    
+    xvfb = ensure_display()
+    try:
+        samples, top_growth = run_soak(args.cycles, args.warmup, args.report_every)
+    finally:
+        if xvfb:
+            xvfb.terminate()
+    
+    failures = check_growth(samples, {
+        'memory_kb': args.max_memory_growth_kb,
+        'widgets': args.max_widget_growth,
+        'threads': args.max_thread_growth,
+        'after_callbacks': args.max_after_growth,
+    })
+    
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({'samples': samples, 'top_growth': top_growth, 'failures': failures}, f, indent=2)
+    
+    if failures:
+        print("\nSoak test FAILED:\n  " + "\n  ".join(failures))
+        print("\nTop allocation growth:\n  " + "\n  ".join(top_growth))
+        return 1
+    
+    print("\nSoak test passed ({} cycles)".format(args.cycles))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
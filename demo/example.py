@@ -18,6 +18,7 @@ if demo_dir not in sys.path:
     sys.path.insert(0, demo_dir)
 
 from wizard import WizardApp
+from wizard.headless import HeadlessRunner
 from steps.theme_step import ThemeStep
 from steps.configuration_step import ConfigurationStep
 from steps.progress_step import ProgressStep
@@ -25,7 +26,32 @@ from steps.checkbox_step import CheckboxStep
 from steps.logs_step import LogsStep
 
 
+def build_steps(wizard, interactive=True):
+    """Create wizard steps (shared by interactive and headless modes)"""
+    steps = []
+    if interactive:
+        # Theme selection only makes sense with a window
+        steps.append(ThemeStep(wizard))
+    steps.extend([
+        ConfigurationStep(wizard),
+        ProgressStep(wizard),
+        CheckboxStep(wizard),
+        LogsStep(wizard),
+    ])
+    return steps
+
+
+def main_headless(answer_file):
+    """Run wizard unattended: python example.py --headless answers.json"""
+    runner = HeadlessRunner(answer_file=answer_file)
+    runner.set_steps(build_steps(runner, interactive=False))
+    return 0 if runner.run() else 1
+
+
 def main():
+    if len(sys.argv) >= 3 and sys.argv[1] == "--headless":
+        sys.exit(main_headless(sys.argv[2]))
+    
     root = tk.Tk()
     
     # Create wizard first (without steps)
@@ -39,13 +65,7 @@ def main():
     
     # Create wizard steps (WelcomeStep and EndSuccessStep are added automatically)
     # Pass wizard_app to each step
-    steps = [
-        ThemeStep(wizard),
-        ConfigurationStep(wizard),
-        ProgressStep(wizard),
-        CheckboxStep(wizard),
-        LogsStep(wizard),
-    ]
+    steps = build_steps(wizard)
     
     # Set steps in wizard (WelcomeStep and EndSuccessStep will be added automatically)
     wizard.set_steps(steps)
@@ -19,15 +19,18 @@ class CheckboxStep(WizardStep):
     def __init__(self, wizard_app):
         super().__init__(wizard_app)
         self.error_checkbox = tk.BooleanVar(value=False)
+        # Published as "simulate_error" for later steps
+        wizard_app.state.define("simulate_error", bool, False)
+        wizard_app.state.bind("simulate_error", self.error_checkbox)
     
     def create_content(self, content_frame):
         title = ttk.Label(content_frame, text="System Check", 
-                         font=("Arial", 16, "bold"))
+                         style='Wizard.Title.TLabel')
         title.pack(pady=(0, 20), anchor=tk.W)
         
         info = ttk.Label(content_frame, 
                         text="Check the option below to simulate an error:",
-                        justify=tk.LEFT, font=("Arial", 10))
+                        justify=tk.LEFT, style='Wizard.Body.TLabel')
         info.pack(anchor=tk.W, pady=(0, 15))
         
         checkbox_frame = ttk.Frame(content_frame, padding=(20, 0))
@@ -39,7 +42,7 @@ class CheckboxStep(WizardStep):
         
         warning = ttk.Label(content_frame, 
                            text="(If unchecked, wizard will complete successfully)",
-                           font=("Arial", 9), foreground="gray")
+                           style='Wizard.Hint.TLabel')
         warning.pack(anchor=tk.W, padx=20, pady=(5, 0))
     
     def create_process(self):
@@ -22,12 +22,12 @@ class ConfigurationStep(WizardStep):
     
     def create_content(self, content_frame):
         title = ttk.Label(content_frame, text="Configuration", 
-                         font=("Arial", 16, "bold"))
+                         style='Wizard.Title.TLabel')
         title.pack(pady=(0, 20), anchor=tk.W)
         
         info = ttk.Label(content_frame, 
                         text="Select configuration type:",
-                        justify=tk.LEFT, font=("Arial", 10))
+                        justify=tk.LEFT, style='Wizard.Body.TLabel')
         info.pack(anchor=tk.W, pady=(0, 15))
         
         radio_frame = ttk.Frame(content_frame, padding=(20, 0))
@@ -75,44 +75,40 @@ class LogsProcess(WizardProcess):
 class LogsStep(WizardStep):
     """Step with logs"""
     
+    def _error_requested(self):
+        """Whether error was selected in CheckboxStep"""
+        return self.wizard_app.state.get("simulate_error", False)
+    
     def create_content(self, content_frame):
         # Check if error was selected in previous step BEFORE creating content
-        from .checkbox_step import CheckboxStep
-        
-        checkbox_step = None
-        for step in self.wizard_app.steps:
-            if isinstance(step, CheckboxStep):
-                checkbox_step = step
-                break
-        
-        self.should_fail = checkbox_step and checkbox_step.error_checkbox.get()
+        self.should_fail = self._error_requested()
         
         # If should fail, don't show console, process will complete immediately
         if self.should_fail:
             title = ttk.Label(content_frame, text="Checking Status", 
-                             font=("Arial", 16, "bold"))
+                             style='Wizard.Title.TLabel')
             title.pack(pady=(0, 20), anchor=tk.W)
             
             info = ttk.Label(content_frame, 
                             text="Checking wizard status...",
-                            justify=tk.LEFT, font=("Arial", 10))
+                            justify=tk.LEFT, style='Wizard.Body.TLabel')
             info.pack(anchor=tk.W, pady=(0, 15))
             return
         
         title = ttk.Label(content_frame, text="Processing", 
-                         font=("Arial", 16, "bold"))
+                         style='Wizard.Title.TLabel')
         title.pack(pady=(0, 15), anchor=tk.W)
         
         info = ttk.Label(content_frame, 
                         text="Processing...",
-                        justify=tk.LEFT, font=("Arial", 10))
+                        justify=tk.LEFT, style='Wizard.Body.TLabel')
         info.pack(anchor=tk.W, pady=(0, 10))
         
         # Text field for logs
         self.log_text = scrolledtext.ScrolledText(content_frame, 
                                                   height=15, 
                                                   width=70,
-                                                  font=("Consolas", 9),
+                                                  font=self.wizard_app.fonts['mono'],
                                                   bg="white",
                                                   fg="black",
                                                   insertbackground="black")
@@ -136,4 +132,11 @@ class LogsStep(WizardStep):
         )
         
         return process
-
+    
+    def create_headless_process(self):
+        # Logger is provided by the headless runner
+        return LogsProcess(
+            logger=None,
+            state_callback=self._on_process_complete,
+            should_fail=self._error_requested()
+        )
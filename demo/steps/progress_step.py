@@ -61,12 +61,12 @@ class ProgressStep(WizardStep):
     
     def create_content(self, content_frame):
         title = ttk.Label(content_frame, text="Preparing", 
-                         font=("Arial", 16, "bold"))
+                         style='Wizard.Title.TLabel')
         title.pack(pady=(0, 20), anchor=tk.W)
         
         info = ttk.Label(content_frame, 
                         text="Please wait...",
-                        justify=tk.LEFT, font=("Arial", 10))
+                        justify=tk.LEFT, style='Wizard.Body.TLabel')
         info.pack(anchor=tk.W, pady=(0, 15))
         
         # Create progressbar and labels
@@ -82,15 +82,15 @@ class ProgressStep(WizardStep):
         labels_frame = ttk.Frame(progress_frame)
         labels_frame.pack(fill=tk.X)
         
-        percent_label = ttk.Label(labels_frame, text="0%", font=("Arial", 10))
+        percent_label = ttk.Label(labels_frame, text="0%", style='Wizard.Body.TLabel')
         percent_label.pack(side=tk.LEFT)
         
         eta_label = ttk.Label(labels_frame, text="Remaining: --:--", 
-                             font=("Arial", 9), foreground="gray")
+                             style='Wizard.Hint.TLabel')
         eta_label.pack(side=tk.LEFT, padx=(20, 0))
         
         elapsed_label = ttk.Label(labels_frame, text="Elapsed: 0:00", 
-                                 font=("Arial", 9), foreground="gray")
+                                 style='Wizard.Hint.TLabel')
         elapsed_label.pack(side=tk.LEFT, padx=(20, 0))
         
         # Save references for use in process
@@ -117,4 +117,7 @@ class ProgressStep(WizardStep):
         )
         
         return process
-
+    
+    def create_headless_process(self):
+        # Progress output is provided by the headless runner
+        return ProgressProcess(state_callback=self._on_process_complete)
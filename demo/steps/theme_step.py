@@ -27,19 +27,19 @@ class ThemeStep(WizardStep):
     
     def create_content(self, content_frame):
         title = ttk.Label(content_frame, text="Theme Selection", 
-                         font=("Arial", 16, "bold"))
+                         style='Wizard.Title.TLabel')
         title.pack(pady=(0, 20), anchor=tk.W)
         
         info = ttk.Label(content_frame, 
                         text="Select a theme for the wizard interface. The theme will be applied immediately:",
-                        justify=tk.LEFT, font=("Arial", 10))
+                        justify=tk.LEFT, style='Wizard.Body.TLabel')
         info.pack(anchor=tk.W, pady=(0, 15))
         
         # Show current theme info at the top
         current_theme = self.wizard_app.style.theme_use()
         current_info = ttk.Label(content_frame, 
                                 text=f"Current theme: {current_theme}",
-                                font=("Arial", 10, "bold"),
+                                font=self.wizard_app.fonts['body_bold'],
                                 foreground="blue")
         current_info.pack(anchor=tk.W, pady=(0, 15))
         
@@ -65,8 +65,8 @@ class ThemeStep(WizardStep):
         """Called when theme selection changes"""
         selected_theme = self.theme_choice.get()
         if selected_theme and selected_theme in self.available_themes:
-            # Apply theme immediately when selected
-            self.wizard_app.style.theme_use(selected_theme)
+            # Apply theme immediately when selected (re-applies wizard styles)
+            self.wizard_app.set_theme(selected_theme)
     
     def create_process(self):
         return None
@@ -5,21 +5,39 @@ Tkinter Wizard Library
 Library for creating general wizards based on Tkinter.
 """
 
-from .enums import StepStatus
+from .enums import StepStatus, ProcessPolicy, StepRole
 from .progress_interface import ProgressInterface, ProgressBarAdapter
 from .wizard_process import WizardProcess
 from .wizard_step import WizardStep
 from .wizard_app import WizardApp
 from .wizard_config import WizardConfig
+from .headless import HeadlessRunner
+from .process_registry import ProcessRegistry
+from .retry import RetryPolicy
+from .channel import Channel, ChannelClosed, ChannelCancelled
+from .state import StateStore
+from .step_graph import StepGraph
+from .validation import ValidationError
 
 __all__ = [
     'StepStatus',
+    'ProcessPolicy',
+    'StepRole',
     'ProgressInterface',
     'ProgressBarAdapter',
     'WizardProcess',
     'WizardStep',
     'WizardApp',
     'WizardConfig',
+    'HeadlessRunner',
+    'ProcessRegistry',
+    'RetryPolicy',
+    'Channel',
+    'ChannelClosed',
+    'ChannelCancelled',
+    'StateStore',
+    'StepGraph',
+    'ValidationError',
 ]
 
 __version__ = '0.1.0'
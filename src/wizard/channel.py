@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Bounded channel streaming data between step processes.
+"""
+import collections
+import threading
+import time
+
+
+class ChannelClosed(Exception):
+    """Producer closed the channel and all items were consumed"""
+    pass
+
+
+class ChannelCancelled(Exception):
+    """Channel was cancelled (one side failed or was cancelled)"""
+    pass
+
+
+class Channel:
+    """
+    Bounded FIFO between a producer and a consumer thread.
+    
+    put() blocks while the channel is full (backpressure), get() blocks while
+    it is empty. close() marks the end of data; cancel() aborts both sides,
+    so cancellation and failures propagate along a chain of processes.
+    """
+    
+    def __init__(self, capacity=8, name=None):
+        """
+        Args:
+            capacity: maximum number of items waiting for the consumer
+            name: name used in error messages
+        """
+        self.capacity = capacity
+        self.name = name
+        self._items = collections.deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._cancelled = False
+        self.error = None  # Reason passed to cancel()
+        # Statistics
+        self.items_put = 0
+        self.max_depth = 0
+        self.producer_waits = 0  # put() calls that had to wait (consumer slower)
+        self.consumer_waits = 0  # get() calls that had to wait (producer slower)
+    
+    def _check_cancelled(self):
+        if self._cancelled:
+            raise ChannelCancelled("Channel {} cancelled{}".format(
+                self.name or "", ": {}".format(self.error) if self.error else ""))
+    
+    def put(self, item, timeout=None):
+        """
+        Add item, waiting while the channel is full.
+        
+        Raises:
+            ChannelCancelled: channel was cancelled
+            ChannelClosed: channel was closed by producer
+            TimeoutError: no space within timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._check_cancelled()
+            if self._closed:
+                raise ChannelClosed("Channel {} is closed".format(self.name or ""))
+            if len(self._items) >= self.capacity:
+                self.producer_waits += 1
+            while len(self._items) >= self.capacity:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("Channel {} is full".format(self.name or ""))
+                self._condition.wait(remaining)
+                self._check_cancelled()
+            self._items.append(item)
+            self.items_put += 1
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._condition.notify_all()
+    
+    def get(self, timeout=None):
+        """
+        Take next item, waiting while the channel is empty.
+        
+        Raises:
+            ChannelClosed: producer closed the channel and no items are left
+            ChannelCancelled: channel was cancelled
+            TimeoutError: no item within timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            if not self._items and not self._closed:
+                self.consumer_waits += 1
+            while not self._items:
+                self._check_cancelled()
+                if self._closed:
+                    raise ChannelClosed("Channel {} is closed".format(self.name or ""))
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("Channel {} is empty".format(self.name or ""))
+                self._condition.wait(remaining)
+            self._check_cancelled()
+            item = self._items.popleft()
+            self._condition.notify_all()
+            return item
+    
+    def close(self):
+        """Producer finished: consumer gets remaining items, then ChannelClosed"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+    
+    def cancel(self, error=None):
+        """Abort channel: waiting and later put()/get() raise ChannelCancelled"""
+        with self._condition:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            self.error = error
+            self._items.clear()
+            self._condition.notify_all()
+    
+    def is_cancelled(self):
+        return self._cancelled
+    
+    def __iter__(self):
+        """Iterate over items until the channel is closed"""
+        while True:
+            try:
+                yield self.get()
+            except ChannelClosed:
+                return
+    
+    def __len__(self):
+        with self._condition:
+            return len(self._items)
+    
+    def stats(self):
+        """Get channel statistics"""
+        return {
+            'capacity': self.capacity,
+            'depth': len(self),
+            'max_depth': self.max_depth,
+            'items_put': self.items_put,
+            'producer_waits': self.producer_waits,
+            'consumer_waits': self.consumer_waits,
+        }
@@ -9,3 +9,16 @@ class StepStatus(Enum):
     SUCCESS = "success"  # Successfully completed
     FAILED = "failed"    # Completed with error
 
+
+class ProcessPolicy(Enum):
+    """What to do with a step's process when the step is rendered again"""
+    CANCEL = "cancel"  # Cancel running process and start a new one (old thread exits on its own)
+    REUSE = "reuse"    # Keep running or successfully completed process, don't start a new one
+    ADOPT = "adopt"    # Detach running process from the step and let it finish, start a new one
+
+
+class StepRole(Enum):
+    """Special place of a step in the wizard"""
+    WELCOME = "welcome"  # First step
+    SUCCESS = "success"  # Shown when the wizard completed successfully
+    FAIL = "fail"        # Shown when a step failed
@@ -0,0 +1,472 @@
+# -*- coding: utf-8 -*-
+"""
+Unattended wizard execution without a display.
+
+HeadlessRunner walks the same WizardStep list as WizardApp, takes user inputs
+from an answer file and runs each step's process with console/file output.
+"""
+import heapq
+import itertools
+import json
+import sys
+import threading
+import time
+import tkinter as tk
+from .enums import StepStatus, StepRole
+from .progress_interface import ProgressInterface
+from .wizard_config import WizardConfig
+from .process_registry import ProcessRegistry
+from .watchdog import ProcessWatchdog
+from .shutdown import ShutdownCoordinator
+from .state import StateStore
+from .step_graph import StepGraph, check_stream_consumers
+
+# Tcl interpreter for Tk variables of headless steps. Tcl must delete an
+# interpreter in the thread that created it, so it is kept until exit
+_tcl = None
+
+
+def _shared_tcl():
+    """Get Tcl interpreter shared by headless runners (created on first use)"""
+    global _tcl
+    if _tcl is None:
+        _tcl = tk.Tcl()
+    return _tcl
+
+
+class HeadlessRoot:
+    """
+    Stand-in for the Tk root window.
+    
+    Provides after()/after_cancel() for processes; callbacks are run by the
+    headless runner in its own thread (like Tk runs them in the main loop).
+    """
+    
+    def __init__(self):
+        self._queue = []  # heap of (due_time, sequence, after_id)
+        self._callbacks = {}  # after_id -> (func, args)
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+    
+    def after(self, ms, func=None, *args):
+        """Schedule func to run after ms milliseconds (thread-safe)"""
+        if func is None:
+            time.sleep(ms / 1000.0)
+            return None
+        
+        with self._condition:
+            sequence = next(self._counter)
+            after_id = "after#{}".format(sequence)
+            self._callbacks[after_id] = (func, args)
+            heapq.heappush(self._queue, (time.monotonic() + ms / 1000.0, sequence, after_id))
+            self._condition.notify()
+        return after_id
+    
+    def after_idle(self, func, *args):
+        """Schedule func to run as soon as possible"""
+        return self.after(0, func, *args)
+    
+    def after_cancel(self, after_id):
+        """Cancel scheduled callback"""
+        with self._condition:
+            self._callbacks.pop(after_id, None)
+    
+    def pending_count(self):
+        """Number of scheduled callbacks"""
+        with self._condition:
+            return len(self._callbacks)
+    
+    def run_pending(self, timeout=0.1):
+        """
+        Run callbacks that are due, waiting up to timeout for the first one.
+        
+        Returns:
+            Number of callbacks run
+        """
+        deadline = time.monotonic() + timeout
+        due = []
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if self._queue and self._queue[0][0] <= now:
+                    break
+                wait = deadline - now
+                if self._queue:
+                    wait = min(wait, self._queue[0][0] - now)
+                if wait <= 0:
+                    break
+                self._condition.wait(wait)
+            
+            now = time.monotonic()
+            while self._queue and self._queue[0][0] <= now:
+                after_id = heapq.heappop(self._queue)[2]
+                callback = self._callbacks.pop(after_id, None)
+                if callback:
+                    due.append(callback)
+        
+        for func, args in due:
+            func(*args)
+        return len(due)
+    
+    def quit(self):
+        pass
+
+
+class StreamLogger:
+    """
+    Logger for headless processes (replaces ScrolledText).
+    
+    Implements the text widget methods used by WizardProcess.log and writes
+    each line to a stream and/or a log file.
+    """
+    
+    def __init__(self, stream=None, log_file=None, prefix="", parent=None):
+        """
+        Args:
+            stream: text stream for output (None - no console output)
+            log_file: path to log file (appended) or None
+            prefix: text prepended to each line
+            parent: StreamLogger to write lines through (instead of own outputs)
+        """
+        self.stream = stream
+        self.prefix = prefix
+        self.parent = parent
+        self._file = open(log_file, 'a', encoding='utf-8') if log_file else None
+        self._lock = threading.Lock()
+    
+    def write_line(self, text):
+        """Write one line to all outputs"""
+        if self.parent:
+            self.parent.write_line(self.prefix + text)
+            return
+        
+        line = "{}{}\n".format(self.prefix, text)
+        with self._lock:
+            if self.stream:
+                self.stream.write(line)
+            if self._file:
+                self._file.write(line)
+    
+    def insert(self, index, text):
+        """Text widget compatible insert (index is ignored)"""
+        for line in text.splitlines():
+            self.write_line(line)
+    
+    def see(self, index):
+        pass
+    
+    def update(self):
+        pass
+    
+    def flush(self):
+        """Flush outputs"""
+        if self.parent:
+            self.parent.flush()
+            return
+        
+        with self._lock:
+            if self.stream:
+                self.stream.flush()
+            if self._file:
+                self._file.flush()
+    
+    def close(self):
+        """Flush and close log file"""
+        self.flush()
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+class ConsoleProgress(ProgressInterface):
+    """Progress interface that writes progress lines through a StreamLogger"""
+    
+    def __init__(self, logger, step_percent=10):
+        """
+        Args:
+            logger: StreamLogger for output
+            step_percent: write a line every time progress grows by this much
+        """
+        self.logger = logger
+        self.step_percent = step_percent
+        self.start_time = time.time()
+        self._last_reported = None
+        self._eta = None
+    
+    def reset_start_time(self):
+        """Reset start time (called at process start)"""
+        self.start_time = time.time()
+        self._last_reported = None
+    
+    def set_percent(self, percent):
+        """Set completion percentage"""
+        reported = int(percent // self.step_percent) * self.step_percent
+        if reported == self._last_reported:
+            return
+        self._last_reported = reported
+        
+        text = "{:3d}%".format(int(percent))
+        if self._eta is not None and self._eta > 0:
+            text += "  remaining {:02d}:{:02d}".format(int(self._eta // 60), int(self._eta % 60))
+        self.logger.write_line(text)
+    
+    def set_eta(self, seconds):
+        """Set remaining time (reported with next percent line)"""
+        self._eta = seconds
+    
+    def set_elapsed_time(self, seconds):
+        pass
+    
+    def get_elapsed(self):
+        """Get elapsed time from start"""
+        return time.time() - self.start_time
+
+
+class HeadlessRunner:
+    """
+    Runs wizard steps unattended, without Tk windows.
+    
+    The runner is passed to steps instead of WizardApp. It adds welcome and
+    end steps like WizardApp, applies answers from the answer file to each
+    step, runs step processes with console/file progress and logging, and on
+    failure routes to the end fail step.
+    
+    Example:
+        runner = HeadlessRunner(answer_file="answers.json")
+        runner.set_steps(build_steps(runner))
+        sys.exit(0 if runner.run() else 1)
+    """
+    
+    def __init__(self, steps=None, config=None, answers=None, answer_file=None,
+                 stream=None, log_file=None, progress_step=10):
+        """
+        Args:
+            steps: list of WizardStep objects (can be set later via set_steps)
+            config: WizardConfig object (optional)
+            answers: dict step answer key -> dict of answers
+            answer_file: path to JSON answer file (merged over answers)
+            stream: console stream (sys.stdout by default)
+            log_file: path to log file (optional)
+            progress_step: percent step between progress lines
+        """
+        self.config = config or WizardConfig()
+        self.root = HeadlessRoot()
+        self.headless = True
+        self.answers = dict(answers or {})
+        if answer_file:
+            self.load_answers(answer_file)
+        self.progress_step = progress_step
+        self.state = StateStore(self.root)
+        self.processes = ProcessRegistry()
+        self.watchdog = ProcessWatchdog(self.processes)
+        self.logger = StreamLogger(stream if stream is not None else sys.stdout, log_file)
+        self.shutdown_coordinator = ShutdownCoordinator(self.processes)
+        self.shutdown_coordinator.add_sink(self.logger)
+        
+        # Steps create Tk variables in their constructors; give them a Tcl
+        # interpreter (no display needed) as default root until run() ends
+        self.tcl = None
+        if getattr(tk, '_default_root', None) is None:
+            self.tcl = tk._default_root = _shared_tcl()
+        
+        self.steps = []
+        self.current_step_index = 0
+        self.failed_step = None
+        self.graph = StepGraph(self.steps, state=self.state)
+        
+        from .steps.welcome_step import WelcomeStep
+        from .steps.end_with_fail_step import EndWithFailStep
+        from .steps.end_success_step import EndSuccessStep
+        self._welcome_step = WelcomeStep(self)
+        self._end_fail_step = EndWithFailStep(self)
+        self._end_success_step = EndSuccessStep(self)
+        
+        if steps:
+            self.set_steps(steps)
+    
+    def load_answers(self, path):
+        """Load answers from JSON file: {"StepKey": {"attribute": value, ...}, ...}"""
+        with open(path, 'r', encoding='utf-8') as f:
+            self.answers.update(json.load(f))
+    
+    def set_welcome_step(self, step):
+        """Set custom welcome step"""
+        self._welcome_step = step
+        self._compile_graph()
+    
+    def set_end_failed_step(self, step):
+        """Set custom end failed step"""
+        self._end_fail_step = step
+        self._compile_graph()
+    
+    def set_end_success_step(self, step):
+        """Set custom end success step"""
+        self._end_success_step = step
+        self._compile_graph()
+    
+    def _compile_graph(self):
+        """
+        Build step graph for current steps.
+        
+        Raises:
+            ValueError: stream consumer is interactive or follows an interactive step
+        """
+        check_stream_consumers(self.steps)
+        self.graph = StepGraph(self.steps, roles={
+            StepRole.WELCOME: self._welcome_step,
+            StepRole.SUCCESS: self._end_success_step,
+            StepRole.FAIL: self._end_fail_step,
+        }, state=self.state)
+    
+    def set_steps(self, steps):
+        """Set wizard steps (welcome and end_success steps are added like in WizardApp)"""
+        final_steps = []
+        if self._welcome_step:
+            final_steps.append(self._welcome_step)
+        final_steps.extend(steps)
+        if self._end_success_step and self._end_success_step not in final_steps:
+            final_steps.append(self._end_success_step)
+        self.steps = final_steps
+        self.current_step_index = 0
+        self._compile_graph()
+    
+    def run(self):
+        """
+        Run all steps.
+        
+        Returns:
+            True if wizard completed successfully, False otherwise
+        """
+        graph = self.graph
+        end_roles = (StepRole.SUCCESS, StepRole.FAIL)
+        
+        self.watchdog.start()
+        try:
+            # Skip rules are evaluated when reached (they may use answers of earlier steps)
+            position = 0
+            index = graph.next_index(-1)
+            while index is not None and graph.role_of(self.steps[index]) not in end_roles:
+                step = self.steps[index]
+                self.current_step_index = index
+                position += 1
+                remaining = sum(1 for i in graph.following(index) if graph.role_of(self.steps[i]) not in end_roles)
+                self.logger.write_line("[{}/{}] {}".format(position, position + remaining, step.get_display_name()))
+                if not self._run_step(step):
+                    self.failed_step = step
+                    self.logger.write_line("Step '{}' failed".format(step.get_display_name()))
+                    if step.process and step.process.diagnostics:
+                        self.logger.write_line(step.process.diagnostics['reason'])
+                    self._finish(self._end_fail_step)
+                    return False
+                index = graph.next_index(index)
+            
+            self._finish(self._end_success_step)
+            return True
+        finally:
+            # Stop processes left running (e.g. on KeyboardInterrupt), flush log, run cleanup hooks
+            report = self.shutdown_coordinator.shutdown()
+            for step_name in report['missed']:
+                self.logger.write_line("Step '{}' did not stop in time".format(step_name))
+            self.watchdog.stop()
+            self.logger.close()
+            self.release_default_root()
+    
+    def release_default_root(self):
+        """Undo setting the Tcl interpreter as Tk default root (variables keep working)"""
+        if self.tcl is not None and getattr(tk, '_default_root', None) is self.tcl:
+            tk._default_root = None
+    
+    def _finish(self, step):
+        """Go to end step"""
+        if step is None:
+            return
+        self.current_step_index = self.graph.append(step)
+        if step is self._end_fail_step:
+            self.logger.write_line("Wizard completed with errors")
+        else:
+            self.logger.write_line("Wizard completed successfully")
+    
+    def _run_step(self, step):
+        """Run one step, return True if it completed successfully"""
+        if step.status != StepStatus.PENDING:
+            # Already ran together with the step it streams from
+            return step.can_proceed() and not step.is_failed()
+        
+        # Steps streaming from this one run at the same time (one pipeline)
+        pipeline = []
+        stage = step
+        while stage is not None:
+            if not self._start_step(stage):
+                for started in pipeline + [stage]:
+                    if started.process is not None and started.status == StepStatus.RUNNING:
+                        started.process.cancel(notify=False)
+                    started.status = StepStatus.FAILED
+                return False
+            pipeline.append(stage)
+            # Consumer that is skipped or already done gets no channel (connect_streams)
+            consumers = stage.get_stream_consumers() if stage.process and stage.process.output else []
+            stage = consumers[0] if consumers else None
+            if stage is not None:
+                self.logger.write_line("Streaming to '{}'".format(stage.get_display_name()))
+        
+        while any(stage.status == StepStatus.RUNNING for stage in pipeline):
+            self.root.run_pending(timeout=0.1)
+        # Run callbacks left by the processes (last progress updates)
+        self.root.run_pending(timeout=0)
+        
+        if not step.can_proceed() or step.is_failed():
+            return False
+        return True
+    
+    def _start_step(self, step):
+        """Apply answers, prepare and start process of step; False if that failed"""
+        try:
+            step.apply_answers(self.answers.get(step.get_answer_key(), {}))
+        except Exception as e:
+            self.logger.write_line("Invalid answers: {}".format(e))
+            return False
+        if step.validation is not None:
+            errors = step.validation.validate_sync()
+            for name, message in errors.items():
+                self.logger.write_line("Invalid input '{}': {}".format(name, message))
+            if errors:
+                return False
+        
+        step.run_prepare()
+        if step.prepare_error is not None:
+            self.logger.write_line("Preparation failed: {}".format(step.prepare_error))
+            return False
+        
+        process = step.create_headless_process()
+        step.process = process
+        if process:
+            # Redirect process output to console/log file
+            process.root = self.root
+            step.connect_streams(process)
+            step._bind_state_callback(process)
+            self.processes.register(step, process)
+            step.attempt = 1
+            process.logger = StreamLogger(prefix="    ", parent=self.logger)
+            process.progress_interface = ConsoleProgress(process.logger, self.progress_step)
+            
+            step.status = StepStatus.RUNNING
+            process.start()
+        return True
+    
+    def on_step_status_changed(self, step):
+        """Called when step status changes"""
+        pass
+    
+    def on_step_retry(self, step):
+        """Called when failed step process starts another attempt"""
+        self.logger.write_line("Retrying '{}' (attempt {} of {})".format(
+            step.get_display_name(), step.attempt, step.retry_policy.max_attempts))
+    
+    def on_step_prepared(self, step):
+        """Called when step prepare() completes"""
+        pass
+    
+    def update_navigation(self):
+        """No navigation buttons in headless mode"""
+        pass
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Tk event loop latency monitor and stall detector.
+"""
+import bisect
+import logging
+import sys
+import threading
+import time
+import tkinter as tk
+import traceback
+from .tracing import get_recorder
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopMonitor:
+    """
+    Measures how late root.after callbacks fire compared to their schedule.
+    
+    A tick is scheduled every interval_ms; the delay between the scheduled and
+    the actual time is the event loop latency and is collected in a histogram.
+    A watchdog thread checks that ticks keep arriving; if the main thread does
+    not run a tick for longer than stall_threshold_ms, its current stack (the
+    callback that blocks the loop) is logged.
+    """
+    
+    # Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+    BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+    
+    def __init__(self, root, interval_ms=50, stall_threshold_ms=500, max_stalls=100):
+        """
+        Args:
+            root: root Tkinter window
+            interval_ms: interval between latency probes
+            stall_threshold_ms: main thread blocked longer than this is a stall
+            max_stalls: number of stall reports kept in self.stalls
+        """
+        self.root = root
+        self.interval_ms = interval_ms
+        self.stall_threshold_ms = stall_threshold_ms
+        self.max_stalls = max_stalls
+        
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.samples = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.frame_time_ms = 0.0  # Actual time between last two ticks
+        self.stalls = []  # [{'time', 'duration_ms', 'stack'}, ...]
+        
+        self._running = False
+        self._after_id = None
+        self._expected = None
+        self._last_tick = None
+        self._stall_reported = False
+        self._main_thread_id = None
+        self._watchdog = None
+        self._overlay = None
+        self._overlay_after_id = None
+    
+    def start(self):
+        """Start monitoring (call from the main thread)"""
+        if self._running:
+            return
+        
+        self._running = True
+        self._main_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._schedule_tick()
+        
+        self._watchdog = threading.Thread(target=self._watchdog_loop, daemon=True,
+                                          name="EventLoopMonitor watchdog")
+        self._watchdog.start()
+    
+    def stop(self):
+        """Stop monitoring"""
+        self._running = False
+        for after_id in (self._after_id, self._overlay_after_id):
+            if after_id:
+                try:
+                    self.root.after_cancel(after_id)
+                except tk.TclError:
+                    pass
+        self._after_id = None
+        self._overlay_after_id = None
+    
+    def _schedule_tick(self):
+        self._expected = time.monotonic() + self.interval_ms / 1000.0
+        self._after_id = self.root.after(self.interval_ms, self._tick)
+    
+    def _tick(self):
+        """Probe callback: measure lateness and reschedule"""
+        now = time.monotonic()
+        latency_ms = max(0.0, (now - self._expected) * 1000.0)
+        self.frame_time_ms = (now - self._last_tick) * 1000.0
+        self._last_tick = now
+        self._stall_reported = False
+        
+        self.counts[bisect.bisect_left(self.BUCKETS_MS, latency_ms)] += 1
+        self.samples += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+        
+        if latency_ms >= self.stall_threshold_ms:
+            recorder = get_recorder()
+            end = recorder.now()
+            recorder.record("event loop stall", "loop", end - int(latency_ms * 1e6), end,
+                            args={'latency_ms': round(latency_ms, 1)})
+        
+        if self._running:
+            self._schedule_tick()
+    
+    def _watchdog_loop(self):
+        """Watchdog thread: capture main thread stack while it is stalled"""
+        check_interval = max(0.01, self.stall_threshold_ms / 4000.0)
+        while self._running:
+            time.sleep(check_interval)
+            blocked_ms = (time.monotonic() - self._last_tick) * 1000.0 - self.interval_ms
+            if blocked_ms < self.stall_threshold_ms or self._stall_reported:
+                continue
+            
+            self._stall_reported = True
+            frame = sys._current_frames().get(self._main_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            stall = {'time': time.time(), 'duration_ms': blocked_ms, 'stack': stack}
+            self.stalls.append(stall)
+            del self.stalls[:-self.max_stalls]
+            logger.warning("Tk event loop stalled for %.0f ms, main thread stack:\n%s",
+                           blocked_ms, stack)
+    
+    def histogram(self):
+        """
+        Get latency histogram.
+        
+        Returns:
+            List of (upper bound in ms or None for overflow, count)
+        """
+        bounds = list(self.BUCKETS_MS) + [None]
+        return list(zip(bounds, self.counts))
+    
+    def percentile(self, percent):
+        """Approximate latency percentile (bucket upper bound in ms)"""
+        if not self.samples:
+            return 0.0
+        target = self.samples * percent / 100.0
+        seen = 0
+        for bound, count in self.histogram():
+            seen += count
+            if seen >= target:
+                return bound if bound is not None else self.max_ms
+        return self.max_ms
+    
+    def pending_callbacks(self):
+        """Number of pending after() callbacks in Tk"""
+        try:
+            return len(self.root.tk.splitlist(self.root.tk.call('after', 'info')))
+        except tk.TclError:
+            return 0
+    
+    def stats(self):
+        """Get summary of measurements"""
+        return {
+            'samples': self.samples,
+            'mean_ms': self.total_ms / self.samples if self.samples else 0.0,
+            'p95_ms': self.percentile(95),
+            'max_ms': self.max_ms,
+            'frame_time_ms': self.frame_time_ms,
+            'pending_callbacks': self.pending_callbacks(),
+            'stalls': len(self.stalls),
+        }
+    
+    def show_overlay(self, parent, font=None, refresh_ms=500):
+        """
+        Show debug label with pending callback count and frame time.
+        
+        Args:
+            parent: widget to place the label in
+            font: label font
+            refresh_ms: label refresh interval
+        """
+        self._overlay = tk.Label(parent, font=font, fg="gray")
+        self._overlay.pack(side=tk.LEFT, padx=(10, 0))
+        
+        def refresh():
+            if not self._running:
+                return
+            stats = self.stats()
+            try:
+                self._overlay.config(text="after: {}  frame: {:.0f} ms  p95: {:.0f} ms  stalls: {}".format(
+                    stats['pending_callbacks'], stats['frame_time_ms'], stats['p95_ms'], stats['stalls']))
+            except tk.TclError:
+                return  # Label destroyed
+            self._overlay_after_id = self.root.after(refresh_ms, refresh)
+        
+        refresh()
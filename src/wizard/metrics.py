@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+"""
+Lightweight metrics registry (counters, gauges, histograms).
+
+Metrics are exported as a Prometheus text-format file that can be picked up
+by node exporter's textfile collector; no network dependency is needed.
+"""
+import bisect
+import os
+import threading
+
+
+def _escape(value):
+    """Escape label value for Prometheus text format"""
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames, labelvalues, extra=None):
+    pairs = ['{}="{}"'.format(name, _escape(value)) for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append('{}="{}"'.format(extra[0], _escape(extra[1])))
+    if not pairs:
+        return ""
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base class for metrics with optional labels"""
+    
+    type_name = None
+    
+    def __init__(self, name, help_text="", labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError("Metric {} expects labels {}, got {}".format(
+                self.name, self.labelnames, tuple(labels)))
+        return tuple(labels[name] for name in self.labelnames)
+    
+    def _samples(self):
+        """Get list of (suffix, labelvalues, extra label, value)"""
+        with self._lock:
+            return [("", key, None, value) for key, value in self._values.items()]
+    
+    def render(self):
+        """Render metric in Prometheus text format"""
+        lines = [
+            "# HELP {} {}".format(self.name, self.help_text),
+            "# TYPE {} {}".format(self.name, self.type_name),
+        ]
+        for suffix, labelvalues, extra, value in self._samples():
+            lines.append("{}{}{} {}".format(self.name, suffix,
+                                            _format_labels(self.labelnames, labelvalues, extra),
+                                            _format_value(value)))
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+    
+    type_name = "counter"
+    
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def get(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+    
+    type_name = "gauge"
+    
+    def __init__(self, name, help_text="", labelnames=(), function=None):
+        """
+        Args:
+            function: callable returning the value at export time (unlabelled gauges)
+        """
+        super().__init__(name, help_text, labelnames)
+        self.function = function
+    
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+    
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+    
+    def get(self, **labels):
+        if self.function is not None:
+            return self.function()
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+    
+    def _samples(self):
+        if self.function is not None:
+            return [("", (), None, self.function())]
+        return super()._samples()
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+    
+    type_name = "histogram"
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+    
+    def __init__(self, name, help_text="", labelnames=(), buckets=None):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets or self.DEFAULT_BUCKETS))
+    
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [bucket counts..., overflow count, sum]
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[bisect.bisect_left(self.buckets, value)] += 1
+            state[-1] += value
+    
+    def get_count(self, **labels):
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return sum(state[:-1]) if state else 0
+    
+    def _samples(self):
+        samples = []
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), state[:-1]):
+                cumulative += count
+                samples.append(("_bucket", key, ("le", _format_value(float(bound))), cumulative))
+            samples.append(("_sum", key, None, state[-1]))
+            samples.append(("_count", key, None, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Collection of named metrics"""
+    
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+    
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError("Metric {} already registered as {}".format(name, metric.type_name))
+            return metric
+    
+    def counter(self, name, help_text="", labelnames=()):
+        """Get or create counter"""
+        return self._get_or_create(Counter, name, help_text, labelnames)
+    
+    def gauge(self, name, help_text="", labelnames=(), function=None):
+        """Get or create gauge"""
+        return self._get_or_create(Gauge, name, help_text, labelnames, function=function)
+    
+    def histogram(self, name, help_text="", labelnames=(), buckets=None):
+        """Get or create histogram"""
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+    
+    def get(self, name):
+        """Get metric by name (None if not registered)"""
+        return self._metrics.get(name)
+    
+    def render(self):
+        """Render all metrics in Prometheus text format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+    
+    def write_textfile(self, path):
+        """Write metrics to file atomically (temporary file + rename)"""
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+class TextfileExporter:
+    """Periodically writes registry to a Prometheus text-format file"""
+    
+    def __init__(self, registry, path, interval=15.0):
+        """
+        Args:
+            registry: MetricsRegistry to export
+            path: output file (e.g. node exporter textfile collector directory)
+            interval: seconds between writes
+        """
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """Start writing in a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="TextfileExporter")
+        self._thread.start()
+    
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+    
+    def write(self):
+        """Write file now (errors are ignored, next write retries)"""
+        try:
+            self.registry.write_textfile(self.path)
+        except OSError:
+            pass
+    
+    def stop(self):
+        """Stop background thread and write final values"""
+        self._stop.set()
+        self.write()
+
+
+# Default registry used by wizard instrumentation
+_registry = MetricsRegistry()
+
+
+def get_registry():
+    """Get registry used by wizard instrumentation"""
+    return _registry
+
+
+def _wizard_metrics(registry):
+    """Create metrics reported by wizard classes"""
+    return {
+        'step_shows': registry.counter(
+            "wizard_step_shows_total", "Times a step was shown", ("step",)),
+        'show_step_seconds': registry.histogram(
+            "wizard_show_step_seconds", "Time to show a step (render, sidebar, sizing)", ("step",)),
+        'render_seconds': registry.histogram(
+            "wizard_step_render_seconds", "Time of WizardStep.render", ("step",)),
+        'process_seconds': registry.histogram(
+            "wizard_step_process_seconds", "Step process duration from start to completion",
+            ("step", "result")),
+        'processes_running': registry.gauge(
+            "wizard_processes_running", "Step processes currently running"),
+        'log_lines': registry.counter(
+            "wizard_log_lines_total", "Log lines written by step processes", ("step",)),
+        'progress_updates': registry.counter(
+            "wizard_progress_updates_total",
+            "Progress updates by outcome (applied, coalesced into a pending update, dropped)",
+            ("outcome",)),
+        'cancellations': registry.counter(
+            "wizard_process_cancellations_total", "Cancelled step processes", ("step",)),
+        'failures': registry.counter(
+            "wizard_process_failures_total", "Failed step processes", ("step",)),
+        'threads': registry.gauge(
+            "wizard_threads", "Python threads alive", function=threading.active_count),
+    }
+
+
+WIZARD_METRICS = _wizard_metrics(_registry)
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Registry of live step processes.
+"""
+import logging
+import threading
+import time
+from .enums import ProcessPolicy
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessRegistry:
+    """
+    Tracks every started WizardProcess until its thread exits.
+    
+    Each process is owned by the step that started it. When a step is rendered
+    again (Back, then Next) the step's previous process is handled according
+    to the step's process_policy instead of being left running with callbacks
+    into the step.
+    """
+    
+    def __init__(self, join_timeout=2.0):
+        """
+        Args:
+            join_timeout: seconds a cancelled process thread may take to exit
+                          (cancel_all waits this long; reap() reports slower ones)
+        """
+        self.join_timeout = join_timeout
+        self._live = []  # Started processes whose threads have not exited
+        self._owners = {}  # id(step) -> process currently owned by the step
+        self._retired = {}  # Process cancelled by retire() -> time.monotonic() of cancel
+        self._lock = threading.Lock()
+    
+    def register(self, step, process):
+        """
+        Register process owned by step (call before process.start()).
+        
+        Args:
+            step: WizardStep that owns the process
+            process: WizardProcess object
+        """
+        process.owner = step
+        process.registry = self
+        with self._lock:
+            if process not in self._live:
+                self._live.append(process)
+            self._owners[id(step)] = process
+    
+    def release(self, process):
+        """Forget process (called from process thread when it exits)"""
+        with self._lock:
+            if process in self._live:
+                self._live.remove(process)
+            self._retired.pop(process, None)
+            owner = process.owner
+            if owner is not None and self._owners.get(id(owner)) is process:
+                del self._owners[id(owner)]
+    
+    def owned_by(self, step):
+        """Get live process owned by step (None if there is none)"""
+        with self._lock:
+            return self._owners.get(id(step))
+    
+    def live(self):
+        """Get list of live processes"""
+        with self._lock:
+            return list(self._live)
+    
+    def retire(self, step, policy=None):
+        """
+        Apply replacement policy to the step's current process.
+        
+        Called before the step creates a new process.
+        
+        Args:
+            step: WizardStep about to be rendered again
+            policy: ProcessPolicy (step.process_policy if None)
+        
+        Returns:
+            Process to keep using (policy REUSE) or None if a new process should be started
+        """
+        process = step.process
+        if process is None:
+            return None
+        policy = ProcessPolicy(policy or step.process_policy)
+        
+        if policy == ProcessPolicy.REUSE:
+            if process.is_alive() and not process.is_cancelled():
+                return process
+            if process.result == "success":
+                return process
+            return None
+        
+        if not process.is_alive():
+            return None
+        
+        if policy == ProcessPolicy.ADOPT:
+            # Registry keeps tracking it; results no longer reach the step
+            process.detach()
+            with self._lock:
+                if self._owners.get(id(step)) is process:
+                    del self._owners[id(step)]
+            return None
+        
+        # ProcessPolicy.CANCEL: don't wait for the thread here (main thread);
+        # the registry tracks it until it exits and reap() reports it if it doesn't
+        process.cancel(notify=False)
+        with self._lock:
+            if process in self._live:
+                self._retired[process] = time.monotonic()
+        return None
+    
+    def reap(self):
+        """
+        Report processes cancelled by retire() whose threads did not exit
+        within join_timeout (each is logged once; called by the watchdog).
+        
+        Returns:
+            List of these processes
+        """
+        now = time.monotonic()
+        with self._lock:
+            stragglers = [process for process, cancelled in self._retired.items()
+                          if now - cancelled >= self.join_timeout]
+            for process in stragglers:
+                del self._retired[process]
+        stragglers = [process for process in stragglers if process.is_alive()]
+        for process in stragglers:
+            step = process.owner.get_display_name() if process.owner else None
+            logger.warning("Process %s of step %s did not stop within %.1f s after cancel",
+                           process.__class__.__name__, step, self.join_timeout)
+        return stragglers
+    
+    def cancel_all(self, timeout=None):
+        """
+        Cancel all live processes without notifying steps and wait for them.
+        
+        Args:
+            timeout: total seconds to wait (join_timeout if None)
+        
+        Returns:
+            List of processes still alive after timeout
+        """
+        processes = self.live()
+        for process in processes:
+            process.cancel(notify=False)
+        
+        deadline = time.monotonic() + (self.join_timeout if timeout is None else timeout)
+        for process in processes:
+            process.wait(max(0.0, deadline - time.monotonic()))
+        return [process for process in processes if process.is_alive()]
+    
+    def snapshot(self):
+        """
+        Describe live processes (oldest first).
+        
+        Returns:
+            List of dicts with keys: step, process, thread, state
+            (running, paused, cancelling or adopted), age,
+            last_heartbeat (seconds since last log/progress/heartbeat or None)
+        """
+        now = time.monotonic()
+        with self._lock:
+            processes = list(self._live)
+            owned = set(id(process) for process in self._owners.values())
+        
+        workers = []
+        for process in processes:
+            if process.is_cancelled():
+                state = "cancelling"
+            elif process.is_paused():
+                state = "paused"
+            elif id(process) not in owned:
+                state = "adopted"
+            else:
+                state = "running"
+            thread = process._thread
+            workers.append({
+                'step': process.owner.get_display_name() if process.owner else None,
+                'process': process.__class__.__name__,
+                'thread': thread.name if thread else None,
+                'state': state,
+                'age': now - process.started_monotonic if process.started_monotonic else 0.0,
+                'last_heartbeat': now - process.last_heartbeat if process.last_heartbeat else None,
+            })
+        workers.sort(key=lambda worker: worker['age'], reverse=True)
+        return workers
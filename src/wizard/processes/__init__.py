@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+"""
+Built-in processes for common installation work
+"""
+
+from .parallel import ParallelProcess
+from .copy_files import CopyFilesProcess
+from .extract_archive import ExtractArchiveProcess
+from .verify_checksums import VerifyChecksumsProcess, load_manifest
+
+__all__ = [
+    'ParallelProcess',
+    'CopyFilesProcess',
+    'ExtractArchiveProcess',
+    'VerifyChecksumsProcess',
+    'load_manifest',
+]
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+import errno
+import os
+import shutil
+import stat
+import time
+from .parallel import ParallelProcess
+
+# Kernel copy functions, fastest first (copy_file_range: Python 3.8+, Linux)
+_KERNEL_COPY = tuple(name for name in ("copy_file_range", "sendfile") if hasattr(os, name))
+# Errors meaning a kernel copy function can't be used for these files
+_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EBADF,
+                getattr(errno, 'EOPNOTSUPP', errno.EINVAL), getattr(errno, 'ENOTSOCK', errno.EINVAL),
+                getattr(errno, 'ENOTSUP', errno.EINVAL)}
+
+
+def format_size(size):
+    """Format byte count for log messages (e.g. "12.3 MB")"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return "{:.1f} {}".format(size, unit) if unit != "B" else "{} B".format(size)
+        size /= 1024.0
+
+
+class CopyFilesProcess(ParallelProcess):
+    """
+    Copies files and directory trees with progress in bytes.
+    
+    File data is moved by the kernel (os.copy_file_range, then os.sendfile)
+    where the platform and file systems support it, otherwise read and
+    written in chunks. Files smaller than small_file_size are copied by
+    several worker threads at once; large files are copied one after another
+    by one worker, so they don't compete for the disk. Permissions, times
+    and extended attributes are preserved (shutil.copystat).
+    
+    Example:
+        CopyFilesProcess(["payload/bin", "payload/lib", "README"], "/opt/app",
+                         state_callback=self._on_process_complete)
+    """
+    
+    def __init__(self, sources, destination, workers=4, small_file_size=1024 * 1024,
+                 chunk_size=8 * 1024 * 1024, preserve_metadata=True, **kwargs):
+        """
+        Args:
+            sources: files and directories copied into destination
+                     (directories with their contents)
+            destination: target directory (created if missing)
+            workers: number of threads copying small files
+            small_file_size: files below this size (bytes) are copied in parallel
+            chunk_size: bytes per copy call
+            preserve_metadata: copy permissions, times and extended attributes
+            **kwargs: WizardProcess arguments
+        """
+        super().__init__(workers=workers, **kwargs)
+        self.sources = [sources] if isinstance(sources, str) else list(sources)
+        self.destination = destination
+        self.small_file_size = small_file_size
+        self.chunk_size = chunk_size
+        self.preserve_metadata = preserve_metadata
+        self.files_copied = 0
+    
+    def _plan(self):
+        """
+        Collect what to copy.
+        
+        Returns:
+            (directories, files, links): lists of (source, target) pairs;
+            files are (source, target, size)
+        """
+        directories = [(None, self.destination)]
+        files = []
+        links = []
+        pending = []
+        for source in self.sources:
+            target = os.path.join(self.destination, os.path.basename(os.path.normpath(source)))
+            if os.path.islink(source):
+                links.append((source, target))
+            elif os.path.isdir(source):
+                directories.append((source, target))
+                pending.append((source, target))
+            else:
+                files.append((source, target, os.path.getsize(source)))
+        
+        while pending and not self.is_cancelled():
+            source_dir, target_dir = pending.pop()
+            with os.scandir(source_dir) as entries:
+                for entry in entries:
+                    target = os.path.join(target_dir, entry.name)
+                    if entry.is_symlink():
+                        links.append((entry.path, target))
+                    elif entry.is_dir():
+                        directories.append((entry.path, target))
+                        pending.append((entry.path, target))
+                    else:
+                        files.append((entry.path, target, entry.stat().st_size))
+        return directories, files, links
+    
+    def run(self):
+        self.start_time = time.time()
+        try:
+            directories, files, links = self._plan()
+            if self.is_cancelled():
+                return
+            
+            self.total_bytes = sum(size for source, target, size in files)
+            self.log("Copying {} files ({}) to {}".format(len(files), format_size(self.total_bytes),
+                                                          self.destination))
+            for source, target in directories:
+                os.makedirs(target, exist_ok=True)
+            
+            # Large files form one work item, so one worker copies them in order
+            # while the others copy small files
+            large = [item for item in files if item[2] >= self.small_file_size]
+            small = [item for item in files if item[2] < self.small_file_size]
+            items = ([large] if large else []) + small
+            if not self.run_parallel(self._copy_item, items):
+                return
+            
+            for source, target in links:
+                if os.path.lexists(target):
+                    os.remove(target)
+                os.symlink(os.readlink(source), target)
+                if self.preserve_metadata:
+                    shutil.copystat(source, target, follow_symlinks=False)
+            
+            # Directory times last, copying files into them changes them
+            if self.preserve_metadata:
+                for source, target in reversed(directories):
+                    if source is not None:
+                        shutil.copystat(source, target)
+        except Exception as e:
+            self.log("[ERROR] {}".format(e))
+            raise
+        
+        elapsed = max(time.time() - self.start_time, 1e-6)
+        self.log("Copied {} files ({}) in {:.1f} s ({}/s)".format(
+            self.files_copied, format_size(self.done_bytes), elapsed, format_size(self.done_bytes / elapsed)))
+        self.set_success(True)
+    
+    def _copy_item(self, item):
+        """Copy one small file or the list of large files (worker thread)"""
+        if isinstance(item, list):
+            for source, target, size in item:
+                if self.checkpoint():
+                    return
+                self.log("Copying {} ({})".format(os.path.basename(source), format_size(size)))
+                self.copy_file(source, target)
+        else:
+            self.copy_file(item[0], item[1])
+    
+    def copy_file(self, source, target):
+        """Copy data and metadata of one file (worker thread)"""
+        with open(source, 'rb') as fsrc, open(target, 'wb') as fdst:
+            if not self._copy_data(fsrc, fdst):
+                fdst.close()
+                os.remove(target)  # Cancelled: don't leave a partial file
+                return
+        if self.preserve_metadata:
+            shutil.copystat(source, target)
+        with self._bytes_lock:
+            self.files_copied += 1
+    
+    def _copy_data(self, fsrc, fdst):
+        """
+        Copy file contents, kernel-side if possible.
+        
+        Returns:
+            False if cancelled
+        """
+        in_fd = fsrc.fileno()
+        out_fd = fdst.fileno()
+        size = os.fstat(in_fd).st_size
+        methods = list(_KERNEL_COPY) if stat.S_ISREG(os.fstat(out_fd).st_mode) else []
+        buffer = None
+        copied = 0
+        while True:
+            if self.checkpoint():
+                return False
+            if methods:
+                try:
+                    if methods[0] == "copy_file_range":
+                        count = os.copy_file_range(in_fd, out_fd, self.chunk_size)
+                    else:
+                        count = os.sendfile(out_fd, in_fd, None, self.chunk_size)
+                except OSError as e:
+                    if e.errno not in _UNSUPPORTED:
+                        raise
+                    methods.pop(0)  # File offsets are kept; continue with the next method
+                    continue
+                if count == 0 and copied < size:
+                    # Some file systems (e.g. procfs) report 0 bytes; read normally
+                    methods.pop(0)
+                    continue
+            else:
+                if buffer is None:
+                    buffer = memoryview(bytearray(min(self.chunk_size, max(size, 64 * 1024))))
+                count = fsrc.readinto(buffer)
+                if count:
+                    fdst.write(buffer[:count])
+            if not count:
+                return True
+            copied += count
+            self.add_bytes(count)
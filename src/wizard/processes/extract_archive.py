@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+import os
+import stat
+import tarfile
+import threading
+import time
+import zipfile
+from .parallel import ParallelProcess
+from .copy_files import format_size
+
+
+class _CountingReader:
+    """File wrapper reporting the number of bytes read (compressed input of tarfile)"""
+    
+    def __init__(self, file, callback):
+        self.file = file
+        self.callback = callback
+    
+    def read(self, size=-1):
+        data = self.file.read(size)
+        if data:
+            self.callback(len(data))
+        return data
+
+
+class ExtractArchiveProcess(ParallelProcess):
+    """
+    Extracts a tar (plain, gz, bz2, xz) or zip archive with progress in
+    compressed bytes read.
+    
+    Tar archives are read as one stream, member by member, so a large
+    .tar.gz is never seeked or read twice. Zip members are compressed
+    independently and are extracted by several worker threads at once.
+    
+    Members that would be written outside destination (absolute paths, "..",
+    symbolic links pointing out of it or written through) stop extraction
+    with ValueError. Device files and FIFOs are skipped.
+    
+    Example:
+        ExtractArchiveProcess("payload.tar.gz", "/opt/app",
+                              state_callback=self._on_process_complete)
+    """
+    
+    def __init__(self, archive, destination, workers=4, buffer_size=1024 * 1024, **kwargs):
+        """
+        Args:
+            archive: path of .tar, .tar.gz, .tgz, .tar.bz2, .tar.xz or .zip file
+            destination: directory to extract into (created if missing)
+            workers: number of threads extracting zip members
+            buffer_size: bytes read and written at once
+            **kwargs: WizardProcess arguments
+        """
+        super().__init__(workers=workers, **kwargs)
+        self.archive = archive
+        self.destination = destination
+        self.buffer_size = buffer_size
+        self.files_extracted = 0
+        self.extracted_bytes = 0  # Uncompressed size of extracted files
+        self._root = None
+    
+    def run(self):
+        self.start_time = time.time()
+        try:
+            os.makedirs(self.destination, exist_ok=True)
+            self._root = os.path.realpath(self.destination)
+            self.log("Extracting {} to {}".format(os.path.basename(self.archive), self.destination))
+            if zipfile.is_zipfile(self.archive):
+                completed = self._extract_zip()
+            else:
+                completed = self._extract_tar()
+            if not completed:
+                return
+        except Exception as e:
+            self.log("[ERROR] {}".format(e))
+            raise
+        
+        elapsed = max(time.time() - self.start_time, 1e-6)
+        self.log("Extracted {} files ({}) in {:.1f} s".format(
+            self.files_extracted, format_size(self.extracted_bytes), elapsed))
+        self.set_success(True)
+    
+    def _target_path(self, name):
+        """
+        Get path of member in destination.
+        
+        Raises:
+            ValueError: member would be written outside destination
+        """
+        path = os.path.normpath(os.path.join(self._root, name))
+        if os.path.isabs(name) or not self._is_inside(path):
+            raise ValueError("Archive member outside destination: {}".format(name))
+        # Parent directories may be symbolic links created by earlier members
+        # (the destination itself, e.g. member "./", has no parent to check)
+        if path != self._root and not self._is_inside(os.path.realpath(os.path.dirname(path))):
+            raise ValueError("Archive member written through a link outside destination: {}".format(name))
+        return path
+    
+    def _is_inside(self, path):
+        return os.path.commonpath([self._root, path]) == self._root
+    
+    def _check_link(self, path, link_target, name):
+        """Raise ValueError if symbolic link at path would point outside destination"""
+        # Resolved on disk: target may go through links extracted before
+        resolved = os.path.realpath(os.path.join(os.path.dirname(path), link_target))
+        if os.path.isabs(link_target) or not self._is_inside(resolved):
+            raise ValueError("Archive link points outside destination: {} -> {}".format(name, link_target))
+    
+    def _write(self, source, path, on_chunk=None):
+        """
+        Write member data to path in chunks.
+        
+        Returns:
+            False if cancelled (the partial file is removed)
+        """
+        if os.path.islink(path):
+            os.remove(path)  # Don't write through a link extracted before
+        written = 0
+        with open(path, 'wb') as target:
+            while True:
+                if self.checkpoint():
+                    break
+                chunk = source.read(self.buffer_size)
+                if not chunk:
+                    with self._bytes_lock:
+                        self.files_extracted += 1
+                        self.extracted_bytes += written
+                    return True
+                target.write(chunk)
+                written += len(chunk)
+                if on_chunk:
+                    on_chunk(written)
+        os.remove(path)
+        return False
+    
+    def _extract_tar(self):
+        self.total_bytes = os.path.getsize(self.archive)
+        directories = []
+        with open(self.archive, 'rb') as raw:
+            reader = _CountingReader(raw, self.add_bytes)
+            # Stream mode ("r|*") reads the archive once, front to back
+            with tarfile.open(fileobj=reader, mode="r|*", bufsize=self.buffer_size) as archive:
+                for member in archive:
+                    if self.checkpoint():
+                        return False
+                    path = self._target_path(member.name)
+                    if member.isdir():
+                        os.makedirs(path, exist_ok=True)
+                        directories.append((path, member))
+                        continue
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    if member.issym():
+                        self._check_link(path, member.linkname, member.name)
+                        if os.path.lexists(path):
+                            os.remove(path)
+                        os.symlink(member.linkname, path)
+                    elif member.islnk():
+                        if os.path.lexists(path):
+                            os.remove(path)
+                        os.link(self._target_path(member.linkname), path)
+                    elif member.isfile():
+                        if not self._write(archive.extractfile(member), path):
+                            return False
+                        self._set_attributes(path, member.mode, member.mtime)
+                    else:
+                        self.log("Skipping special file {}".format(member.name))
+        
+        # Directory times last, extracting into them changes them
+        for path, member in reversed(directories):
+            self._set_attributes(path, member.mode, member.mtime)
+        self.add_bytes(self.total_bytes - self.done_bytes)  # Unread end of archive
+        return True
+    
+    def _set_attributes(self, path, mode, mtime):
+        if mode:
+            os.chmod(path, mode & 0o777)  # No setuid/setgid from archives
+        os.utime(path, (mtime, mtime))
+    
+    def _extract_zip(self):
+        with zipfile.ZipFile(self.archive) as archive:
+            members = archive.infolist()
+        self.total_bytes = sum(info.compress_size for info in members)
+        directories = []
+        files = []
+        links = []
+        for info in members:
+            path = self._target_path(info.filename)
+            if info.is_dir():
+                directories.append((path, info))
+            elif stat.S_ISLNK(info.external_attr >> 16):
+                links.append((path, info))
+            else:
+                files.append((path, info))
+        
+        for path, info in directories:
+            os.makedirs(path, exist_ok=True)
+        for path, info in files:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        # Each worker reads through its own file handle; largest members first
+        # so that no worker is left with a big member at the end
+        local = threading.local()
+        handles = []
+        
+        def extract(item):
+            path, info = item
+            if not hasattr(local, 'archive'):
+                local.archive = zipfile.ZipFile(self.archive)
+                handles.append(local.archive)
+            self._extract_zip_member(local.archive, path, info)
+        
+        files.sort(key=lambda item: item[1].file_size, reverse=True)
+        try:
+            if not self.run_parallel(extract, files):
+                return False
+        finally:
+            for handle in handles:
+                handle.close()
+        
+        # Links last, so no member is written through them
+        with zipfile.ZipFile(self.archive) as archive:
+            for path, info in links:
+                link_target = archive.read(info).decode('utf-8')
+                self._check_link(path, link_target, info.filename)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if os.path.lexists(path):
+                    os.remove(path)
+                os.symlink(link_target, path)
+                self.add_bytes(info.compress_size)
+        for path, info in reversed(directories):
+            self._set_attributes(path, info.external_attr >> 16, self._zip_time(info))
+            self.add_bytes(info.compress_size)
+        return True
+    
+    def _extract_zip_member(self, archive, path, info):
+        """Extract one zip file member (worker thread)"""
+        reported = [0]
+        
+        def on_chunk(written):
+            # Compressed bytes consumed, in proportion to the data written
+            consumed = info.compress_size * written // info.file_size
+            self.add_bytes(consumed - reported[0])
+            reported[0] = consumed
+        
+        with archive.open(info) as source:
+            if not self._write(source, path, on_chunk):
+                return
+        self.add_bytes(info.compress_size - reported[0])
+        self._set_attributes(path, info.external_attr >> 16, self._zip_time(info))
+    
+    @staticmethod
+    def _zip_time(info):
+        return time.mktime(info.date_time + (0, 0, -1))
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import threading
+from ..wizard_process import WizardProcess
+
+_END = object()
+
+
+class ParallelProcess(WizardProcess):
+    """
+    Base for processes that split work between worker threads and report
+    progress in bytes.
+    
+    Subclasses set total_bytes, call add_bytes() as data is processed and
+    run_parallel() to process items in worker threads. Workers stop at the
+    first error, on cancel, and wait while the process is paused.
+    """
+    
+    def __init__(self, workers=4, **kwargs):
+        """
+        Args:
+            workers: number of worker threads
+            **kwargs: WizardProcess arguments
+        """
+        super().__init__(**kwargs)
+        self.workers = max(1, workers)
+        self.total_bytes = 0
+        self.done_bytes = 0
+        self._bytes_lock = threading.Lock()
+    
+    def checkpoint(self):
+        """
+        Cancellation and pause point for worker threads (is_cancelled()
+        pauses only the process thread).
+        
+        Returns:
+            True if process was cancelled
+        """
+        self._resumed.wait()
+        return self.is_cancelled()
+    
+    def add_bytes(self, count):
+        """Count processed bytes and update progress (any thread)"""
+        with self._bytes_lock:
+            self.done_bytes += count
+            done = self.done_bytes
+        self.update_progress(100.0 * done / self.total_bytes if self.total_bytes else 100.0)
+    
+    def run_parallel(self, function, items, workers=None):
+        """
+        Call function(item) for each item in worker threads and wait for them.
+        
+        Args:
+            function: called in worker threads
+            items: list of items
+            workers: number of threads (self.workers if None)
+        
+        Returns:
+            False if process was cancelled
+        
+        Raises:
+            Exception raised by function first (remaining items are skipped)
+        """
+        iterator = iter(items)
+        lock = threading.Lock()
+        errors = []
+        
+        def worker():
+            while not errors and not self.checkpoint():
+                with lock:
+                    item = next(iterator, _END)
+                if item is _END:
+                    return
+                try:
+                    function(item)
+                except Exception as e:
+                    errors.append(e)
+                    return
+        
+        count = min(workers or self.workers, len(items))
+        threads = [threading.Thread(target=worker, daemon=True,
+                                    name="{} worker {}".format(self.__class__.__name__, i + 1))
+                   for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        return not self.is_cancelled()
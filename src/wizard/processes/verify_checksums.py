@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import mmap
+import os
+import threading
+import time
+from .parallel import ParallelProcess
+from .copy_files import format_size
+
+
+def load_manifest(path):
+    """
+    Read manifest in the format of sha256sum and similar tools
+    ("<hash>  <path>" per line, "*" before path in binary mode).
+    
+    Returns:
+        dict path -> hex digest
+    """
+    manifest = {}
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            line = line.rstrip("\r\n")
+            if not line or line.startswith("#"):
+                continue
+            digest, name = line.split(None, 1)
+            manifest[name[1:] if name.startswith("*") else name] = digest
+    return manifest
+
+
+class VerifyChecksumsProcess(ParallelProcess):
+    """
+    Checks files against a manifest of expected hashes.
+    
+    Files are hashed by several worker threads at once (hashlib releases
+    the GIL while hashing large buffers). Large files are memory-mapped and
+    hashed without copying; smaller ones are read into a reused buffer.
+    The first mismatch is logged as soon as it is found and, with
+    stop_on_mismatch, stops the remaining work. Missing files count as
+    mismatches.
+    
+    Example:
+        VerifyChecksumsProcess("payload/SHA256SUMS", base_dir="payload",
+                               state_callback=self._on_process_complete)
+    """
+    
+    def __init__(self, manifest, base_dir=None, algorithm="sha256", workers=4,
+                 buffer_size=1024 * 1024, stop_on_mismatch=True, **kwargs):
+        """
+        Args:
+            manifest: dict path -> hex digest, or path of a manifest file (see load_manifest)
+            base_dir: directory relative paths are resolved against (directory
+                      of the manifest file or current directory if None)
+            algorithm: hashlib algorithm name
+            workers: number of hashing threads
+            buffer_size: bytes hashed at once; files at least this large are memory-mapped
+            stop_on_mismatch: stop at the first mismatch instead of checking all files
+            **kwargs: WizardProcess arguments
+        """
+        super().__init__(workers=workers, **kwargs)
+        if isinstance(manifest, str):
+            if base_dir is None:
+                base_dir = os.path.dirname(os.path.abspath(manifest))
+            manifest = load_manifest(manifest)
+        self.manifest = manifest
+        self.base_dir = base_dir or os.getcwd()
+        self.algorithm = algorithm
+        self.buffer_size = buffer_size
+        self.stop_on_mismatch = stop_on_mismatch
+        hashlib.new(algorithm)  # Raises ValueError for unknown algorithm
+        self.mismatches = []  # (path, expected, actual) in the order found; actual None - missing
+        self._stopped = threading.Event()
+        self._buffers = threading.local()
+    
+    def run(self):
+        self.start_time = time.time()
+        try:
+            items = []
+            for name, digest in self.manifest.items():
+                path = os.path.join(self.base_dir, name)
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    self._mismatch(name, digest, None)
+                    continue
+                items.append((name, path, digest.lower(), size))
+            self.total_bytes = sum(item[3] for item in items)
+            self.log("Verifying {} files ({})".format(len(self.manifest), format_size(self.total_bytes)))
+            
+            # Largest first, so that no worker is left with a big file at the end
+            items.sort(key=lambda item: item[3], reverse=True)
+            if not self._stopped.is_set() and not self.run_parallel(self._verify, items):
+                return
+        except Exception as e:
+            self.log("[ERROR] {}".format(e))
+            raise
+        
+        elapsed = max(time.time() - self.start_time, 1e-6)
+        if self.mismatches:
+            if self.stop_on_mismatch:
+                self.log("Verification stopped at first mismatch")
+            else:
+                self.log("{} of {} files do not match".format(len(self.mismatches), len(self.manifest)))
+            self.set_success(False)
+            return
+        self.log("All {} files verified ({}/s)".format(len(self.manifest), format_size(self.done_bytes / elapsed)))
+        self.set_success(True)
+    
+    def _mismatch(self, name, expected, actual):
+        with self._bytes_lock:
+            self.mismatches.append((name, expected, actual))
+        if actual is None:
+            self.log("[MISSING] {}".format(name))
+        else:
+            self.log("[MISMATCH] {}: expected {}, got {}".format(name, expected, actual))
+        if self.stop_on_mismatch:
+            self._stopped.set()
+    
+    def _verify(self, item):
+        """Hash one file and compare (worker thread)"""
+        name, path, expected, size = item
+        if self._stopped.is_set():
+            return
+        actual = self.hash_file(path, size)
+        if actual is not None and actual != expected:
+            self._mismatch(name, expected, actual)
+    
+    def hash_file(self, path, size=None):
+        """
+        Hash file, counting progress per buffer.
+        
+        Returns:
+            hex digest, or None if stopped or cancelled
+        """
+        digest = hashlib.new(self.algorithm)
+        with open(path, 'rb') as file:
+            if size is None:
+                size = os.fstat(file.fileno()).st_size
+            if size >= self.buffer_size:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        for offset in range(0, len(view), self.buffer_size):
+                            if self.checkpoint() or self._stopped.is_set():
+                                return None
+                            with view[offset:offset + self.buffer_size] as chunk:
+                                digest.update(chunk)
+                                self.add_bytes(len(chunk))
+                    finally:
+                        view.release()
+            else:
+                buffer = getattr(self._buffers, 'buffer', None)
+                if buffer is None:
+                    buffer = self._buffers.buffer = memoryview(bytearray(self.buffer_size))
+                while True:
+                    if self.checkpoint() or self._stopped.is_set():
+                        return None
+                    count = file.readinto(buffer)
+                    if not count:
+                        break
+                    digest.update(buffer[:count])
+                    self.add_bytes(count)
+        return digest.hexdigest()
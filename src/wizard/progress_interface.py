@@ -33,10 +33,23 @@ class ProgressBarAdapter(ProgressInterface):
         self.eta_label = eta_label
         self.elapsed_label = elapsed_label
         self.start_time = time.time()
+        self._paused_at = None
     
     def reset_start_time(self):
         """Reset start time (called at process start)"""
         self.start_time = time.time()
+        self._paused_at = None
+    
+    def pause(self):
+        """Stop counting elapsed time (process paused)"""
+        if self._paused_at is None:
+            self._paused_at = time.time()
+    
+    def resume(self):
+        """Continue counting elapsed time; paused time is not included"""
+        if self._paused_at is not None:
+            self.start_time += time.time() - self._paused_at
+            self._paused_at = None
     
     def set_percent(self, percent):
         """Set completion percentage"""
@@ -81,6 +94,7 @@ class ProgressBarAdapter(ProgressInterface):
                 pass  # Widget destroyed
     
     def get_elapsed(self):
-        """Get elapsed time from start"""
-        return time.time() - self.start_time
+        """Get elapsed time from start (without paused time)"""
+        now = self._paused_at if self._paused_at is not None else time.time()
+        return now - self.start_time
 
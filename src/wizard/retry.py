@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Retry policy for failed step processes.
+"""
+import random
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before running a failed step process again.
+    
+    Delay before attempt n+1 is initial_delay * multiplier ** (n - 1), capped
+    at max_delay, with random jitter of +/- jitter (fraction of the delay) so
+    that several wizards don't retry in lockstep.
+    
+    Example:
+        class ConnectStep(WizardStep):
+            retry_policy = RetryPolicy(max_attempts=5, retryable=(ConnectionError, TimeoutError))
+    """
+    
+    def __init__(self, max_attempts=3, initial_delay=1.0, multiplier=2.0, max_delay=30.0,
+                 jitter=0.2, retryable=(Exception,), retry_failures=False):
+        """
+        Args:
+            max_attempts: total number of attempts including the first one
+            initial_delay: seconds before the second attempt
+            multiplier: delay growth factor per attempt
+            max_delay: upper limit of delay in seconds
+            jitter: random deviation as a fraction of the delay (0 - none)
+            retryable: exception classes worth retrying, or callable(error) -> bool
+            retry_failures: also retry failures without exception (set_success(False))
+        """
+        self.max_attempts = max_attempts
+        self.initial_delay = initial_delay
+        self.multiplier = multiplier
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retryable = retryable
+        self.retry_failures = retry_failures
+    
+    def should_retry(self, attempt, error):
+        """
+        Args:
+            attempt: number of the attempt that failed (from 1)
+            error: exception raised by the process or None
+        
+        Returns:
+            True if another attempt should be made
+        """
+        if attempt >= self.max_attempts:
+            return False
+        if error is None:
+            return self.retry_failures
+        if isinstance(self.retryable, (type, tuple)):
+            return isinstance(error, self.retryable)
+        return bool(self.retryable(error))
+    
+    def delay(self, attempt):
+        """Seconds to wait after failed attempt number attempt (from 1)"""
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** (attempt - 1))
+        if self.jitter:
+            delay *= 1.0 + random.uniform(-self.jitter, self.jitter)
+        return max(0.0, delay)
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Concurrent execution of independent non-interactive steps.
+"""
+from .enums import StepStatus
+
+
+class StepScheduler:
+    """
+    Starts processes of steps whose dependencies (WizardStep.depends_on) have
+    succeeded, without waiting for the user to reach them.
+    
+    Only non-interactive steps are started early, and only those the user can
+    reach without filling in another form: the run of non-interactive steps
+    beginning at the current step. Steps in that run without mutual
+    dependencies run concurrently (up to max_concurrent). When a step fails,
+    steps that depend on it (directly or indirectly) are cancelled; the
+    others keep running.
+    
+    A step streaming from another (WizardStep.stream_from) is started in the
+    same pass as the producing step's process, so both overlap; it does not
+    count against max_concurrent. If it can't start then, the producer's
+    chunks are dropped instead of waiting for a reader that never comes.
+    """
+    
+    def __init__(self, wizard_app, max_concurrent=4):
+        """
+        Args:
+            wizard_app: WizardApp whose steps are scheduled
+            max_concurrent: maximum number of processes started by the scheduler at once
+        """
+        self.wizard_app = wizard_app
+        self.max_concurrent = max_concurrent
+    
+    def _reachable_steps(self):
+        """Current step and following non-interactive steps (no form in between)"""
+        steps = self.wizard_app.steps
+        graph = self.wizard_app.graph
+        index = self.wizard_app.current_step_index
+        reachable = []
+        if 0 <= index < len(steps):
+            reachable.append(steps[index])
+            # Skipped steps are not started
+            index = graph.next_index(index)
+            while index is not None and not steps[index].interactive:
+                reachable.append(steps[index])
+                index = graph.next_index(index)
+        return reachable
+    
+    def running(self):
+        """Steps with running processes"""
+        return [step for step in self.wizard_app.steps if step.status == StepStatus.RUNNING]
+    
+    def busy(self):
+        """Whether any step process is running"""
+        return any(step.status == StepStatus.RUNNING for step in self.wizard_app.steps)
+    
+    def schedule(self):
+        """
+        Start processes of reachable steps whose dependencies succeeded.
+        
+        Returns:
+            List of started steps
+        """
+        steps = self.wizard_app.steps
+        index = self.wizard_app.current_step_index
+        current_step = steps[index] if 0 <= index < len(steps) else None
+        slots = self.max_concurrent - len(self.running())
+        started = []
+        for step in self._reachable_steps():
+            streaming = step.get_stream_source() is not None
+            if slots <= 0 and not streaming:
+                continue
+            if step.status != StepStatus.PENDING or not step.dependencies_met():
+                continue
+            consumer = step.get_stream_consumer()
+            if consumer is not None and not consumer.is_prepared():
+                consumer.start_prepare()  # Producer waits; scheduled again by on_step_prepared
+                continue
+            if step is current_step:
+                # Content is shown and waits for dependencies; start process with its widgets
+                if not step.waiting_for_dependencies:
+                    continue
+                step.waiting_for_dependencies = False
+                step.start_process()
+            else:
+                if not step.is_prepared():
+                    step.start_prepare()  # Scheduled again by on_step_prepared
+                    continue
+                if step._speculation is not None:
+                    continue
+                step.start_detached()
+            if step.status == StepStatus.RUNNING and not streaming:
+                slots -= 1
+            started.append(step)
+        self._drop_unconsumed_streams()
+        return started
+    
+    def _drop_unconsumed_streams(self):
+        """Stop sending chunks of running producers whose consumer did not start with them"""
+        for step in self.running():
+            output = step.process.output if step.process is not None else None
+            if output is None:
+                continue
+            if not any(consumer.process is not None and consumer.process.input is output
+                       for consumer in step.get_stream_consumers()):
+                step.process.output = None  # send() drops chunks from now on
+    
+    def dependents(self, step):
+        """Steps that depend on step directly or indirectly"""
+        found = []
+        pending = [step]
+        while pending:
+            failed = pending.pop()
+            for other in self.wizard_app.steps:
+                if other in found or other is step:
+                    continue
+                if failed in other.get_dependencies() or other.get_stream_source() is failed:
+                    found.append(other)
+                    pending.append(other)
+        return found
+    
+    def cancel_dependents(self, step):
+        """
+        Cancel steps depending on failed step (they are marked FAILED).
+        
+        The wizard is notified of each cancelled step like of a process
+        completion, once all of them are marked.
+        
+        Returns:
+            List of cancelled steps
+        """
+        cancelled = []
+        for dependent in self.dependents(step):
+            if dependent.status in (StepStatus.SUCCESS, StepStatus.FAILED):
+                continue
+            if dependent.process is not None and dependent.status == StepStatus.RUNNING:
+                dependent.process.cancel(notify=False)
+            dependent.status = StepStatus.FAILED
+            cancelled.append(dependent)
+        for dependent in cancelled:
+            self.wizard_app.on_step_status_changed(dependent)
+        return cancelled
+    
+    def on_step_finished(self, step):
+        """Called when step status changes: cancel dependents of failures, start what became ready"""
+        if step.is_failed():
+            self.cancel_dependents(step)
+        self.schedule()
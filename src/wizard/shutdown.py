@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Bounded-time wizard shutdown.
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ShutdownCoordinator:
+    """
+    Stops the wizard in a fixed order with one global deadline:
+    
+    1. cancel all live processes (steps are not notified)
+    2. wait for their threads until the deadline
+    3. flush buffered process logs and registered sinks (log files, checkpoints)
+    4. run process cleanup() and registered cleanup hooks (last added first)
+    
+    Processes still running at the deadline are reported, not waited for.
+    """
+    
+    def __init__(self, registry, deadline=5.0):
+        """
+        Args:
+            registry: ProcessRegistry with live processes
+            deadline: seconds the whole shutdown may take
+        """
+        self.registry = registry
+        self.deadline = deadline
+        self.report = None  # Result of last shutdown()
+        self._sinks = []
+        self._cleanups = []
+        self._lock = threading.Lock()
+        self._done = False
+    
+    def add_sink(self, sink):
+        """Register object with flush() (log file, checkpoint writer) flushed on shutdown"""
+        self._sinks.append(sink)
+    
+    def add_cleanup(self, func):
+        """Register function called on shutdown (e.g. remove temporary files)"""
+        self._cleanups.append(func)
+    
+    def shutdown(self, deadline=None):
+        """
+        Run shutdown (only once; later calls return the first report).
+        
+        Args:
+            deadline: seconds for the whole shutdown (self.deadline if None)
+        
+        Returns:
+            dict with keys: missed (display names of steps whose processes
+            did not stop in time), errors (failed flushes/cleanups), elapsed
+        """
+        with self._lock:
+            if self._done:
+                return self.report
+            self._done = True
+        
+        started = time.monotonic()
+        timeout = self.deadline if deadline is None else deadline
+        errors = []
+        
+        processes = self.registry.live()
+        missed = self.registry.cancel_all(timeout)
+        
+        # Sinks: buffered process logs, their loggers and registered objects
+        for process in processes:
+            process.flush_log()
+        sinks = list(self._sinks)
+        for process in processes:
+            if process.logger is not None and hasattr(process.logger, 'flush') and process.logger not in sinks:
+                sinks.append(process.logger)
+        for sink in sinks:
+            try:
+                sink.flush()
+            except Exception as e:
+                errors.append("flush {}: {}".format(sink.__class__.__name__, e))
+        
+        cleanups = [process.cleanup for process in processes if process not in missed]
+        cleanups.extend(reversed(self._cleanups))
+        for func in cleanups:
+            try:
+                func()
+            except Exception as e:
+                errors.append("cleanup {}: {}".format(getattr(func, '__qualname__', func), e))
+        
+        missed_steps = [process.owner.get_display_name() if process.owner else process.__class__.__name__
+                        for process in missed]
+        self.report = {
+            'missed': missed_steps,
+            'errors': errors,
+            'elapsed': time.monotonic() - started,
+        }
+        if missed_steps:
+            logger.warning("Shutdown deadline of %.1f s missed by: %s", timeout, ", ".join(missed_steps))
+        for error in errors:
+            logger.warning("Shutdown: %s", error)
+        return self.report
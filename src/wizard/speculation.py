@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Output capture for processes started before their step is shown.
+
+A speculative process has no widgets to write to yet; its log lines and last
+progress are kept here and replayed into the step's widgets when the user
+arrives at the step.
+"""
+import tkinter as tk
+import time
+from .progress_interface import ProgressInterface
+
+
+class CaptureLog:
+    """Text widget compatible logger keeping lines in memory"""
+    
+    def __init__(self):
+        self.lines = []
+    
+    def insert(self, index, text):
+        """Text widget compatible insert (index is ignored)"""
+        self.lines.extend(text.splitlines())
+    
+    def see(self, index):
+        pass
+    
+    def replay(self, logger):
+        """Write captured lines to logger (main thread)"""
+        if not self.lines:
+            return
+        try:
+            logger.insert(tk.END, "\n".join(self.lines) + "\n")
+            logger.see(tk.END)
+        except:
+            pass  # Widget may have been destroyed
+
+
+class CaptureProgress(ProgressInterface):
+    """Progress interface remembering last values"""
+    
+    def __init__(self):
+        self.percent = None
+        self.eta = None
+        self.start_time = time.time()
+    
+    def set_percent(self, percent):
+        self.percent = percent
+    
+    def set_eta(self, seconds):
+        self.eta = seconds
+    
+    def set_elapsed_time(self, seconds):
+        pass
+    
+    def get_elapsed(self):
+        return time.time() - self.start_time
+    
+    def replay(self, progress_interface):
+        """Apply last values to progress interface (main thread)"""
+        if hasattr(progress_interface, 'start_time'):
+            # Elapsed time and ETA include time spent before the step was shown
+            progress_interface.start_time = self.start_time
+        if self.percent is not None:
+            progress_interface.set_percent(self.percent)
+        if self.eta is not None:
+            progress_interface.set_eta(self.eta)
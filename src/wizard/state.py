@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+Shared wizard state: observable key-value store.
+
+Steps publish values (user choices, detected paths, ...) under string keys
+instead of looking up other steps. Reads can be tracked, so that data derived
+from the store (prepared step data, processes started ahead of time, cached
+values) is dropped exactly when one of the keys it read changes.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class Computed:
+    """
+    Value calculated from store keys, memoized until one of them changes.
+    
+    Created by StateStore.computed(). Keys read by the function are recorded
+    on each calculation; get() recalculates only when a recorded key has a
+    newer version.
+    """
+    
+    def __init__(self, store, function):
+        self.store = store
+        self.function = function
+        self._value = None
+        self._inputs = None  # key -> version read by last calculation
+    
+    def get(self):
+        """Get value, recalculating if inputs changed"""
+        if self._inputs is None or self.store.changed_since(self._inputs):
+            with self.store.track() as inputs:
+                value = self.function()
+            self._value = value
+            self._inputs = inputs
+        else:
+            # Keys read by the cached value count as read by the caller
+            self.store._record_reads(self._inputs)
+        return self._value
+    
+    def invalidate(self):
+        """Force recalculation on next get()"""
+        self._inputs = None
+
+
+class StateStore:
+    """
+    Typed key-value store shared by wizard steps.
+    
+    set() may be called from any thread. Subscribers are notified in the
+    main thread once per idle cycle with all keys changed since the last
+    notification (several changes of one key are delivered once, with the
+    latest value).
+    
+    Example:
+        state.define("install_dir", str, "/opt/app")
+        state.subscribe("install_dir", lambda changes: print(changes["install_dir"]))
+        state.set("install_dir", "/srv/app")
+    """
+    
+    def __init__(self, root=None):
+        """
+        Args:
+            root: Tk root (or HeadlessRoot) used to deliver notifications;
+                  without root subscribers are called from set()
+        """
+        self.root = root
+        self._values = {}
+        self._types = {}
+        self._versions = {}
+        self._subscriptions = []  # [keys or None, callback]
+        self._changed = {}  # key -> value waiting for notification
+        self._lock = threading.RLock()
+        self._local = threading.local()
+    
+    def define(self, key, value_type=None, default=_MISSING):
+        """
+        Declare key with its value type and default value.
+        
+        Args:
+            key: key name
+            value_type: type (or tuple of types) of values, None - any
+            default: initial value (kept if key already has a value)
+        """
+        with self._lock:
+            self._types[key] = value_type
+            if default is not _MISSING and key not in self._values:
+                self._check_type(key, default)
+                self._values[key] = default
+                self._versions.setdefault(key, 0)
+    
+    def _check_type(self, key, value):
+        value_type = self._types.get(key)
+        if value_type is not None and value is not None and not isinstance(value, value_type):
+            raise TypeError("State key '{}' expects {}, got {}".format(
+                key, value_type, type(value).__name__))
+    
+    def get(self, key, default=_MISSING):
+        """
+        Get value of key (recorded as read by active track()).
+        
+        Raises:
+            KeyError: key has no value and no default was given
+        """
+        with self._lock:
+            self._record_reads({key: self._versions.get(key, 0)})
+            if key in self._values:
+                return self._values[key]
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+    
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._values
+    
+    def set(self, key, value):
+        """
+        Set value of key; subscribers are notified if it changed.
+        
+        Raises:
+            TypeError: value does not match the type given in define()
+        """
+        self.update({key: value})
+    
+    def update(self, values):
+        """Set several keys at once (one notification)"""
+        with self._lock:
+            for key, value in values.items():
+                self._check_type(key, value)
+            schedule = not self._changed
+            changed = False
+            for key, value in values.items():
+                if key in self._values and self._values[key] == value:
+                    continue
+                self._values[key] = value
+                self._versions[key] = self._versions.get(key, 0) + 1
+                self._changed[key] = value
+                changed = True
+            if not (changed and schedule):
+                return
+        if self.root is None:
+            self.flush()
+        else:
+            self.root.after_idle(self.flush)
+    
+    def subscribe(self, keys, callback):
+        """
+        Call callback(changes) in the main thread when any of keys changes.
+        
+        Args:
+            keys: key, iterable of keys, or None for all keys
+            callback: function receiving dict key -> new value (only subscribed keys)
+        
+        Returns:
+            Function that removes the subscription
+        """
+        if isinstance(keys, str):
+            keys = {keys}
+        elif keys is not None:
+            keys = set(keys)
+        subscription = [keys, callback]
+        with self._lock:
+            self._subscriptions.append(subscription)
+        
+        def unsubscribe():
+            with self._lock:
+                if subscription in self._subscriptions:
+                    self._subscriptions.remove(subscription)
+        return unsubscribe
+    
+    def flush(self):
+        """Notify subscribers of pending changes now"""
+        with self._lock:
+            changes = self._changed
+            self._changed = {}
+            subscriptions = list(self._subscriptions)
+        if not changes:
+            return
+        for keys, callback in subscriptions:
+            if keys is None:
+                selected = dict(changes)
+            else:
+                selected = {key: value for key, value in changes.items() if key in keys}
+            if not selected:
+                continue
+            try:
+                callback(selected)
+            except Exception:
+                logger.exception("State subscriber %r failed", callback)
+    
+    @contextmanager
+    def track(self):
+        """
+        Record keys read by get() in this thread with their versions.
+        
+        Example:
+            with state.track() as inputs:
+                data = load(state.get("install_dir"))
+            ...
+            if state.changed_since(inputs):
+                data = None
+        """
+        inputs = {}
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(inputs)
+        try:
+            yield inputs
+        finally:
+            stack.pop()
+    
+    def _record_reads(self, versions):
+        for inputs in getattr(self._local, 'stack', ()):
+            for key, version in versions.items():
+                inputs.setdefault(key, version)
+    
+    def changed_since(self, versions):
+        """Whether any key changed after versions were read (dict from track())"""
+        with self._lock:
+            return any(self._versions.get(key, 0) != version for key, version in versions.items())
+    
+    def computed(self, function):
+        """Create memoized value of function() (see Computed)"""
+        return Computed(self, function)
+    
+    def bind(self, key, variable):
+        """
+        Keep Tk variable and key in sync in both directions.
+        
+        The key takes the variable's value unless it already has one, in
+        which case the variable is set from the key.
+        """
+        if key in self:
+            variable.set(self.get(key))
+        else:
+            self.set(key, variable.get())
+        variable.trace_add("write", lambda *args: self.set(key, variable.get()))
+        
+        def on_change(changes):
+            try:
+                if variable.get() != changes[key]:
+                    variable.set(changes[key])
+            except:
+                pass  # Variable was destroyed
+        return self.subscribe(key, on_change)
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Compiled navigation structure of wizard steps.
+"""
+from .enums import StepRole
+
+
+def check_stream_consumers(steps):
+    """
+    Check steps streaming from another step (WizardStep.stream_from).
+    
+    The consumer's process is started together with the producer's, so the
+    consumer must be non-interactive and no interactive step may be between
+    them (the producer would wait for a reader that is never started).
+    
+    Raises:
+        ValueError: an interactive step streams from another step or is
+                    between a consumer and its producer
+    """
+    for index, step in enumerate(steps):
+        source = step.stream_from
+        if source is None:
+            continue
+        if step.interactive:
+            raise ValueError("Step {} streams from another step and must set interactive = False".format(
+                step.get_display_name()))
+        for between in reversed(steps[:index]):
+            if between is source or (isinstance(source, type) and isinstance(between, source)):
+                break
+            if between.interactive:
+                raise ValueError("Interactive step {} is between step {} and the step it streams from".format(
+                    between.get_display_name(), step.get_display_name()))
+
+
+class StepGraph:
+    """
+    Steps of a wizard with precomputed lookups.
+    
+    Index of a step and the step with a role (StepRole) are found in constant
+    time. Steps can be skipped by overriding WizardStep.is_enabled(); the
+    conditions are evaluated only when navigation passes the step, and the
+    result, like the next and previous enabled step of each index, is
+    memoized in the wizard state store until a state key it read changes.
+    
+    The graph shares the step list with the wizard (wizard_app.steps).
+    """
+    
+    def __init__(self, steps, roles=None, state=None):
+        """
+        Args:
+            steps: list of WizardStep objects (kept by reference)
+            roles: dict StepRole -> step; steps with a role need not be in steps yet
+            state: StateStore used to memoize conditions (None - no memoization)
+        """
+        self.steps = steps
+        self.state = state
+        self._roles = dict(roles or {})
+        self._role_of = {id(step): role for role, step in self._roles.items() if step is not None}
+        self._index = {}
+        self._enabled = {}  # id(step) -> Computed is_enabled()
+        self._next = {}  # index -> Computed next enabled index
+        self._prev = {}  # index -> Computed previous enabled index
+        self._reindex()
+    
+    def _reindex(self):
+        self._index = {id(step): i for i, step in enumerate(self.steps)}
+        # Whether any step has a skip rule
+        self.has_conditions = any(step.has_condition() for step in self.steps)
+        self._next.clear()
+        self._prev.clear()
+    
+    def invalidate(self):
+        """Forget memoized conditions (e.g. after they read values outside the state store)"""
+        self._enabled.clear()
+        self._reindex()
+    
+    def index_of(self, step):
+        """Get index of step in steps, None if it is not there"""
+        index = self._index.get(id(step))
+        if index is not None and index < len(self.steps) and self.steps[index] is step:
+            return index
+        if len(self._index) != len(self.steps) or index is not None:
+            # Step list was changed directly; rebuild indices
+            self._reindex()
+            return self._index.get(id(step))
+        return None
+    
+    def append(self, step):
+        """Add step at the end (e.g. end fail step on first use), return its index"""
+        index = self.index_of(step)
+        if index is None:
+            self.steps.append(step)
+            index = len(self.steps) - 1
+            self._index[id(step)] = index
+            self.has_conditions = self.has_conditions or step.has_condition()
+            self._next.clear()
+            self._prev.clear()
+        return index
+    
+    def step_for(self, role):
+        """Get step with role, None if there is none"""
+        return self._roles.get(role)
+    
+    def role_of(self, step):
+        """Get StepRole of step, None for ordinary steps"""
+        if step is None:
+            return None
+        return self._role_of.get(id(step))
+    
+    def is_enabled(self, step):
+        """Whether step is on the wizard's path (memoized WizardStep.is_enabled())"""
+        if not step.has_condition():
+            return True
+        if self.state is None:
+            return step.is_enabled()
+        computed = self._enabled.get(id(step))
+        if computed is None:
+            computed = self._enabled[id(step)] = self.state.computed(step.is_enabled)
+        return bool(computed.get())
+    
+    def _memoized(self, cache, index, function):
+        if self.state is None:
+            return function(index)
+        computed = cache.get(index)
+        if computed is None:
+            computed = cache[index] = self.state.computed(lambda: function(index))
+        return computed.get()
+    
+    def _scan(self, index, direction):
+        index += direction
+        while 0 <= index < len(self.steps):
+            step = self.steps[index]
+            if self.role_of(step) != StepRole.FAIL and self.is_enabled(step):
+                return index
+            index += direction
+        return None
+    
+    def next_index(self, index):
+        """Index of the next enabled step after index (end fail step excluded), None if none"""
+        if len(self._index) != len(self.steps):
+            self._reindex()
+        return self._memoized(self._next, index, lambda i: self._scan(i, 1))
+    
+    def prev_index(self, index):
+        """Index of the previous enabled step before index, None if none"""
+        if len(self._index) != len(self.steps):
+            self._reindex()
+        return self._memoized(self._prev, index, lambda i: self._scan(i, -1))
+    
+    def following(self, index, count=None):
+        """Indices of enabled steps after index (at most count)"""
+        found = []
+        index = self.next_index(index)
+        while index is not None and (count is None or len(found) < count):
+            found.append(index)
+            index = self.next_index(index)
+        return found
@@ -6,10 +6,16 @@ Core wizard steps
 from .welcome_step import WelcomeStep
 from .end_with_fail_step import EndWithFailStep
 from .end_success_step import EndSuccessStep
+from .selection_step import SelectionStep, SelectionIndex
+from .precondition_step import PreconditionCheckStep, PreconditionCheck
 
 __all__ = [
     'WelcomeStep',
     'EndWithFailStep',
     'EndSuccessStep',
+    'SelectionStep',
+    'SelectionIndex',
+    'PreconditionCheckStep',
+    'PreconditionCheck',
 ]
 
@@ -9,18 +9,18 @@ class EndSuccessStep(WizardStep):
     
     def create_content(self, content_frame):
         title = ttk.Label(content_frame, text="Wizard Completed Successfully!", 
-                         font=("Arial", 16, "bold"), foreground="green")
+                         style='Wizard.SuccessTitle.TLabel')
         title.pack(pady=(0, 20))
         
         icon_label = ttk.Label(content_frame, text="✓", 
-                              font=("Arial", 48), foreground="green")
+                              style='Wizard.SuccessIcon.TLabel')
         icon_label.pack(pady=20)
         
         wizard_name = self.wizard_app.config.wizard_name if self.wizard_app.config else "Wizard"
         message = ttk.Label(content_frame, 
                            text="The wizard has completed successfully.\n"
                                 "Click 'Finish' to close the wizard.",
-                           justify=tk.CENTER, font=("Arial", 10))
+                           justify=tk.CENTER, style='Wizard.Body.TLabel')
         message.pack(pady=10)
     
     def create_process(self):
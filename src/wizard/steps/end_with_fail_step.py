@@ -9,18 +9,26 @@ class EndWithFailStep(WizardStep):
     
     def create_content(self, content_frame):
         title = ttk.Label(content_frame, text="Wizard Completed with Errors", 
-                         font=("Arial", 16, "bold"), foreground="red")
+                         style='Wizard.FailTitle.TLabel')
         title.pack(pady=(0, 20))
         
         icon_label = ttk.Label(content_frame, text="✗", 
-                              font=("Arial", 48), foreground="red")
+                              style='Wizard.FailIcon.TLabel')
         icon_label.pack(pady=20)
         
         message = ttk.Label(content_frame, 
                            text="An error occurred during wizard execution.\n"
                                 "The wizard was not completed successfully.",
-                           justify=tk.CENTER, font=("Arial", 10))
+                           justify=tk.CENTER, style='Wizard.Body.TLabel')
         message.pack(pady=10)
+        
+        # Details of the failure (e.g. process stopped by the watchdog)
+        failed_step = getattr(self.wizard_app, 'failed_step', None)
+        if failed_step and failed_step.process and failed_step.process.diagnostics:
+            details = ttk.Label(content_frame, text=failed_step.process.diagnostics['reason'],
+                                wraplength=self.wizard_app.scale(450), justify=tk.CENTER,
+                                style='Wizard.Hint.TLabel')
+            details.pack(pady=(0, 10))
     
     def create_process(self):
         return None
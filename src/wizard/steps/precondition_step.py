@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+import collections
+import queue
+import re
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+from ..wizard_step import WizardStep
+from ..wizard_process import WizardProcess
+
+
+class PreconditionCheck:
+    """
+    One environment check of PreconditionCheckStep.
+    
+    The function takes no arguments. The check fails if it raises (the
+    exception text is shown) or returns False; a returned string is shown
+    as detail of a passed check (e.g. "120 GB free").
+    """
+    
+    def __init__(self, function, name=None, timeout=None, required=True):
+        """
+        Args:
+            function: check callable
+            name: name shown in the table (from function name if None)
+            timeout: seconds after which the check fails (step default if None)
+            required: False - failure is only a warning and does not fail the step
+        """
+        self.function = function
+        if name is None:
+            name = getattr(function, '__name__', None) or function.__class__.__name__
+            name = re.sub(r'^check_', '', name).replace('_', ' ').capitalize()
+        self.name = name
+        self.timeout = timeout
+        self.required = required
+
+
+class PreconditionProcess(WizardProcess):
+    """
+    Runs checks concurrently (up to max_workers at once), each with its own timeout.
+    
+    A check that times out is reported as failed and no longer counts against
+    max_workers; its thread is left to finish in the background.
+    """
+    
+    def __init__(self, checks, timeout=30.0, max_workers=16, result_callback=None, **kwargs):
+        """
+        Args:
+            checks: list of PreconditionCheck objects
+            timeout: default timeout of a check in seconds
+            max_workers: maximum number of checks running at once (at least 1)
+            result_callback: function(indices) called in the main thread when
+                             results at these indices of self.results changed
+        """
+        super().__init__(**kwargs)
+        self.checks = checks
+        self.timeout = timeout
+        self.max_workers = max(1, max_workers)
+        self.result_callback = result_callback
+        # Current state of each check: status is "waiting", "running", "passed",
+        # "failed" or "warning" (failed check that is not required)
+        self.results = [{'name': check.name, 'status': "waiting", 'detail': "", 'seconds': None}
+                        for check in checks]
+        self._changed = set()
+    
+    def _report(self, index, status, detail="", seconds=None):
+        """Update result of check and schedule table update (one per event loop pass)"""
+        with self._lock:
+            self.results[index] = dict(self.results[index], status=status, detail=detail, seconds=seconds)
+            scheduled = bool(self._changed)
+            self._changed.add(index)
+        if self.root and not scheduled:
+            self.root.after(0, self.flush_results)
+    
+    def flush_results(self):
+        """Deliver changed results to result_callback (main thread)"""
+        with self._lock:
+            changed = self._changed
+            self._changed = set()
+        callback = self.result_callback
+        if changed and callback:
+            callback(sorted(changed))
+    
+    def _run_check(self, index, results):
+        started = time.monotonic()
+        try:
+            value = self.checks[index].function()
+            passed = value is not False
+            detail = value if isinstance(value, str) else ""
+        except Exception as e:
+            passed = False
+            detail = str(e) or e.__class__.__name__
+        results.put((index, passed, detail, time.monotonic() - started))
+    
+    def _complete(self, index, passed, detail, seconds):
+        check = self.checks[index]
+        status = "passed" if passed else ("failed" if check.required else "warning")
+        self._report(index, status, detail, seconds)
+        label = {"passed": "OK", "failed": "FAIL", "warning": "WARN"}[status]
+        self.log("[{}] {} ({:.1f} s){}".format(label, check.name, seconds,
+                                               ": {}".format(detail) if detail else ""))
+    
+    def run(self):
+        self.start_time = time.time()
+        results = queue.Queue()
+        waiting = collections.deque(range(len(self.checks)))
+        running = {}  # index -> (started, deadline)
+        done = 0
+        
+        while (waiting or running) and not self.is_cancelled():
+            now = time.monotonic()
+            while waiting and len(running) < self.max_workers:
+                index = waiting.popleft()
+                timeout = self.checks[index].timeout or self.timeout
+                running[index] = (now, now + timeout)
+                self._report(index, "running")
+                threading.Thread(target=self._run_check, args=(index, results), daemon=True,
+                                 name="Check {}".format(self.checks[index].name)).start()
+            
+            # Wait for next result, but not past the nearest deadline
+            wait = min(deadline for started, deadline in running.values()) - now
+            try:
+                index, passed, detail, seconds = results.get(timeout=max(0.0, min(wait, 0.2)))
+                if index in running:  # Result of a check that timed out is ignored
+                    del running[index]
+                    self._complete(index, passed, detail, seconds)
+                    done += 1
+            except queue.Empty:
+                pass
+            
+            now = time.monotonic()
+            for index, (started, deadline) in list(running.items()):
+                if now >= deadline:
+                    del running[index]
+                    self._complete(index, False, "timed out", now - started)
+                    done += 1
+            
+            self.heartbeat()
+            self.update_progress(100.0 * done / len(self.checks))
+        
+        if self.is_cancelled():
+            return
+        
+        failed = [result for result in self.results if result['status'] == "failed"]
+        self.log("{} of {} checks passed".format(
+            sum(1 for result in self.results if result['status'] == "passed"), len(self.results)))
+        self.set_success(not failed)
+
+
+class PreconditionCheckStep(WizardStep):
+    """
+    Step running environment checks (disk space, permissions, packages, ...)
+    concurrently and showing their results in a table as they arrive.
+    
+    The step succeeds when every required check passes, so the checks take
+    as long as the slowest one. Checks only read, so they may start before
+    the step is shown (side_effect_free).
+    
+    Example:
+        PreconditionCheckStep(wizard, [
+            check_disk_space,
+            PreconditionCheck(check_port_free, name="Port 8080 free", timeout=5),
+            PreconditionCheck(check_ntp, required=False),
+        ])
+    """
+    
+    side_effect_free = True
+    
+    STATUS_ICONS = {
+        "waiting": "○",
+        "running": "⟳",
+        "passed": "✓",
+        "failed": "✗",
+        "warning": "!",
+    }
+    
+    def __init__(self, wizard_app, checks, title="System Check", description="",
+                 timeout=30.0, max_workers=16):
+        """
+        Args:
+            wizard_app: WizardApp object
+            checks: list of check callables or PreconditionCheck objects
+            title: step title
+            description: text shown under the title
+            timeout: default timeout of a check in seconds
+            max_workers: maximum number of checks running at once (at least 1)
+        """
+        super().__init__(wizard_app)
+        self.checks = [check if isinstance(check, PreconditionCheck) else PreconditionCheck(check)
+                       for check in checks]
+        self.title = title
+        self.description = description
+        self.timeout = timeout
+        self.max_workers = max(1, max_workers)
+        self.table = None
+    
+    def create_content(self, content_frame):
+        title = ttk.Label(content_frame, text=self.title, style='Wizard.Title.TLabel')
+        title.pack(pady=(0, 10), anchor=tk.W)
+        
+        if self.description:
+            info = ttk.Label(content_frame, text=self.description,
+                             justify=tk.LEFT, style='Wizard.Body.TLabel')
+            info.pack(anchor=tk.W, pady=(0, 10))
+        
+        table_frame = ttk.Frame(content_frame)
+        table_frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.table = ttk.Treeview(table_frame, columns=("status", "time", "detail"),
+                                  height=min(max(len(self.checks), 5), 15))
+        self.table.heading("#0", text="Check", anchor=tk.W)
+        self.table.heading("status", text="", anchor=tk.W)
+        self.table.heading("time", text="Time", anchor=tk.W)
+        self.table.heading("detail", text="Details", anchor=tk.W)
+        self.table.column("#0", width=self.wizard_app.scale(220), stretch=False)
+        self.table.column("status", width=self.wizard_app.scale(30), stretch=False)
+        self.table.column("time", width=self.wizard_app.scale(60), stretch=False)
+        self.table.column("detail", width=self.wizard_app.scale(250))
+        self.table.tag_configure("passed", foreground=getattr(self.wizard_app, 'success_color', "#107c10"))
+        self.table.tag_configure("failed", foreground=getattr(self.wizard_app, 'failed_color', "#d13438"))
+        self.table.tag_configure("warning", foreground=getattr(self.wizard_app, 'running_color', "#ffaa00"))
+        
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.table.yview)
+        self.table.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        for index, check in enumerate(self.checks):
+            self.table.insert("", tk.END, iid=str(index), text=check.name,
+                              values=(self.STATUS_ICONS["waiting"], "", ""))
+        
+        self.summary_label = ttk.Label(content_frame, style='Wizard.Hint.TLabel')
+        self.summary_label.pack(anchor=tk.W, pady=(5, 0))
+    
+    def create_headless_process(self):
+        return PreconditionProcess(self.checks, timeout=self.timeout, max_workers=self.max_workers,
+                                   state_callback=self._on_process_complete)
+    
+    def create_process(self):
+        process = self.create_headless_process()
+        process.result_callback = self._show_results
+        return process
+    
+    def attach_process(self, process):
+        """Show results of a process started before the step was shown"""
+        # The table replaces log and progress output
+        process.logger = None
+        process.progress_interface = None
+        process.result_callback = self._show_results
+        self._show_results(range(len(process.results)))
+    
+    def _show_results(self, indices):
+        """Update table rows from process results (main thread)"""
+        process = self.process
+        if process is None or self.table is None:
+            return
+        try:
+            for index in indices:
+                result = process.results[index]
+                seconds = "" if result['seconds'] is None else "{:.1f} s".format(result['seconds'])
+                self.table.item(str(index), values=(self.STATUS_ICONS[result['status']], seconds,
+                                                    result['detail']),
+                                tags=(result['status'],))
+            counts = collections.Counter(result['status'] for result in process.results)
+            self.summary_label.config(text="{} passed, {} failed, {} warnings, {} remaining".format(
+                counts["passed"], counts["failed"], counts["warning"],
+                counts["waiting"] + counts["running"]))
+        except tk.TclError:
+            pass  # Widgets were destroyed
@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+import bisect
+import tkinter as tk
+from tkinter import ttk
+from ..wizard_step import WizardStep
+
+
+def _is_subsequence(query, key):
+    """Whether all query characters appear in key in the same order"""
+    pos = 0
+    for ch in query:
+        pos = key.find(ch, pos)
+        if pos < 0:
+            return False
+        pos += 1
+    return True
+
+
+class SelectionIndex:
+    """
+    Incremental filter index over a list of option strings.
+    
+    Each filtered result is cached on a stack keyed by query. When the new query
+    extends a cached one (the user typed another character), only the cached
+    result is refined instead of rescanning all options. Deleting characters
+    returns a cached result directly.
+    """
+    
+    MATCH_MODES = ("prefix", "fuzzy")
+    
+    def __init__(self, options, match_mode="fuzzy"):
+        """
+        Args:
+            options: list of option strings
+            match_mode: "prefix" (option starts with query) or
+                        "fuzzy" (query characters appear in option in order)
+        """
+        if match_mode not in self.MATCH_MODES:
+            raise ValueError("Unknown match mode: {}".format(match_mode))
+        
+        self.options = list(options)
+        self.match_mode = match_mode
+        self._keys = [option.lower() for option in self.options]
+        self._all = list(range(len(self.options)))
+        self._stack = []  # [(query, indices), ...] - each query extends the previous one
+        
+        # Sorted keys for initial prefix lookups with bisect
+        if match_mode == "prefix":
+            order = sorted(self._all, key=self._keys.__getitem__)
+            self._sorted_keys = [self._keys[i] for i in order]
+            self._sorted_indices = order
+    
+    def __len__(self):
+        return len(self.options)
+    
+    def _matches(self, query, index):
+        key = self._keys[index]
+        if self.match_mode == "prefix":
+            return key.startswith(query)
+        return _is_subsequence(query, key)
+    
+    def _lookup(self, query):
+        """Find matches for query without a cached base result"""
+        if self.match_mode == "prefix":
+            start = bisect.bisect_left(self._sorted_keys, query)
+            end = bisect.bisect_right(self._sorted_keys, query + "\uffff")
+            return sorted(self._sorted_indices[start:end])
+        return [i for i in self._all if _is_subsequence(query, self._keys[i])]
+    
+    def filter(self, query):
+        """
+        Get indices of options matching query (in original option order).
+        
+        Args:
+            query: search string (case-insensitive)
+        
+        Returns:
+            List of option indices
+        """
+        query = query.lower()
+        if not query:
+            self._stack = []
+            return self._all
+        
+        # Drop cached results that are not a prefix of the new query
+        while self._stack and not query.startswith(self._stack[-1][0]):
+            self._stack.pop()
+        
+        if self._stack:
+            base_query, base = self._stack[-1]
+            if base_query == query:
+                return base
+            result = [i for i in base if self._matches(query, i)]
+        else:
+            result = self._lookup(query)
+        
+        self._stack.append((query, result))
+        return result
+
+
+class SelectionStep(WizardStep):
+    """
+    Step for selecting items from a very large list of options.
+    
+    Only the visible rows are drawn (on a canvas that reuses the same row items
+    while scrolling), selections are kept as a set of option indices, and the
+    search box filters through an incremental SelectionIndex.
+    """
+    
+    prepare_message = "Loading options..."
+    
+    def __init__(self, wizard_app, options, title="Select Items", description="",
+                 multiple=True, match_mode="fuzzy", selected=None, require_selection=False):
+        """
+        Args:
+            wizard_app: WizardApp object
+            options: list of option strings
+            title: step title
+            description: text shown under the title
+            multiple: allow selecting several options (otherwise only one)
+            match_mode: search mode, "prefix" or "fuzzy"
+            selected: options selected initially
+            require_selection: disable Next until something is selected
+        """
+        super().__init__(wizard_app)
+        self.options = options
+        self.title = title
+        self.description = description
+        self.multiple = multiple
+        self.match_mode = match_mode
+        self.require_selection = require_selection
+        self.selected = set()  # Indices of selected options
+        self._initial_selection = list(selected or [])
+        
+        self.index = None
+        self.visible = []  # Indices of options matching current search
+        self._top = 0  # Index in self.visible of first drawn row
+        self._cursor = 0  # Index in self.visible of keyboard cursor
+        self._rows = []  # Reused canvas items: [(background, mark, text), ...]
+        self._row_height = 20
+    
+    def prepare(self):
+        """Build search index (runs in background thread)"""
+        index = SelectionIndex(self.options, self.match_mode)
+        positions = {option: i for i, option in enumerate(index.options)}
+        initial = set(positions[option] for option in self._initial_selection if option in positions)
+        return index, initial
+    
+    def create_content(self, content_frame):
+        if self.index is None:
+            self.index, self.selected = self.prepared_data
+        self.visible = self.index.filter("")
+        self._top = 0
+        self._cursor = 0
+        
+        title = ttk.Label(content_frame, text=self.title, style='Wizard.Title.TLabel')
+        title.pack(pady=(0, 10), anchor=tk.W)
+        
+        if self.description:
+            info = ttk.Label(content_frame, text=self.description,
+                             justify=tk.LEFT, style='Wizard.Body.TLabel')
+            info.pack(anchor=tk.W, pady=(0, 10))
+        
+        # Search box
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(content_frame, textvariable=self.search_var)
+        search_entry.pack(fill=tk.X, pady=(0, 5))
+        self.search_var.trace_add("write", lambda *args: self._on_search_changed())
+        
+        # Virtual list: canvas with a fixed pool of row items + scrollbar
+        list_frame = ttk.Frame(content_frame)
+        list_frame.pack(fill=tk.BOTH, expand=True)
+        
+        font = self.wizard_app.fonts['body']
+        self._row_height = font.metrics('linespace') + 6
+        
+        self.canvas = tk.Canvas(list_frame, height=self._row_height * 12,
+                                bg="white", highlightthickness=1, takefocus=True)
+        self.scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self._rows = []
+        
+        self.canvas.bind("<Configure>", lambda e: self._rebuild_rows())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", lambda e: self._scroll_rows(-1 if e.delta > 0 else 1) or "break")
+        self.canvas.bind("<Button-4>", lambda e: self._scroll_rows(-1))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll_rows(1))
+        self.canvas.bind("<Up>", lambda e: self._move_cursor(-1))
+        self.canvas.bind("<Down>", lambda e: self._move_cursor(1))
+        self.canvas.bind("<Prior>", lambda e: self._move_cursor(-self._page_size()))
+        self.canvas.bind("<Next>", lambda e: self._move_cursor(self._page_size()))
+        self.canvas.bind("<space>", lambda e: self._toggle_visible(self._cursor))
+        search_entry.bind("<Down>", lambda e: self.canvas.focus_set())
+        
+        self.status_label = ttk.Label(content_frame, style='Wizard.Hint.TLabel')
+        self.status_label.pack(anchor=tk.W, pady=(5, 0))
+        
+        self._rebuild_rows()
+    
+    def create_process(self):
+        return None
+    
+    def can_proceed(self):
+        if self.require_selection and not self.selected:
+            return False
+        return super().can_proceed()
+    
+    def get_selected(self):
+        """Get selected options (in original option order)"""
+        if self.index is None:
+            return list(self._initial_selection)
+        return [self.index.options[i] for i in sorted(self.selected)]
+    
+    def get_answers(self):
+        return {'selected': self.get_selected()}
+    
+    def apply_answers(self, answers):
+        if 'selected' in answers:
+            self._initial_selection = list(answers['selected'])
+            if self.index is not None:
+                wanted = set(self._initial_selection)
+                self.selected = set(i for i, option in enumerate(self.index.options) if option in wanted)
+    
+    def _page_size(self):
+        return max(1, len(self._rows) - 1)
+    
+    def _rebuild_rows(self):
+        """Create row item pool matching canvas height"""
+        height = max(self.canvas.winfo_height(), int(self.canvas.cget('height')))
+        count = height // self._row_height + 1
+        if count != len(self._rows):
+            self.canvas.delete("all")
+            font = self.wizard_app.fonts['body']
+            self._rows = []
+            for slot in range(count):
+                y = slot * self._row_height
+                background = self.canvas.create_rectangle(0, y, 10000, y + self._row_height,
+                                                          outline="", fill="")
+                mark = self.canvas.create_text(8, y + self._row_height // 2, anchor=tk.W, font=font)
+                text = self.canvas.create_text(30, y + self._row_height // 2, anchor=tk.W, font=font)
+                self._rows.append((background, mark, text))
+        self._redraw()
+    
+    def _redraw(self):
+        """Update pooled row items to show options starting at self._top"""
+        max_top = max(0, len(self.visible) - self._page_size())
+        self._top = max(0, min(self._top, max_top))
+        
+        if self.multiple:
+            marks = ("☐", "☑")
+        else:
+            marks = ("○", "◉")
+        highlight = self.wizard_app.highlight_bg
+        
+        for slot, (background, mark, text) in enumerate(self._rows):
+            position = self._top + slot
+            if position < len(self.visible):
+                option_index = self.visible[position]
+                is_selected = option_index in self.selected
+                self.canvas.itemconfigure(mark, text=marks[is_selected])
+                self.canvas.itemconfigure(text, text=self.index.options[option_index])
+                self.canvas.itemconfigure(background, fill=highlight if position == self._cursor else "")
+            else:
+                self.canvas.itemconfigure(mark, text="")
+                self.canvas.itemconfigure(text, text="")
+                self.canvas.itemconfigure(background, fill="")
+        
+        # Scrollbar shows visible window over filtered options
+        total = len(self.visible)
+        if total:
+            first = self._top / total
+            last = min(1.0, (self._top + len(self._rows)) / total)
+        else:
+            first, last = 0.0, 1.0
+        self.scrollbar.set(first, last)
+        
+        self.status_label.config(text="Shown: {} of {}    Selected: {}".format(
+            total, len(self.index), len(self.selected)))
+    
+    def _on_search_changed(self):
+        self.visible = self.index.filter(self.search_var.get())
+        self._top = 0
+        self._cursor = 0
+        self._redraw()
+    
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self._top = int(float(args[1]) * len(self.visible))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self._page_size()
+            self._top += step
+        self._redraw()
+    
+    def _scroll_rows(self, count):
+        self._top += count
+        self._redraw()
+    
+    def _move_cursor(self, count):
+        if not self.visible:
+            return "break"
+        self._cursor = max(0, min(len(self.visible) - 1, self._cursor + count))
+        # Keep cursor inside drawn window
+        if self._cursor < self._top:
+            self._top = self._cursor
+        elif self._cursor >= self._top + self._page_size():
+            self._top = self._cursor - self._page_size() + 1
+        self._redraw()
+        return "break"
+    
+    def _on_click(self, event):
+        self.canvas.focus_set()
+        position = self._top + int(event.y // self._row_height)
+        if position < len(self.visible):
+            self._cursor = position
+            self._toggle_visible(position)
+    
+    def _toggle_visible(self, position):
+        """Toggle selection of option shown at position in filtered list"""
+        if position >= len(self.visible):
+            return "break"
+        
+        option_index = self.visible[position]
+        if option_index in self.selected:
+            self.selected.discard(option_index)
+        elif self.multiple:
+            self.selected.add(option_index)
+        else:
+            self.selected = {option_index}
+        
+        self._redraw()
+        if self.require_selection:
+            self.wizard_app.update_navigation()
+        return "break"
@@ -9,7 +9,7 @@ class WelcomeStep(WizardStep):
     
     def create_content(self, content_frame):
         title = ttk.Label(content_frame, text="Welcome!", 
-                         font=("Arial", 16, "bold"))
+                         style='Wizard.Title.TLabel')
         title.pack(pady=(0, 20))
         
         wizard_name = self.wizard_app.config.wizard_name if self.wizard_app.config else "Wizard"
@@ -20,10 +20,10 @@ class WelcomeStep(WizardStep):
         
         message = ttk.Label(content_frame, 
                            text=message_text,
-                           justify=tk.LEFT, font=("Arial", 10))
+                           justify=tk.LEFT, style='Wizard.Body.TLabel')
         message.pack(pady=10)
         
-        icon_label = ttk.Label(content_frame, text="☺", font=("Arial", 48))
+        icon_label = ttk.Label(content_frame, text="☺", style='Wizard.Icon.TLabel')
         icon_label.pack(pady=30)
     
     def create_process(self):
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Lightweight timing instrumentation.
+
+Spans are kept in a bounded in-memory ring buffer and can be exported as
+Chrome Trace Event JSON (open in chrome://tracing or https://ui.perfetto.dev).
+"""
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+_clock = time.perf_counter_ns
+
+
+class _NullSpan:
+    """Span used when recording is disabled"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Context manager recording one span"""
+    
+    __slots__ = ('recorder', 'name', 'category', 'args', 'start')
+    
+    def __init__(self, recorder, name, category, args):
+        self.recorder = recorder
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0
+    
+    def __enter__(self):
+        self.start = _clock()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.recorder.record(self.name, self.category, self.start, _clock(), args=self.args)
+        return False
+
+
+class TraceRecorder:
+    """
+    In-memory span recorder.
+    
+    Recording a span costs two clock reads and one deque append; the buffer
+    keeps only the last `capacity` spans, so it can stay enabled in production.
+    """
+    
+    def __init__(self, capacity=100000, enabled=True):
+        """
+        Args:
+            capacity: maximum number of spans kept (oldest are dropped)
+            enabled: whether spans are recorded
+        """
+        self.enabled = enabled
+        self._events = collections.deque(maxlen=capacity)
+        self._thread_names = {}
+        self._origin = _clock()
+    
+    def now(self):
+        """Current clock value for begin/end pairs recorded with record()"""
+        return _clock()
+    
+    def span(self, name, category="wizard", **args):
+        """
+        Context manager measuring the enclosed block.
+        
+        Example:
+            with recorder.span("load_catalogue", step="Packages"):
+                ...
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args or None)
+    
+    def record(self, name, category, start, end, thread_id=None, args=None):
+        """
+        Record a finished span.
+        
+        Args:
+            name: span name
+            category: span category (e.g. "ui", "process")
+            start: start time from now()
+            end: end time from now()
+            thread_id: thread the span belongs to (current thread by default)
+            args: dict with extra data shown in trace viewer
+        """
+        if not self.enabled:
+            return
+        if thread_id is None:
+            thread_id = threading.get_ident()
+            if thread_id not in self._thread_names:
+                self._thread_names[thread_id] = threading.current_thread().name
+        self._events.append((name, category, start, end, thread_id, args))
+    
+    def name_thread(self, thread_id, name):
+        """Set thread name shown in trace viewer"""
+        self._thread_names[thread_id] = name
+    
+    def clear(self):
+        """Remove all recorded spans"""
+        self._events.clear()
+    
+    def spans(self):
+        """
+        Get recorded spans.
+        
+        Returns:
+            List of (name, category, start_ns, end_ns, thread_id, args) tuples
+        """
+        return list(self._events)
+    
+    def to_chrome_trace(self):
+        """Build Chrome Trace Event Format dict"""
+        pid = os.getpid()
+        events = []
+        for thread_id, thread_name in list(self._thread_names.items()):
+            events.append({
+                'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': thread_id,
+                'args': {'name': thread_name},
+            })
+        for name, category, start, end, thread_id, args in list(self._events):
+            event = {
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': (start - self._origin) / 1000.0,
+                'dur': (end - start) / 1000.0,
+                'pid': pid,
+                'tid': thread_id,
+            }
+            if args:
+                event['args'] = args
+            events.append(event)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+    
+    def dump_chrome_trace(self, path):
+        """Write recorded spans to a Chrome Trace Event JSON file"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+# Default recorder used by wizard instrumentation
+_recorder = TraceRecorder()
+
+
+def get_recorder():
+    """Get recorder used by wizard instrumentation"""
+    return _recorder
+
+
+def set_recorder(recorder):
+    """Replace recorder used by wizard instrumentation"""
+    global _recorder
+    _recorder = recorder
+
+
+def traced(name=None, category="wizard"):
+    """
+    Decorator recording each call of the function as a span.
+    
+    Args:
+        name: span name (function qualified name by default)
+        category: span category
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _recorder
+            if not recorder.enabled:
+                return func(*args, **kwargs)
+            start = _clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.record(span_name, category, start, _clock())
+        return wrapper
+    return decorator
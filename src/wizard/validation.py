@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Debounced background validation of step inputs.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Worker threads shared by the validators of all steps
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="Validate")
+        return _executor
+
+
+class ValidationError(Exception):
+    """Raised by a validator function: the message is shown to the user"""
+    pass
+
+
+class _Validator:
+    """One validated input (see FormValidation.add)"""
+    
+    def __init__(self, name, function, variables, delay_ms, message_var):
+        self.name = name
+        self.function = function
+        self.variables = variables
+        self.delay_ms = delay_ms
+        self.message_var = message_var
+        self.traces = []  # (variable, trace id) of watched variables
+        self.generation = 0  # Incremented when input changes; older results are discarded
+        self.after_id = None  # Pending debounced run
+        self.running = False  # A worker thread is validating
+        self.values = None  # Input values of the current result
+        self.message = None  # Error message of the current result (None - valid)
+        self.done = False  # Current input has a result
+
+
+class FormValidation:
+    """
+    Validators of a step's inputs, run in a shared pool of worker threads.
+    
+    When a watched Tk variable changes, the validator runs after delay_ms
+    without further changes (debounce), so typing is not slowed down by
+    checks that touch the disk or a local service. Only one run per
+    validator is in progress; a result for superseded input is discarded
+    and the validator runs again with the latest values.
+    """
+    
+    def __init__(self, root, on_change=None):
+        """
+        Args:
+            root: Tk root (or HeadlessRoot) for after() and result delivery
+            on_change: called in the main thread when is_valid() changes
+        """
+        self.root = root
+        self.on_change = on_change
+        self._validators = {}
+        self._valid = None
+    
+    def add(self, name, function, variables, delay_ms=300, message_var=None):
+        """
+        Validate input.
+        
+        Args:
+            name: validator name (key of errors())
+            function: function(*values) called in a worker thread with the
+                      values of variables; returns None if valid or an error
+                      message, or raises ValidationError
+            variables: Tk variable or list of Tk variables to watch
+            delay_ms: debounce delay after the last change
+            message_var: Tk StringVar receiving the error message ("" if valid)
+        
+        A validator added again under the same name (e.g. when the step's
+        content is created again) replaces the previous one.
+        """
+        if not isinstance(variables, (list, tuple)):
+            variables = [variables]
+        self.remove(name)
+        validator = _Validator(name, function, list(variables), delay_ms, message_var)
+        self._validators[name] = validator
+        self._watch(validator)
+        self._notify()
+    
+    def remove(self, name):
+        """Remove validator and stop watching its variables"""
+        validator = self._validators.pop(name, None)
+        if validator is not None:
+            self._unwatch(validator)
+    
+    def watch(self):
+        """Watch variables of validators again after unwatch() (step is shown again)"""
+        for validator in self._validators.values():
+            if not validator.traces:
+                self._watch(validator)
+    
+    def unwatch(self):
+        """Stop watching variables of all validators (step content was removed); results are kept"""
+        for validator in self._validators.values():
+            self._unwatch(validator)
+    
+    def _watch(self, validator):
+        name = validator.name
+        for variable in validator.variables:
+            trace_id = variable.trace_add("write", lambda *args: self.schedule(name))
+            validator.traces.append((variable, trace_id))
+    
+    def _unwatch(self, validator):
+        if validator.after_id is not None:
+            self.root.after_cancel(validator.after_id)
+            validator.after_id = None
+        for variable, trace_id in validator.traces:
+            try:
+                variable.trace_remove("write", trace_id)
+            except:
+                pass  # Variable was destroyed
+        validator.traces = []
+    
+    def schedule(self, name):
+        """Input changed: validate after debounce delay"""
+        validator = self._validators.get(name)
+        if validator is None:
+            return  # Removed while the change was being written
+        validator.generation += 1
+        validator.done = False
+        if validator.after_id is not None:
+            self.root.after_cancel(validator.after_id)
+        validator.after_id = self.root.after(validator.delay_ms, lambda: self._start(validator))
+        self._notify()
+    
+    def validate(self):
+        """Start validators without result for current input now (e.g. when step is shown)"""
+        for validator in self._validators.values():
+            if validator.done and validator.values == self._values(validator):
+                continue
+            if validator.after_id is not None:
+                self.root.after_cancel(validator.after_id)
+            self._start(validator)
+    
+    def validate_sync(self):
+        """
+        Run all validators in the calling thread (headless mode).
+        
+        Returns:
+            dict name -> error message of failed validators
+        """
+        for validator in self._validators.values():
+            values = self._values(validator)
+            self._finish(validator, values, self._call(validator, values))
+        return self.errors()
+    
+    def _values(self, validator):
+        return [variable.get() for variable in validator.variables]
+    
+    def _start(self, validator):
+        """Run validator in a worker thread (main thread)"""
+        validator.after_id = None
+        if validator.running:
+            return  # Runs again when the current run completes
+        validator.running = True
+        generation = validator.generation
+        values = self._values(validator)
+        _shared_executor().submit(self._worker, validator, generation, values)
+    
+    def _call(self, validator, values):
+        try:
+            return validator.function(*values)
+        except ValidationError as e:
+            return str(e)
+        except Exception as e:
+            logger.exception("Validator %s failed", validator.name)
+            return str(e) or e.__class__.__name__
+    
+    def _worker(self, validator, generation, values):
+        message = self._call(validator, values)
+        self.root.after(0, lambda: self._on_complete(validator, generation, values, message))
+    
+    def _on_complete(self, validator, generation, values, message):
+        """Result of worker thread (main thread)"""
+        validator.running = False
+        if self._validators.get(validator.name) is not validator:
+            return  # Removed or replaced meanwhile
+        if generation != validator.generation:
+            # Input changed meanwhile; run again unless a debounced run is pending
+            if validator.after_id is None:
+                self._start(validator)
+            return
+        self._finish(validator, values, message)
+    
+    def _finish(self, validator, values, message):
+        validator.values = values
+        validator.message = message or None
+        validator.done = True
+        if validator.message_var is not None:
+            try:
+                validator.message_var.set(validator.message or "")
+            except:
+                pass  # Variable was destroyed
+        self._notify()
+    
+    def _notify(self):
+        valid = self.is_valid()
+        if valid != self._valid:
+            self._valid = valid
+            if self.on_change:
+                self.on_change()
+    
+    def is_valid(self):
+        """Whether all validators have a result for current input and none failed"""
+        return all(validator.done and validator.message is None
+                   for validator in self._validators.values())
+    
+    def is_pending(self):
+        """Whether any validator is waiting or running"""
+        return any(not validator.done for validator in self._validators.values())
+    
+    def errors(self):
+        """Get dict name -> error message of failed validators"""
+        return {validator.name: validator.message for validator in self._validators.values()
+                if validator.done and validator.message is not None}
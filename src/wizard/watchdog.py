@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Watchdog failing step processes that stopped sending heartbeats.
+"""
+import logging
+import sys
+import threading
+import time
+import traceback
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessWatchdog:
+    """
+    One shared thread checking heartbeats of all processes in a ProcessRegistry.
+    
+    Processes send heartbeats through log(), update_progress() and heartbeat().
+    A process silent for longer than its stall_timeout (or the watchdog default)
+    is failed: it is stopped like a cancel, its step becomes FAILED through the
+    normal state callback, and process.diagnostics describes the stall
+    (silent time and the worker thread stack). Processes cancelled when their
+    step was shown again are reported if their threads don't exit
+    (ProcessRegistry.reap).
+    """
+    
+    def __init__(self, registry, stall_timeout=None, interval=1.0):
+        """
+        Args:
+            registry: ProcessRegistry with processes to watch
+            stall_timeout: default seconds without heartbeat (None - only
+                           processes with own stall_timeout are watched)
+            interval: seconds between checks
+        """
+        self.registry = registry
+        self.stall_timeout = stall_timeout
+        self.interval = interval
+        self.stalls = []  # Diagnostics of failed processes
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """Start watchdog thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="ProcessWatchdog")
+        self._thread.start()
+    
+    def stop(self):
+        """Stop watchdog thread"""
+        self._stop.set()
+    
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+    
+    def timeout_for(self, process):
+        """Stall timeout of process in seconds (None - not watched)"""
+        if process.stall_timeout is not None:
+            return process.stall_timeout
+        return self.stall_timeout
+    
+    def check(self):
+        """
+        Check all live processes once (and report cancelled ones that don't stop).
+        
+        Returns:
+            List of processes failed by this check
+        """
+        self.registry.reap()
+        now = time.monotonic()
+        failed = []
+        for process in self.registry.live():
+            timeout = self.timeout_for(process)
+            if not timeout or process.last_heartbeat is None:
+                continue
+            if process.is_cancelled() or process.result is not None or process.state_callback is None:
+                continue  # Stopping, already completed or detached
+            if process.is_paused():
+                continue
+            silent = now - process.last_heartbeat
+            if silent < timeout:
+                continue
+            
+            diagnostics = self._diagnose(process, silent, timeout)
+            if process.fail("stalled", diagnostics):
+                self.stalls.append(diagnostics)
+                failed.append(process)
+                logger.warning("%s\nWorker thread stack:\n%s", diagnostics['reason'], diagnostics['stack'])
+        return failed
+    
+    def _diagnose(self, process, silent, timeout):
+        """Describe stalled process"""
+        thread = process._thread
+        frame = sys._current_frames().get(thread.ident) if thread else None
+        step = process.owner.get_display_name() if process.owner else None
+        return {
+            'reason': "Process {} of step {} sent no heartbeat for {:.1f} s (stall timeout {:.1f} s)".format(
+                process.__class__.__name__, step, silent, timeout),
+            'step': step,
+            'process': process.__class__.__name__,
+            'thread': thread.name if thread else None,
+            'silent_seconds': silent,
+            'stall_timeout': timeout,
+            'stack': "".join(traceback.format_stack(frame)) if frame else "",
+            'time': time.time(),
+        }
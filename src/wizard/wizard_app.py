@@ -1,12 +1,22 @@
 # -*- coding: utf-8 -*-
-import re
+import json
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
+from tkinter import font as tkfont
 import sys
 import platform
-from .enums import StepStatus
+from .enums import StepStatus, StepRole
 from .wizard_config import WizardConfig
+from .tracing import get_recorder, traced
+from .loop_monitor import EventLoopMonitor
+from .metrics import WIZARD_METRICS, TextfileExporter, get_registry
+from .process_registry import ProcessRegistry
+from .watchdog import ProcessWatchdog
+from .shutdown import ShutdownCoordinator
+from .scheduler import StepScheduler
+from .state import StateStore
+from .step_graph import StepGraph, check_stream_consumers
 
 # Try to import ttkthemes for additional themes
 try:
@@ -23,6 +33,31 @@ class WizardApp:
     Built from WizardStep objects.
     """
     
+    # Named fonts shared by the sidebar and steps: name -> (family, size, weight)
+    FONT_SPECS = {
+        'title': ("Arial", 16, "bold"),
+        'body': ("Arial", 10, "normal"),
+        'body_bold': ("Arial", 10, "bold"),
+        'small': ("Arial", 9, "normal"),
+        'icon': ("Arial", 48, "normal"),
+        'sidebar_title': ("Arial", 12, "bold"),
+        'sidebar_icon': ("Arial", 12, "normal"),
+        'sidebar_item': ("Arial", 9, "normal"),
+        'mono': ("Consolas", 9, "normal"),
+    }
+    
+    # Named ttk styles: style name -> (font name, foreground or None)
+    STYLE_SPECS = {
+        'Wizard.Title.TLabel': ('title', None),
+        'Wizard.Body.TLabel': ('body', None),
+        'Wizard.Hint.TLabel': ('small', "gray"),
+        'Wizard.Icon.TLabel': ('icon', None),
+        'Wizard.SuccessTitle.TLabel': ('title', "green"),
+        'Wizard.SuccessIcon.TLabel': ('icon', "green"),
+        'Wizard.FailTitle.TLabel': ('title', "red"),
+        'Wizard.FailIcon.TLabel': ('icon', "red"),
+    }
+    
     def __init__(self, root, steps=None, config=None):
         """
         Args:
@@ -33,9 +68,31 @@ class WizardApp:
         self.root = root
         self.config = config or WizardConfig()
         
+        # Timing spans of navigation, rendering and processes
+        self.tracer = get_recorder()
+        # Event loop latency monitor (see enable_loop_monitor)
+        self.loop_monitor = None
+        # Metrics registry and its file exporter (see enable_metrics_export)
+        self.metrics = get_registry()
+        self.metrics_exporter = None
+        # Values shared by steps; data derived from changed keys is dropped
+        self.state = StateStore(root)
+        self.state.subscribe(None, self._on_state_changed)
+        # Live step processes and their owners
+        self.processes = ProcessRegistry()
+        # Fails processes without heartbeat (set watchdog.stall_timeout for a default)
+        self.watchdog = ProcessWatchdog(self.processes)
+        self.watchdog.start()
+        # Cancels processes, flushes logs and runs cleanup hooks on exit
+        self.shutdown_coordinator = ShutdownCoordinator(self.processes)
+        self.root.protocol("WM_DELETE_WINDOW", self._on_window_close)
+        
         # Initialize DPI scaling for window sizes only
         self._init_dpi_scaling()
         
+        # Shared named fonts (one Tk font per role instead of one per widget)
+        self._init_fonts()
+        
         # Set window title from config
         title = self.config.wizard_name
         if self.config.short_description:
@@ -125,6 +182,16 @@ class WizardApp:
         
         self.steps = []
         self.current_step_index = 0
+        # Role and index lookups, skip rules (rebuilt by set_steps)
+        self.graph = StepGraph(self.steps, state=self.state)
+        self.failed_step = None  # Step whose failure led to the end fail step
+        
+        # How many upcoming steps may run prepare() ahead of time
+        self.prefetch_depth = 1
+        
+        # Runs independent non-interactive steps concurrently (see WizardStep.depends_on)
+        self.scheduler = StepScheduler(self)
+        self._shown_step = None  # Step whose content is displayed
         
         # Get system colors from theme
         self._init_system_colors()
@@ -145,7 +212,7 @@ class WizardApp:
         
         # Sidebar title
         sidebar_title = tk.Label(self.sidebar_frame, text="Steps", 
-                                font=("Arial", 12, "bold"), bg=sidebar_bg, pady=10)
+                                font=self.fonts['sidebar_title'], bg=sidebar_bg, pady=10)
         sidebar_title.pack()
         
         # Container for step items
@@ -179,10 +246,16 @@ class WizardApp:
                                      command=self.cancel_process)
         self.cancel_btn.pack(side=tk.RIGHT, padx=(0, 10))
         
+        # Shown by update_navigation while a pausable process runs
+        self.pause_btn = ttk.Button(self.nav_frame, text="Pause", command=self.toggle_pause)
+        
         # Apply system theme (styles will be from the theme)
         if selected_theme:
             self.style.theme_use(selected_theme)
         
+        # Named styles are stored per theme, so configure them after theme_use
+        self._init_styles()
+        
         # Set steps if provided
         if steps:
             self.set_steps(steps)
@@ -203,19 +276,19 @@ class WizardApp:
             
             class DefaultWelcomeStep(WizardStep):
                 def create_content(self, content_frame):
-                    ttk.Label(content_frame, text="Welcome", font=("Arial", 16, "bold")).pack()
+                    ttk.Label(content_frame, text="Welcome", style='Wizard.Title.TLabel').pack()
                 def create_process(self):
                     return None
             
             class DefaultEndFailStep(WizardStep):
                 def create_content(self, content_frame):
-                    ttk.Label(content_frame, text="Error", font=("Arial", 16, "bold"), foreground="red").pack()
+                    ttk.Label(content_frame, text="Error", style='Wizard.FailTitle.TLabel').pack()
                 def create_process(self):
                     return None
             
             class DefaultEndSuccessStep(WizardStep):
                 def create_content(self, content_frame):
-                    ttk.Label(content_frame, text="Success", font=("Arial", 16, "bold"), foreground="green").pack()
+                    ttk.Label(content_frame, text="Success", style='Wizard.SuccessTitle.TLabel').pack()
                 def create_process(self):
                     return None
             
@@ -275,17 +348,102 @@ class WizardApp:
         """
         return int(value * self.scale_factor)
     
+    def _init_fonts(self):
+        """Create named fonts shared by all wizard widgets"""
+        self.fonts = {}
+        self.font_scale = 1.0
+        for name, (family, size, weight) in self.FONT_SPECS.items():
+            self.fonts[name] = tkfont.Font(root=self.root, family=family,
+                                           size=size, weight=weight)
+    
+    def _init_styles(self):
+        """Configure named ttk styles (ttk keeps styles per theme)"""
+        for style_name, (font_name, foreground) in self.STYLE_SPECS.items():
+            options = {'font': self.fonts[font_name]}
+            if foreground:
+                options['foreground'] = foreground
+            self.style.configure(style_name, **options)
+    
+    def get_font(self, name):
+        """Get shared named font by role name (e.g. 'title', 'body')"""
+        return self.fonts[name]
+    
+    def configure_font(self, name, **options):
+        """Change a shared font; every widget using it is updated by Tk
+        
+        Args:
+            name: font role name from FONT_SPECS
+            **options: tkinter.font.Font options (family, size, weight, ...)
+        """
+        self.fonts[name].configure(**options)
+    
+    def set_font_scale(self, factor):
+        """Scale all shared fonts relative to their base sizes
+        
+        Args:
+            factor: scale factor (1.0 = sizes from FONT_SPECS)
+        """
+        self.font_scale = factor
+        for name, (family, size, weight) in self.FONT_SPECS.items():
+            self.fonts[name].configure(size=max(1, int(round(size * factor))))
+    
+    def set_theme(self, theme_name):
+        """Switch ttk theme and re-apply named wizard styles"""
+        self.style.theme_use(theme_name)
+        self._init_styles()
+    
     def set_welcome_step(self, step):
         """Set custom welcome step"""
         self._welcome_step = step
+        self._compile_graph()
     
     def set_end_failed_step(self, step):
         """Set custom end failed step"""
         self._end_fail_step = step
+        self._compile_graph()
     
     def set_end_success_step(self, step):
         """Set custom end success step"""
         self._end_success_step = step
+        self._compile_graph()
+    
+    def _compile_graph(self):
+        """
+        Build step graph for current steps (end steps found once, by identity or class).
+        
+        Raises:
+            ValueError: stream consumer is interactive or follows an interactive step
+        """
+        check_stream_consumers(self.steps)
+        roles = {
+            StepRole.WELCOME: self._welcome_step,
+            StepRole.SUCCESS: self._end_success_step,
+            StepRole.FAIL: self._end_fail_step,
+        }
+        try:
+            from .steps.end_with_fail_step import EndWithFailStep
+            from .steps.end_success_step import EndSuccessStep
+            end_classes = {StepRole.FAIL: EndWithFailStep, StepRole.SUCCESS: EndSuccessStep}
+        except ImportError:
+            end_classes = {}
+        for role, default_step in list(roles.items()):
+            if default_step is not None and default_step in self.steps:
+                continue
+            # End step of the library's class given in the step list replaces the default
+            cls = end_classes.get(role)
+            listed = next((s for s in self.steps if cls is not None and isinstance(s, cls)), None)
+            if listed is not None:
+                roles[role] = listed
+        self.graph = StepGraph(self.steps, roles=roles, state=self.state)
+    
+    def _show_end_fail_step(self):
+        """Go to end fail step (added to steps on first use); False if there is none"""
+        step = self.graph.step_for(StepRole.FAIL)
+        if step is None:
+            return False
+        self.current_step_index = self.graph.append(step)
+        self.show_current_step()
+        return True
     
     def set_steps(self, steps):
         """Set wizard steps (automatically adds welcome and end_success steps)"""
@@ -314,6 +472,7 @@ class WizardApp:
         
         self.steps = final_steps
         self.current_step_index = 0
+        self._compile_graph()
         if self.steps:
             self.update_sidebar()
             self.show_current_step()
@@ -335,6 +494,7 @@ class WizardApp:
         # Set window position
         self.root.geometry(f"{width}x{height}+{x}+{y}")
     
+    @traced("WizardApp._calculate_optimal_size", "ui")
     def _calculate_optimal_size(self):
         """Calculate optimal window size based on current content"""
         # Update to get real widget sizes
@@ -452,16 +612,44 @@ class WizardApp:
         for widget in self.content_frame.winfo_children():
             widget.destroy()
     
+    @traced("WizardApp.show_current_step", "ui")
     def show_current_step(self):
         """Show current step"""
+        started = self.tracer.now()
+        
+        # Step left while its process runs (background step) keeps its output
+        shown_step = self._shown_step
+        if (shown_step is not None and shown_step.status == StepStatus.RUNNING
+                and not (0 <= self.current_step_index < len(self.steps)
+                         and self.steps[self.current_step_index] is shown_step)):
+            shown_step.detach_content()
+        if shown_step is not None:
+            shown_step.leave()
+        self._shown_step = None
         self.clear_content()
         
+        step = None
         if 0 <= self.current_step_index < len(self.steps):
             step = self.steps[self.current_step_index]
-            step.render(self.content_frame)
+            WIZARD_METRICS['step_shows'].inc(step=step.__class__.__name__)
+            if not step.is_prepared():
+                # Data is still loading - show placeholder, render when ready
+                step.start_prepare()
+                self._show_prepare_placeholder(step)
+            elif step.prepare_error is not None:
+                # prepare() failed - complete step with error
+                step.status = StepStatus.FAILED
+                self.on_step_status_changed(step)
+                return
+            else:
+                step.render(self.content_frame)
+                self._shown_step = step
+            self.scheduler.schedule()
         
         self.update_sidebar()
         self.update_navigation()
+        self._prefetch_upcoming_steps()
+        self._speculate_next_step()
         
         # On Linux/Ubuntu, ensure window geometry is properly applied after content is rendered
         # Calculate optimal size based on content to ensure everything fits
@@ -522,6 +710,65 @@ class WizardApp:
         # Ensure resizable is enabled for maximization
         self.root.resizable(True, True)
         self.root.update_idletasks()  # Final update to ensure changes are applied
+        
+        if step is not None:
+            WIZARD_METRICS['show_step_seconds'].observe((self.tracer.now() - started) / 1e9,
+                                                        step=step.__class__.__name__)
+    
+    def _show_prepare_placeholder(self, step):
+        """Show lightweight placeholder while step data is loading"""
+        placeholder = ttk.Frame(self.content_frame)
+        placeholder.pack(expand=True)
+        
+        ttk.Label(placeholder, text=step.prepare_message,
+                  style='Wizard.Body.TLabel').pack(pady=(0, 10))
+        
+        progress = ttk.Progressbar(placeholder, mode='indeterminate', length=200)
+        progress.pack()
+        progress.start(15)
+    
+    def _prefetch_upcoming_steps(self):
+        """Start prepare() for the next steps while user is on current one"""
+        for i in self.graph.following(self.current_step_index, self.prefetch_depth):
+            step = self.steps[i]
+            if step.prefetch:
+                step.start_prepare()
+    
+    def on_step_retry(self, step):
+        """Called when failed step process starts another attempt"""
+        self.update_sidebar()
+    
+    def _speculate_next_step(self):
+        """Start side-effect-free process of the next step once current step can proceed"""
+        next_index = self.graph.next_index(self.current_step_index)
+        if not (0 <= self.current_step_index < len(self.steps)) or next_index is None:
+            return
+        current_step = self.steps[self.current_step_index]
+        next_step = self.steps[next_index]
+        if next_step.side_effect_free and current_step.can_proceed() and not current_step.is_failed():
+            next_step.start_speculation()
+    
+    def _on_state_changed(self, changes):
+        """Drop data of steps not shown that read changed state keys, load it again"""
+        if not self.steps:
+            return
+        for index, step in enumerate(self.steps):
+            if index != self.current_step_index:
+                step.on_state_changed(changes)
+        self._prefetch_upcoming_steps()
+        self._speculate_next_step()
+        self.update_navigation()
+        if self.graph.has_conditions:
+            self.update_sidebar()  # Skipped steps may have changed
+    
+    def on_step_prepared(self, step):
+        """Called when step prepare() completes"""
+        # Prefetched steps are rendered when user gets to them
+        if 0 <= self.current_step_index < len(self.steps) and self.steps[self.current_step_index] is step:
+            self.show_current_step()
+        else:
+            self.scheduler.schedule()
+            self._speculate_next_step()
     
     def update_navigation(self):
         """Update navigation button states"""
@@ -529,38 +776,22 @@ class WizardApp:
         if 0 <= self.current_step_index < len(self.steps):
             current_step = self.steps[self.current_step_index]
         
-        # Get completion step classes for checking
-        try:
-            from .steps.end_with_fail_step import EndWithFailStep
-            from .steps.end_success_step import EndSuccessStep
-        except ImportError:
-            EndWithFailStep = None
-            EndSuccessStep = None
-        
         # Check if current step is end step
-        is_end_fail = False
-        is_end_success = False
-        
-        if EndWithFailStep and current_step and isinstance(current_step, EndWithFailStep):
-            is_end_fail = True
-        elif current_step and current_step.__class__.__name__ == 'EndWithFailStep':
-            is_end_fail = True
-        
-        if EndSuccessStep and current_step and isinstance(current_step, EndSuccessStep):
-            is_end_success = True
-        elif current_step and current_step.__class__.__name__ == 'EndSuccessStep':
-            is_end_success = True
+        role = self.graph.role_of(current_step)
+        is_end_fail = role == StepRole.FAIL
+        is_end_success = role == StepRole.SUCCESS
         
         # Handle end fail step - show only Finish button
         if is_end_fail:
             self.back_btn.pack_forget()
             self.cancel_btn.pack_forget()
+            self.pause_btn.pack_forget()
             # Make sure Next button is visible and configured as Finish
             try:
                 self.next_btn.pack(side=tk.RIGHT)
             except:
                 pass
-            self.next_btn.config(text="Finish", command=self.root.quit)
+            self.next_btn.config(text="Finish", command=self.shutdown)
             self.next_btn.config(state="normal")
             return
         
@@ -568,12 +799,13 @@ class WizardApp:
         if is_end_success:
             self.back_btn.pack_forget()
             self.cancel_btn.pack_forget()
+            self.pause_btn.pack_forget()
             # Make sure Next button is visible and configured as Finish
             try:
                 self.next_btn.pack(side=tk.RIGHT)
             except:
                 pass
-            self.next_btn.config(text="Finish", command=self.root.quit)
+            self.next_btn.config(text="Finish", command=self.shutdown)
             self.next_btn.config(state="normal")
             return
         
@@ -587,8 +819,17 @@ class WizardApp:
         except:
             pass
         
+        # "Pause" button - only while current step's process can be paused
+        process = current_step.process if current_step else None
+        if (process and process.pausable and current_step.status == StepStatus.RUNNING
+                and process.is_alive()):
+            self.pause_btn.config(text="Resume" if process.is_paused() else "Pause")
+            self.pause_btn.pack(side=tk.RIGHT, padx=(0, 10), after=self.cancel_btn)
+        else:
+            self.pause_btn.pack_forget()
+        
         # "Back" button - hide on first step, disable if process is running
-        if self.current_step_index == 0:
+        if self.graph.prev_index(self.current_step_index) is None:
             # Hide "Back" button on first step
             self.back_btn.pack_forget()
         else:
@@ -598,21 +839,22 @@ class WizardApp:
             except:
                 pass
             
-            if current_step and current_step.status == StepStatus.RUNNING:
+            if current_step and current_step.status == StepStatus.RUNNING and not current_step.background:
                 # Disable "Back" during process execution
                 self.back_btn.config(state="disabled")
             else:
                 self.back_btn.config(state="normal")
         
         # "Next" button
-        if self.current_step_index >= len(self.steps) - 1:
-            self.next_btn.config(text="Finish", command=self.root.quit)
+        next_index = self.graph.next_index(self.current_step_index)
+        if next_index is None:
+            self.next_btn.config(text="Finish", command=self.shutdown)
             self.next_btn.config(state="normal")
         else:
             current_step = self.steps[self.current_step_index]
             
             # Check if process can proceed to next step
-            if current_step.can_proceed():
+            if current_step.can_proceed() and not self._waits_for_background(next_index):
                 self.next_btn.config(text="Next >", command=self.next_step)
                 self.next_btn.config(state="normal")
             else:
@@ -622,42 +864,74 @@ class WizardApp:
     
     def on_step_status_changed(self, step):
         """Called when step status changes"""
-        # Check if step completed with error, show error
-        if step.is_failed():
-            # Use end_fail_step
-            if self._end_fail_step:
-                # Check if end_fail_step is already in steps
-                has_end_fail = False
-                try:
-                    from .steps.end_with_fail_step import EndWithFailStep
-                    has_end_fail = any(isinstance(s, EndWithFailStep) for s in self.steps)
-                except ImportError:
-                    has_end_fail = any(s.__class__.__name__ == 'EndWithFailStep' for s in self.steps)
-                
-                if not has_end_fail:
-                    self.steps.append(self._end_fail_step)
-                
-                # Go to end fail step
-                for i, s in enumerate(self.steps):
-                    if s is self._end_fail_step:
-                        self.current_step_index = i
-                        self.show_current_step()
-                        return
-                    try:
-                        from .steps.end_with_fail_step import EndWithFailStep
-                        if isinstance(s, EndWithFailStep):
-                            self.current_step_index = i
-                            self.show_current_step()
-                            return
-                    except ImportError:
-                        if s.__class__.__name__ == 'EndWithFailStep':
-                            self.current_step_index = i
-                            self.show_current_step()
-                            return
+        if step.is_failed() and self.failed_step is None:
+            self.failed_step = step
+        # Cancel steps depending on a failed one, start steps that became ready
+        self.scheduler.on_step_finished(step)
+        
+        # After an error, show it once independent steps still running have finished
+        at_end_fail = (0 <= self.current_step_index < len(self.steps)
+                       and self.graph.role_of(self.steps[self.current_step_index]) == StepRole.FAIL)
+        if (self.failed_step is not None and not self.scheduler.busy() and not at_end_fail
+                and self._show_end_fail_step()):
+            return
         
         # Update navigation and sidebar
         self.update_navigation()
         self.update_sidebar()
+        self._speculate_next_step()
+    
+    def enable_loop_monitor(self, overlay=False, **options):
+        """
+        Start measuring Tk event loop latency and logging stalls.
+        
+        Args:
+            overlay: show debug label with pending callbacks and frame time
+            **options: EventLoopMonitor options (interval_ms, stall_threshold_ms, ...)
+        
+        Returns:
+            EventLoopMonitor object
+        """
+        if self.loop_monitor is None:
+            self.loop_monitor = EventLoopMonitor(self.root, **options)
+            self.loop_monitor.start()
+            if overlay:
+                self.loop_monitor.show_overlay(self.nav_frame, font=self.fonts['small'])
+        return self.loop_monitor
+    
+    def enable_metrics_export(self, path, interval=15.0):
+        """
+        Periodically write wizard metrics to a Prometheus text-format file
+        (e.g. into node exporter's textfile collector directory).
+        
+        Args:
+            path: output file path (*.prom)
+            interval: seconds between writes
+        
+        Returns:
+            TextfileExporter object
+        """
+        if self.metrics_exporter is None:
+            self.metrics_exporter = TextfileExporter(self.metrics, path, interval)
+            self.metrics_exporter.start()
+        return self.metrics_exporter
+    
+    def dump_trace(self, path):
+        """Write recorded timing spans as Chrome Trace Event JSON"""
+        self.tracer.dump_chrome_trace(path)
+    
+    def export_answers(self, path):
+        """
+        Save current user inputs of all steps as a JSON answer file
+        (for unattended runs with HeadlessRunner)
+        """
+        answers = {}
+        for step in self.steps:
+            step_answers = step.get_answers()
+            if step_answers:
+                answers[step.get_answer_key()] = step_answers
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(answers, f, indent=2, ensure_ascii=False)
     
     def cancel_process(self):
         """Cancel current process and exit wizard with error"""
@@ -672,16 +946,30 @@ class WizardApp:
         if not result:
             return
         
-        current_step = None
-        if 0 <= self.current_step_index < len(self.steps):
-            current_step = self.steps[self.current_step_index]
-        
-        # Cancel current step's process if it's running
-        if current_step and current_step.process:
-            current_step.process.cancel()
+        # Cancel running processes and close wizard
+        self.shutdown()
+    
+    def shutdown(self):
+        """
+        Stop all processes within shutdown_coordinator.deadline, flush logs,
+        run cleanup hooks and exit main loop.
         
-        # Close wizard
+        Returns:
+            Shutdown report (see ShutdownCoordinator.shutdown)
+        """
+        report = self.shutdown_coordinator.shutdown()
+        self.watchdog.stop()
+        if self.loop_monitor is not None:
+            self.loop_monitor.stop()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
         self.root.quit()
+        return report
+    
+    def _on_window_close(self):
+        """Window closed by user: shut down and destroy window"""
+        self.shutdown()
+        self.root.destroy()
     
     def next_step(self):
         """Go to next step"""
@@ -692,60 +980,56 @@ class WizardApp:
             return
         
         # If step completed with error, go to end_fail_step
-        if current_step.is_failed():
-            if self._end_fail_step:
-                # Check if end_fail_step is already in steps
-                has_end_fail = False
-                try:
-                    from .steps.end_with_fail_step import EndWithFailStep
-                    has_end_fail = any(isinstance(s, EndWithFailStep) for s in self.steps)
-                except ImportError:
-                    has_end_fail = any(s.__class__.__name__ == 'EndWithFailStep' for s in self.steps)
-                
-                if not has_end_fail:
-                    self.steps.append(self._end_fail_step)
-                
-                # Go to end fail step
-                for i, s in enumerate(self.steps):
-                    if s is self._end_fail_step:
-                        self.current_step_index = i
-                        self.show_current_step()
-                        return
-                    try:
-                        from .steps.end_with_fail_step import EndWithFailStep
-                        if isinstance(s, EndWithFailStep):
-                            self.current_step_index = i
-                            self.show_current_step()
-                            return
-                    except ImportError:
-                        if s.__class__.__name__ == 'EndWithFailStep':
-                            self.current_step_index = i
-                            self.show_current_step()
-                            return
-        
-        # Go to next step
-        if self.current_step_index < len(self.steps) - 1:
-            self.current_step_index += 1
-            self.show_current_step()
+        if current_step.is_failed() and self._show_end_fail_step():
+            return
+        
+        # Go to next step (skipping disabled ones)
+        next_index = self.graph.next_index(self.current_step_index)
+        if next_index is None or self._waits_for_background(next_index):
+            return
+        self.current_step_index = next_index
+        self.show_current_step()
+    
+    def toggle_pause(self):
+        """Pause or resume current step's process"""
+        if not (0 <= self.current_step_index < len(self.steps)):
+            return
+        step = self.steps[self.current_step_index]
+        process = step.process
+        if not process or step.status != StepStatus.RUNNING:
+            return
+        
+        if process.is_paused():
+            process.resume()
+        else:
+            process.pause()
+        self.update_navigation()
+        self.update_sidebar()
+    
+    def _waits_for_background(self, index):
+        """Whether step at index is the end success step and background processes still run"""
+        if not (0 <= index < len(self.steps)) or self.graph.role_of(self.steps[index]) != StepRole.SUCCESS:
+            return False
+        return self.scheduler.busy()
     
     def prev_step(self):
         """Go to previous step"""
-        if self.current_step_index > 0:
+        prev_index = self.graph.prev_index(self.current_step_index)
+        if prev_index is not None:
             current_step = self.steps[self.current_step_index]
-            if current_step and current_step.status == StepStatus.RUNNING:
+            if current_step and current_step.status == StepStatus.RUNNING and not current_step.background:
                 return  # Cannot go back during process execution
             
-            self.current_step_index -= 1
+            self.current_step_index = prev_index
             self.show_current_step()
     
     def _get_step_name(self, step):
         """Get display name for a step"""
-        class_name = step.__class__.__name__
-        # Convert CamelCase to Title Case
-        name = re.sub(r'(?<!^)(?=[A-Z])', ' ', class_name)
-        # Remove "Step" suffix if present
-        if name.endswith(' Step'):
-            name = name[:-5]
+        name = step.get_display_name()
+        if step.attempt > 1 and step.status == StepStatus.RUNNING and step.retry_policy:
+            name = "{} ({}/{})".format(name, step.attempt, step.retry_policy.max_attempts)
+        if step.status == StepStatus.RUNNING and step.process and step.process.is_paused():
+            name = "{} (paused)".format(name)
         return name
     
     def _get_step_status_icon(self, status):
@@ -790,7 +1074,7 @@ class WizardApp:
             self.failed_color = "#d13438"  # Red
             self.running_color = "#ffaa00"  # Orange
             self.pending_color = "#666666"  # Gray
-                
+        
         except Exception as e:
             # Fallback to default colors if theme lookup fails
             self.sidebar_bg = "#f5f5f5"
@@ -861,11 +1145,12 @@ class WizardApp:
         
         if target_step.status == StepStatus.SUCCESS or target_step.status == StepStatus.FAILED:
             # Navigate to completed step
-            if current_step and current_step.status == StepStatus.RUNNING:
+            if current_step and current_step.status == StepStatus.RUNNING and not current_step.background:
                 return  # Can't navigate during process execution
             self.current_step_index = step_index
             self.show_current_step()
     
+    @traced("WizardApp.update_sidebar", "ui")
     def update_sidebar(self):
         """Update the sidebar with current steps and statuses"""
         # Clear existing step widgets
@@ -873,9 +1158,13 @@ class WizardApp:
             widget.destroy()
         self.step_widgets = []
         
-        # Create widgets for each step
+        # Create widgets for each step (skipped ones are not listed)
+        number = 0
         for i, step in enumerate(self.steps):
             is_current = (i == self.current_step_index)
+            if not is_current and not self.graph.is_enabled(step):
+                continue
+            number += 1
             step_name = self._get_step_name(step)
             status_icon = self._get_step_status_icon(step.status)
             status_color = self._get_step_status_color(step.status, is_current)
@@ -898,16 +1187,16 @@ class WizardApp:
             
             # Status icon
             icon_label = tk.Label(step_frame, text=status_icon, 
-                                 font=("Arial", 12), bg=step_frame.cget("bg"),
+                                 font=self.fonts['sidebar_icon'], bg=step_frame.cget("bg"),
                                  fg=status_color, width=2)
             icon_label.pack(side=tk.LEFT, padx=(5, 5))
             icon_label.bind("<Button-1>", click_handler)
             
             # Step number and name
-            step_text = "{} {}".format(i + 1, step_name)
+            step_text = "{} {}".format(number, step_name)
             name_fg = self._get_system_color('text') if not is_current else self.current_color
             name_label = tk.Label(step_frame, text=step_text,
-                                font=("Arial", 9), bg=step_frame.cget("bg"),
+                                font=self.fonts['sidebar_item'], bg=step_frame.cget("bg"),
                                 fg=name_fg,
                                 anchor=tk.W, justify=tk.LEFT)
             name_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
+import sys
 import tkinter as tk
 import time
 import threading
+from .tracing import get_recorder
+from .metrics import WIZARD_METRICS
+from .channel import ChannelClosed, ChannelCancelled
 
 
 class WizardProcess:
@@ -14,6 +18,12 @@ class WizardProcess:
     The process runs in a separate thread and can be cancelled.
     """
     
+    # Seconds without heartbeat after which the watchdog fails the process
+    # (None - use watchdog default)
+    stall_timeout = None
+    # Whether the wizard offers a Pause button while the process runs
+    pausable = True
+    
     def __init__(self, progress_interface=None, logger=None, state_callback=None, root=None):
         """
         Args:
@@ -31,63 +41,298 @@ class WizardProcess:
         self._cancelled = False
         self._thread = None
         self._lock = threading.Lock()
+        self.owner = None  # WizardStep that runs this process (set by step)
+        self._started_at = None  # Clock value of start() until completion is recorded
+        self._trace_thread = None
+        self._pending_progress = None  # Latest (percent, eta) waiting for UI update
+        self.registry = None  # ProcessRegistry tracking this process (set by registry)
+        self.result = None  # "success", "failed", "error" or "cancelled" once completed
+        self.started_monotonic = None  # time.monotonic() of start()
+        self.last_heartbeat = None  # time.monotonic() of last log/progress/heartbeat
+        self.diagnostics = None  # Details of failure reported through fail()
+        self.error = None  # Exception raised by run(), if any
+        self._log_buffer = []  # Log lines waiting for UI update
+        self._resumed = threading.Event()  # Cleared while paused
+        self._resumed.set()
+        self.paused_seconds = 0.0  # Total time spent paused
+        self._paused_at = None
+        self.input = None  # Channel with chunks of the stream_from step's process
+        self.output = None  # Channel to the process of the step streaming from this one
     
     def is_cancelled(self):
-        """Check if the process was cancelled"""
+        """Check if the process was cancelled
+        
+        Called from the process thread this is also the pause point:
+        while the process is paused it blocks until resume() or cancel().
+        """
+        if not self._resumed.is_set() and threading.current_thread() is self._thread:
+            self._resumed.wait()
         with self._lock:
             return self._cancelled
     
-    def cancel(self):
-        """Cancel process execution"""
+    def pause(self):
+        """Pause process at its next is_cancelled() check"""
+        with self._lock:
+            if self._cancelled or self._paused_at is not None:
+                return
+            self._paused_at = time.monotonic()
+            self._resumed.clear()
+        if hasattr(self.progress_interface, 'pause'):
+            self.progress_interface.pause()
+    
+    def resume(self):
+        """Resume paused process"""
+        with self._lock:
+            if self._paused_at is None:
+                return
+            self._end_pause()
+        self.heartbeat()  # Silence while paused is not a stall
+        if hasattr(self.progress_interface, 'resume'):
+            self.progress_interface.resume()
+        self._resumed.set()
+    
+    def _end_pause(self):
+        """Add current pause to paused_seconds (caller holds self._lock)"""
+        if self._paused_at is not None:
+            self.paused_seconds += time.monotonic() - self._paused_at
+            self._paused_at = None
+    
+    def is_paused(self):
+        """Whether process is paused"""
+        return self._paused_at is not None
+    
+    def cancel(self, notify=True):
+        """
+        Cancel process execution
+        
+        Args:
+            notify: call state_callback(False) (step fails); False when
+                    the process is only stopped, e.g. replaced by a new one
+        """
         with self._lock:
             self._cancelled = True
+            self._end_pause()
+        self._resumed.set()  # Wake paused thread so it sees the cancel
+        self._cancel_streams("cancelled")
+        self._record_finish("cancelled")
         # If process completed with cancellation, set failure
-        if self.state_callback:
+        if notify and self.state_callback:
             self.state_callback(False)
     
+    def fail(self, result, diagnostics=None):
+        """
+        Fail process from outside its thread (e.g. by the watchdog).
+        
+        The process is stopped like a cancel and the step is notified of
+        the failure in the main thread.
+        
+        Args:
+            result: result recorded in metrics and traces (e.g. "stalled")
+            diagnostics: dict describing the failure (stored in self.diagnostics)
+        
+        Returns:
+            False if process was already cancelled or failed
+        """
+        with self._lock:
+            if self._cancelled:
+                return False
+            self._cancelled = True
+            self._end_pause()
+        self._resumed.set()
+        self._cancel_streams(result)
+        self.diagnostics = diagnostics
+        self._record_finish(result)
+        callback = self.state_callback
+        if callback:
+            if self.root:
+                self.root.after(0, lambda: callback(False))
+            else:
+                callback(False)
+        return True
+    
+    def detach(self):
+        """Disconnect process from its step UI; it keeps running but results go nowhere"""
+        self.state_callback = None
+        self.logger = None
+        self.progress_interface = None
+    
+    def is_alive(self):
+        """Whether process thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def heartbeat(self):
+        """Mark process as alive (log and update_progress do this automatically)"""
+        self.last_heartbeat = time.monotonic()
+    
+    def send(self, chunk):
+        """
+        Pass chunk to the process of the step streaming from this one
+        (called from process thread).
+        
+        Blocks while the consumer is behind (channel full). Without a
+        consuming step the chunk is dropped.
+        
+        Raises:
+            ChannelCancelled: this process or the consumer was cancelled or failed
+        """
+        while True:
+            output = self.output
+            if output is None:
+                return  # No consumer (or it did not start, see StepScheduler)
+            self.heartbeat()  # Waiting for a slower consumer is not a stall
+            if self.is_cancelled():
+                raise ChannelCancelled("Process {} was cancelled".format(self._step_label()))
+            try:
+                output.put(chunk, timeout=1.0)
+                return
+            except TimeoutError:
+                continue
+    
+    def receive(self):
+        """
+        Iterate over chunks sent by the process of the stream_from step
+        (called from process thread). Ends when that process has completed
+        and all chunks were read.
+        
+        Raises:
+            ChannelCancelled: this process or the producer was cancelled or failed
+        """
+        if self.input is None:
+            return
+        while True:
+            self.heartbeat()  # Waiting for a slower producer is not a stall
+            if self.is_cancelled():
+                raise ChannelCancelled("Process {} was cancelled".format(self._step_label()))
+            try:
+                chunk = self.input.get(timeout=1.0)
+            except TimeoutError:
+                continue
+            except ChannelClosed:
+                return
+            yield chunk
+    
+    def _cancel_streams(self, reason):
+        """Cancel channels so processes on both sides stop"""
+        reason = "{} {}".format(self._step_label(), reason)
+        for channel in (self.input, self.output):
+            if channel is not None:
+                channel.cancel(reason)
+    
+    def _finish_streams(self):
+        """End of stream for consumer; producer stops if nobody reads anymore"""
+        if self.output is not None:
+            if self.result in ("success", "finished") and not self._cancelled:
+                self.output.close()
+            else:
+                self.output.cancel("{} {}".format(self._step_label(), self.result))
+        if self.input is not None:
+            # Producer must not wait for a consumer that stopped reading
+            self.input.cancel("{} stopped reading".format(self._step_label()))
+    
+    def _step_label(self):
+        """Step class name used in metrics"""
+        return self.owner.__class__.__name__ if self.owner else self.__class__.__name__
+    
     def log(self, message):
-        """Output message to log"""
+        """Output message to log
+        
+        Lines are buffered and written by the main thread in one batch per
+        event loop pass (directly if there is no root).
+        """
+        self.heartbeat()
         if self.logger and not self.is_cancelled():
-            try:
-                self.logger.insert(tk.END, message + "\n")
-                self.logger.see(tk.END)
-                self.logger.update()
-            except:
-                pass  # Widget may have been destroyed
+            WIZARD_METRICS['log_lines'].inc(step=self._step_label())
+            if not self.root:
+                self._write_log([message])
+                return
+            
+            with self._lock:
+                scheduled = bool(self._log_buffer)
+                self._log_buffer.append(message)
+            if not scheduled:
+                self.root.after(0, self.flush_log)
+    
+    def flush_log(self):
+        """Write buffered log lines to logger (main thread)"""
+        with self._lock:
+            lines = self._log_buffer
+            self._log_buffer = []
+        if lines:
+            self._write_log(lines)
+    
+    def _write_log(self, lines):
+        logger = self.logger
+        if not logger:
+            return
+        try:
+            logger.insert(tk.END, "\n".join(lines) + "\n")
+            logger.see(tk.END)
+        except:
+            pass  # Widget may have been destroyed
     
     def update_progress(self, percent, eta=None):
-        """Update progress (called from process thread)"""
-        if self.is_cancelled():
+        """Update progress (called from process thread)
+        
+        Updates are coalesced: while one UI update is waiting for the main
+        thread, newer values replace its data instead of scheduling more callbacks.
+        """
+        self.heartbeat()
+        progress_updates = WIZARD_METRICS['progress_updates']
+        if self.is_cancelled() or not self.progress_interface or not self.root:
+            progress_updates.inc(outcome="dropped")
             return
         
-        if self.progress_interface:
-            # Update UI through root.after in main thread
-            if self.root:
-                def update_ui():
-                    if not self.is_cancelled() and self.progress_interface:
-                        try:
-                            self.progress_interface.set_percent(percent)
-                            
-                            # Always update ETA (if provided or calculate automatically)
-                            if eta is not None:
-                                self.progress_interface.set_eta(eta)
-                            elif percent > 0 and percent < 100:
-                                # Calculate ETA automatically if not provided
-                                if hasattr(self.progress_interface, 'get_elapsed'):
-                                    elapsed = self.progress_interface.get_elapsed()
-                                    if elapsed > 0:
-                                        total_time = (elapsed / percent) * 100
-                                        remaining = total_time - elapsed
-                                        self.progress_interface.set_eta(remaining)
-                            
-                            # Update elapsed time
-                            if hasattr(self.progress_interface, 'get_elapsed'):
-                                elapsed = self.progress_interface.get_elapsed()
-                                self.progress_interface.set_elapsed_time(elapsed)
-                        except:
-                            pass  # Widgets may have been destroyed
-                
-                self.root.after(0, update_ui)
+        with self._lock:
+            scheduled = self._pending_progress is not None
+            self._pending_progress = (percent, eta)
+        
+        if scheduled:
+            progress_updates.inc(outcome="coalesced")
+            return
+        
+        # Update UI through root.after in main thread
+        self.root.after(0, self._apply_progress)
+    
+    def cleanup(self):
+        """
+        Release resources left by an interrupted run (e.g. temporary files).
+        Optional, overridden in subclasses; called on wizard shutdown after
+        the process thread stopped.
+        """
+        pass
+    
+    def _apply_progress(self):
+        """Apply latest pending progress to progress interface (main thread)"""
+        with self._lock:
+            pending = self._pending_progress
+            self._pending_progress = None
+        
+        if pending is None or self.is_cancelled() or not self.progress_interface:
+            return
+        
+        WIZARD_METRICS['progress_updates'].inc(outcome="applied")
+        percent, eta = pending
+        try:
+            self.progress_interface.set_percent(percent)
+            
+            # Always update ETA (if provided or calculate automatically)
+            if eta is not None:
+                self.progress_interface.set_eta(eta)
+            elif percent > 0 and percent < 100:
+                # Calculate ETA automatically if not provided
+                if hasattr(self.progress_interface, 'get_elapsed'):
+                    elapsed = self.progress_interface.get_elapsed()
+                    if elapsed > 0:
+                        total_time = (elapsed / percent) * 100
+                        remaining = total_time - elapsed
+                        self.progress_interface.set_eta(remaining)
+            
+            # Update elapsed time
+            if hasattr(self.progress_interface, 'get_elapsed'):
+                elapsed = self.progress_interface.get_elapsed()
+                self.progress_interface.set_elapsed_time(elapsed)
+        except:
+            pass  # Widgets may have been destroyed
     
     def run(self):
         """
@@ -98,11 +343,13 @@ class WizardProcess:
         """
         self.start_time = time.time()
         # By default do nothing, complete successfully
-        if not self.is_cancelled() and self.state_callback:
+        self._record_finish("success" if self.success else "failed")
+        callback = self.state_callback
+        if not self.is_cancelled() and callback:
             if self.root:
-                self.root.after(0, lambda: self.state_callback(self.success))
+                self.root.after(0, lambda: callback(self.success))
             else:
-                self.state_callback(self.success)
+                callback(self.success)
     
     def start(self):
         """Start the process in a separate thread"""
@@ -110,20 +357,59 @@ class WizardProcess:
             return  # Thread already started
         
         self._cancelled = False
-        self._thread = threading.Thread(target=self._run_wrapper, daemon=True)
+        self.result = None
+        self.error = None
+        self._started_at = get_recorder().now()
+        self.started_monotonic = self.last_heartbeat = time.monotonic()
+        WIZARD_METRICS['processes_running'].inc()
+        self._thread = threading.Thread(target=self._run_wrapper, daemon=True,
+                                        name="{} ({})".format(self.__class__.__name__, self._step_label()))
         self._thread.start()
     
     def _run_wrapper(self):
         """Wrapper for executing run() in thread"""
+        self._trace_thread = threading.get_ident()
+        get_recorder().name_thread(self._trace_thread, threading.current_thread().name)
         try:
             self.run()
         except:
             # On error, complete with failure
-            if not self.is_cancelled() and self.state_callback:
+            self.error = sys.exc_info()[1]
+            self._record_finish("error")
+            callback = self.state_callback
+            if not self.is_cancelled() and callback:
                 if self.root:
-                    self.root.after(0, lambda: self.state_callback(False))
+                    self.root.after(0, lambda: callback(False))
                 else:
-                    self.state_callback(False)
+                    callback(False)
+        finally:
+            self._record_finish("finished")
+            self._finish_streams()
+            if self.registry:
+                self.registry.release(self)
+    
+    def _record_finish(self, result):
+        """Record timing span and metrics from start() to completion (once per start)"""
+        with self._lock:
+            start = self._started_at
+            self._started_at = None
+        if start is None:
+            return
+        self.result = result
+        
+        recorder = get_recorder()
+        end = recorder.now()
+        name = self.owner.get_display_name() if self.owner else self.__class__.__name__
+        recorder.record(name, "process", start, end, thread_id=self._trace_thread,
+                        args={'process': self.__class__.__name__, 'result': result})
+        
+        step = self._step_label()
+        WIZARD_METRICS['processes_running'].dec()
+        WIZARD_METRICS['process_seconds'].observe((end - start) / 1e9, step=step, result=result)
+        if result == "cancelled":
+            WIZARD_METRICS['cancellations'].inc(step=step)
+        elif result in ("failed", "error", "stalled"):
+            WIZARD_METRICS['failures'].inc(step=step)
     
     def wait(self, timeout=None):
         """Wait for process completion"""
@@ -136,9 +422,11 @@ class WizardProcess:
             return  # If cancelled, don't change status
         
         self.success = success
-        if self.state_callback:
+        self._record_finish("success" if success else "failed")
+        callback = self.state_callback
+        if callback:
             if self.root:
-                self.root.after(0, lambda: self.state_callback(success))
+                self.root.after(0, lambda: callback(success))
             else:
-                self.state_callback(success)
+                callback(success)
 
@@ -1,6 +1,17 @@
 # -*- coding: utf-8 -*-
+import logging
+import re
+import threading
+import tkinter as tk
 from abc import ABC, abstractmethod
-from .enums import StepStatus
+from .enums import StepStatus, ProcessPolicy
+from .tracing import get_recorder
+from .metrics import WIZARD_METRICS
+from .speculation import CaptureLog, CaptureProgress
+from .channel import Channel
+from .validation import FormValidation
+
+logger = logging.getLogger(__name__)
 
 
 class WizardStep(ABC):
@@ -9,11 +20,49 @@ class WizardStep(ABC):
     Developers create subclasses of this class for their steps.
     """
     
+    # Allow prepare() to run ahead while the user is on a previous step
+    prefetch = True
+    # Text shown in the placeholder while prepare() is running
+    prepare_message = "Loading..."
+    # Key of this step's section in answer files (class name if None)
+    answer_key = None
+    # What to do with the previous process when the step is rendered again
+    process_policy = ProcessPolicy.CANCEL
+    # RetryPolicy for failed processes (None - a failure ends the wizard)
+    retry_policy = None
+    # Process only reads (scans, checks); it may start before the step is shown
+    side_effect_free = False
+    # Steps (instances or classes) whose processes must succeed before this one starts
+    depends_on = ()
+    # False if the step needs no user input: its process may run before it is
+    # shown, concurrently with other independent steps
+    interactive = True
+    # User may go to next steps while the process runs (later steps wait for
+    # it by listing this step in depends_on)
+    background = False
+    # Step (instance or class) whose process sends chunks that this step's
+    # process reads with receive(); both processes run at the same time
+    stream_from = None
+    # Chunks buffered for the consuming step before send() blocks
+    stream_capacity = 8
+    
     def __init__(self, wizard_app):
         self.wizard_app = wizard_app
         self.content_frame = None
         self.status = StepStatus.PENDING
         self.process = None
+        self.prepared_data = None  # Result of prepare()
+        self.prepare_error = None  # Exception raised by prepare(), if any
+        self._prepare_state = None  # None, "running" or "done"
+        self._prepare_generation = 0
+        self._prepare_inputs = {}  # State keys read by prepare() -> versions
+        self.attempt = 0  # Number of current process attempt (from 1)
+        self._speculation = None  # (speculation key, process) started ahead of time
+        self._speculation_outcome = None  # success of finished speculative process
+        self._speculation_inputs = {}  # State keys read when the speculation started
+        self._detached = False  # Process was started without content (not rendered yet)
+        self.waiting_for_dependencies = False  # Rendered, process waits for depends_on
+        self.validation = None  # FormValidation of inputs (created by add_validator)
     
     @abstractmethod
     def create_content(self, content_frame):
@@ -35,23 +84,508 @@ class WizardStep(ABC):
         """
         pass
     
+    def prepare(self):
+        """
+        Load data needed to draw the step. Optional, overridden by developer.
+        
+        Runs in a background thread before create_content, so it must not
+        touch widgets. The return value is stored in self.prepared_data.
+        """
+        return None
+    
+    def is_enabled(self):
+        """
+        Whether the step is on the wizard's path (skip rule). Optional,
+        overridden by developer; by default always True.
+        
+        Read inputs from wizard_app.state: the result is memoized until a
+        state key read here changes.
+        """
+        return True
+    
+    def has_condition(self):
+        """Whether step overrides is_enabled()"""
+        return type(self).is_enabled is not WizardStep.is_enabled
+    
+    def add_validator(self, name, function, variables, delay_ms=300, message_var=None):
+        """
+        Validate input in a background thread; Next is enabled only while all
+        validators of the step accept the current input.
+        
+        Args:
+            name: validator name
+            function: function(*values) returning None if valid or an error
+                      message (may also raise ValidationError); it runs off
+                      the main thread, so it may check disk or local services
+            variables: Tk variable or list of Tk variables passed to function
+            delay_ms: wait for this long after the last change (typing)
+            message_var: Tk StringVar receiving the error message
+        
+        Adding a validator of the same name again (e.g. in create_content(),
+        which runs on every render) replaces it.
+        """
+        if self.validation is None:
+            self.validation = FormValidation(self.wizard_app.root, on_change=self._on_validation_changed)
+        self.validation.add(name, function, variables, delay_ms=delay_ms, message_var=message_var)
+    
+    def _on_validation_changed(self):
+        """Validation result changed: enable or disable Next"""
+        self.wizard_app.update_navigation()
+    
+    def needs_prepare(self):
+        """Whether step overrides prepare()"""
+        return type(self).prepare is not WizardStep.prepare
+    
+    def is_prepared(self):
+        """Whether step data is ready and content can be created"""
+        return not self.needs_prepare() or self._prepare_state == "done"
+    
+    def start_prepare(self):
+        """Start prepare() in a separate thread (no-op if already started)"""
+        if not self.needs_prepare() or self._prepare_state is not None:
+            return
+        
+        self._prepare_state = "running"
+        generation = self._prepare_generation
+        thread = threading.Thread(target=self._prepare_wrapper, args=(generation,), daemon=True)
+        thread.start()
+    
+    def invalidate_prepared(self):
+        """Drop prepared data so prepare() runs again before next render"""
+        self._prepare_generation += 1
+        self._prepare_state = None
+        self._prepare_inputs = {}
+        self.prepared_data = None
+        self.prepare_error = None
+    
+    def run_prepare(self):
+        """Run prepare() in the calling thread (used by headless runner)"""
+        if self.is_prepared() or self._prepare_state == "running":
+            return
+        
+        self.prepared_data = None
+        self.prepare_error = None
+        with self.wizard_app.state.track() as inputs:
+            try:
+                self.prepared_data = self.prepare()
+            except Exception as e:
+                self.prepare_error = e
+        self._prepare_inputs = inputs
+        self._prepare_state = "done"
+    
+    def _prepare_wrapper(self, generation):
+        """Wrapper for executing prepare() in thread"""
+        data = None
+        error = None
+        with self.wizard_app.state.track() as inputs:
+            try:
+                data = self.prepare()
+            except Exception as e:
+                error = e
+        
+        # Deliver result in main thread
+        self.wizard_app.root.after(0, lambda: self._on_prepare_complete(generation, data, error, inputs))
+    
+    def _on_prepare_complete(self, generation, data, error, inputs=None):
+        """Callback called when prepare() completes"""
+        if generation != self._prepare_generation:
+            return  # Result was invalidated while loading
+        if inputs and self.wizard_app.state.changed_since(inputs):
+            # State read by prepare() changed while loading
+            self.invalidate_prepared()
+            self.start_prepare()
+            return
+        
+        self._prepare_inputs = inputs or {}
+        self.prepared_data = data
+        self.prepare_error = error
+        self._prepare_state = "done"
+        self.wizard_app.on_step_prepared(self)
+    
+    def create_headless_process(self):
+        """
+        Create process for unattended (headless) execution.
+        
+        By default same as create_process(). Override if create_process()
+        depends on widgets made in create_content(). Progress and logging of
+        the returned process are redirected by the headless runner.
+        """
+        return self.create_process()
+    
+    def get_display_name(self):
+        """Get display name of the step (class name in Title Case without "Step")"""
+        name = re.sub(r'(?<!^)(?=[A-Z])', ' ', self.__class__.__name__)
+        if name.endswith(' Step'):
+            name = name[:-5]
+        return name
+    
+    def get_answer_key(self):
+        """Get key of this step's section in answer files"""
+        return self.answer_key or self.__class__.__name__
+    
+    def get_answers(self):
+        """
+        Get user inputs of this step (values of its Tk variables).
+        
+        Returns:
+            dict: attribute name -> value
+        """
+        answers = {}
+        for name, value in vars(self).items():
+            if isinstance(value, tk.Variable):
+                answers[name] = value.get()
+        return answers
+    
+    def apply_answers(self, answers):
+        """
+        Set user inputs of this step from an answer file section.
+        
+        Args:
+            answers: dict attribute name -> value; Tk variables are set,
+                     other existing attributes are replaced
+        """
+        for name, value in answers.items():
+            if not hasattr(self, name):
+                raise ValueError("Unknown answer '{}' for step {}".format(name, self.get_answer_key()))
+            attr = getattr(self, name)
+            if isinstance(attr, tk.Variable):
+                attr.set(value)
+            else:
+                setattr(self, name, value)
+    
     def render(self, content_frame):
         """Render step (called by WizardApp)"""
-        self.content_frame = content_frame
-        self.create_content(content_frame)
+        tracer = get_recorder()
+        step_name = self.get_display_name()
+        started = tracer.now()
+        with tracer.span("WizardStep.render", "ui", step=step_name):
+            self.content_frame = content_frame
+            with tracer.span("WizardStep.create_content", "ui", step=step_name):
+                self.create_content(content_frame)
+            if self.validation is not None:
+                self.validation.watch()  # Validators added in __init__ were unwatched by leave()
+                self.validation.validate()
+            
+            # Previous process of this step (Back, then Next) is handled by process_policy
+            registry = self.wizard_app.processes
+            detached = self._detached
+            reused = adopted = None
+            if not detached:
+                reused = registry.retire(self)
+                adopted = self._adopt_speculation() if reused is None else None
+            if detached:
+                # Process started by the scheduler before the step was shown
+                self._detached = False
+                self._attach_captured(self.process)
+            elif reused is not None:
+                if reused.is_alive() and reused.result is None:
+                    self.attach_process(reused)
+            elif adopted is not None:
+                self.attempt = 1
+                self.status = StepStatus.RUNNING
+                outcome = self._speculation_outcome
+                self._speculation_outcome = None
+                if outcome is not None:
+                    # Finished while the user was on previous steps
+                    self.wizard_app.root.after(0, lambda: self._on_process_complete(outcome))
+            elif self.dependencies_met():
+                self.waiting_for_dependencies = False
+                self.start_process()
+            else:
+                # Scheduler starts the process when dependencies succeed
+                self.process = None
+                self.status = StepStatus.PENDING
+                self.waiting_for_dependencies = True
         
-        # Create process if it exists
+        WIZARD_METRICS['render_seconds'].observe((tracer.now() - started) / 1e9,
+                                                 step=self.__class__.__name__)
+    
+    def start_process(self):
+        """Create process for rendered content and start it"""
         self.process = self.create_process()
         if self.process:
             # Set root for process if not already set
             if not self.process.root:
                 self.process.root = self.wizard_app.root
+            self.connect_streams(self.process)
+            self._bind_state_callback(self.process)
+            self.wizard_app.processes.register(self, self.process)
+            self.attempt = 1
             # Start process in separate thread
             self.status = StepStatus.RUNNING
             self.process.start()
     
+    def start_detached(self):
+        """
+        Start process before the step is shown (used by the scheduler).
+        
+        The process is made by create_headless_process(); its output is
+        captured and replayed when the step is rendered.
+        
+        A step whose create_headless_process() fails (e.g. its
+        create_process() uses widgets that don't exist yet) is marked FAILED.
+        
+        Returns:
+            True if a process was started
+        """
+        try:
+            process = self.create_headless_process()
+        except Exception:
+            logger.exception("Process of step %s could not be created before the step is shown; "
+                             "non-interactive steps whose create_process() uses widgets must "
+                             "override create_headless_process()", self.get_display_name())
+            self.status = StepStatus.FAILED
+            # Notify like a process completion: the scheduler may still be iterating over steps
+            self.wizard_app.root.after(0, lambda: self.wizard_app.on_step_status_changed(self))
+            return False
+        if process is None:
+            self.status = StepStatus.SUCCESS
+            return False
+        process.root = self.wizard_app.root
+        process.logger = CaptureLog()
+        process.progress_interface = CaptureProgress()
+        process.state_callback = self._on_process_complete
+        self._bind_state_callback(process)
+        self.connect_streams(process)
+        self.wizard_app.processes.register(self, process)
+        self.process = process
+        self._detached = True
+        self.attempt = 1
+        self.status = StepStatus.RUNNING
+        process.start()
+        return True
+    
+    def leave(self):
+        """Called when the step's content is removed (user moved to another step)"""
+        if self.validation is not None:
+            self.validation.unwatch()
+    
+    def detach_content(self):
+        """
+        Keep output of running process while the step is not shown
+        (user moved on from a background step). It is replayed on next render.
+        """
+        process = self.process
+        if process is None or self._detached:
+            return
+        process.flush_log()
+        log = CaptureLog()
+        try:
+            log.lines = process.logger.get("1.0", tk.END).splitlines()
+        except:
+            pass  # Logger is not a text widget or was destroyed
+        progress = CaptureProgress()
+        previous = process.progress_interface
+        if hasattr(previous, 'get_elapsed'):
+            progress.start_time -= previous.get_elapsed()
+        progress_var = getattr(previous, 'progress_var', None)
+        if progress_var is not None:
+            try:
+                progress.percent = progress_var.get()
+            except:
+                pass
+        process.logger = log
+        process.progress_interface = progress
+        self._detached = True
+    
+    def get_dependencies(self):
+        """Get steps from depends_on (classes are matched against wizard steps)"""
+        dependencies = []
+        for dependency in self.depends_on:
+            if isinstance(dependency, type):
+                dependencies.extend(step for step in self.wizard_app.steps
+                                    if isinstance(step, dependency) and step is not self)
+            else:
+                dependencies.append(dependency)
+        return dependencies
+    
+    def dependencies_met(self):
+        """
+        Whether all steps this step depends on completed successfully
+        and the stream_from step's process has started
+        """
+        graph = self.wizard_app.graph
+        if not all(step.status == StepStatus.SUCCESS or not graph.is_enabled(step)
+                   for step in self.get_dependencies()):
+            return False  # Skipped steps don't block steps depending on them
+        source = self.get_stream_source()
+        if source is None:
+            return True
+        return (source.status in (StepStatus.RUNNING, StepStatus.SUCCESS)
+                and source.process is not None and source.process.output is not None)
+    
+    def get_stream_source(self):
+        """Get stream_from step (a class is matched against wizard steps)"""
+        source = self.stream_from
+        if isinstance(source, type):
+            return next((step for step in self.wizard_app.steps
+                         if isinstance(step, source) and step is not self), None)
+        return source
+    
+    def get_stream_consumers(self):
+        """Get steps streaming from this step"""
+        return [step for step in self.wizard_app.steps
+                if step is not self and step.get_stream_source() is self]
+    
+    def get_stream_consumer(self):
+        """
+        Get step streaming from this one that can start together with this
+        step's process: pending and not skipped (None if there is none).
+        
+        Raises:
+            ValueError: more than one step streams from this step
+        """
+        consumers = self.get_stream_consumers()
+        if len(consumers) > 1:
+            raise ValueError("Step {} has more than one stream consumer".format(self.get_display_name()))
+        if (consumers and consumers[0].status == StepStatus.PENDING
+                and self.wizard_app.graph.is_enabled(consumers[0])):
+            return consumers[0]
+        return None
+    
+    def connect_streams(self, process):
+        """
+        Connect process to the processes of streaming neighbour steps
+        (called before process.start()).
+        
+        The process gets an output channel only if its consumer will run
+        (get_stream_consumer()); otherwise the chunks it sends are dropped.
+        
+        Raises:
+            ValueError: more than one step streams from this step
+        """
+        if self.get_stream_consumer() is not None:
+            process.output = Channel(self.stream_capacity, name=self.get_display_name())
+        source = self.get_stream_source()
+        if source is not None and source.process is not None:
+            process.input = source.process.output
+    
+    def speculation_key(self):
+        """
+        Describe inputs of the process (e.g. values chosen on earlier steps).
+        
+        A process started ahead of time is used only if the key is the same
+        when the user arrives at the step. Override in side_effect_free steps
+        whose process depends on user input.
+        """
+        return None
+    
+    def start_speculation(self):
+        """
+        Start process before the step is shown (side_effect_free steps only).
+        
+        The process is made by create_headless_process() (no widgets exist yet);
+        its output is captured and replayed when the step is rendered.
+        """
+        if not self.side_effect_free or self.status != StepStatus.PENDING or not self.is_prepared():
+            return
+        if self.stream_from is not None or self.get_stream_consumers():
+            return  # Streamed chunks can't be read twice
+        
+        state = self.wizard_app.state
+        with state.track() as inputs:
+            key = self.speculation_key()
+            if self._speculation is not None:
+                if self._speculation[0] == key and not state.changed_since(self._speculation_inputs):
+                    return  # Already running for the same inputs
+                self.drop_speculation()
+            
+            process = self.create_headless_process()
+        if process is None:
+            return
+        process.root = self.wizard_app.root
+        process.logger = CaptureLog()
+        process.progress_interface = CaptureProgress()
+        process.state_callback = lambda success: self._on_speculation_complete(process, success)
+        self.wizard_app.processes.register(self, process)
+        self._speculation = (key, process)
+        self._speculation_inputs = inputs
+        self._speculation_outcome = None
+        process.start()
+    
+    def drop_speculation(self):
+        """Cancel process started ahead of time (inputs changed)"""
+        if self._speculation is None:
+            return
+        process = self._speculation[1]
+        self._speculation = None
+        self._speculation_outcome = None
+        process.cancel(notify=False)
+    
+    def _adopt_speculation(self):
+        """Take over process started ahead of time if its inputs are still valid"""
+        if self._speculation is None:
+            return None
+        key, process = self._speculation
+        if (key != self.speculation_key() or self.wizard_app.state.changed_since(self._speculation_inputs)
+                or process.result in ("cancelled", "stalled")):
+            self.drop_speculation()
+            return None
+        
+        self._speculation = None
+        self.process = process
+        self._attach_captured(process)
+        return process
+    
+    def on_state_changed(self, changes):
+        """
+        Called by the wizard (while the step is not shown) with keys changed
+        in wizard_app.state. Drops prepared data and the process started ahead
+        of time if they read any of these keys.
+        """
+        if self._prepare_state == "done" and any(key in changes for key in self._prepare_inputs):
+            self.invalidate_prepared()
+        if self._speculation is not None and any(key in changes for key in self._speculation_inputs):
+            self.drop_speculation()
+    
+    def _attach_captured(self, process):
+        """Connect process started without content to widgets and replay its output"""
+        captured_log = process.logger
+        captured_progress = process.progress_interface
+        self.attach_process(process)
+        # Unflushed lines are still buffered in the process and go to the new logger
+        if isinstance(captured_log, CaptureLog) and process.logger is not None:
+            captured_log.replay(process.logger)
+        if isinstance(captured_progress, CaptureProgress) and process.progress_interface is not None:
+            captured_progress.replay(process.progress_interface)
+    
+    def _on_speculation_complete(self, process, success):
+        """State callback of process started ahead of time"""
+        if self.process is process:
+            self._on_process_complete(success)  # Already adopted
+        elif self._speculation is not None and self._speculation[1] is process:
+            self._speculation_outcome = success
+    
+    def attach_process(self, process):
+        """
+        Connect reused running process to newly created content
+        (process_policy REUSE).
+        
+        By default the logger and progress interface are taken from a new
+        create_process() result, which is not started. Override if creating
+        a process has side effects.
+        """
+        fresh = self.create_process()
+        if fresh is not None:
+            process.logger = fresh.logger
+            process.progress_interface = fresh.progress_interface
+    
+    def _bind_state_callback(self, process):
+        """
+        Deliver state callback of process only while it is the step's current
+        process: callbacks of a replaced or cancelled process may still be
+        waiting in the event queue and must not change the step's status.
+        """
+        callback = process.state_callback
+        if callback is None:
+            return
+        process.state_callback = lambda success: callback(success) if process is self.process else None
+    
     def _on_process_complete(self, success):
         """Callback called when process completes"""
+        if not success and self._schedule_retry():
+            return  # Step stays RUNNING until the next attempt completes
+        
         if success:
             self.status = StepStatus.SUCCESS
         else:
@@ -60,12 +594,72 @@ class WizardStep(ABC):
         # Notify wizard_app of status change
         self.wizard_app.on_step_status_changed(self)
     
+    def _schedule_retry(self):
+        """Schedule another attempt of failed process if retry_policy allows it"""
+        process = self.process
+        policy = self.retry_policy
+        if policy is None or process is None or process.result in ("cancelled", "stalled"):
+            return False
+        if process.input is not None or process.output is not None:
+            return False  # Streamed chunks can't be sent again
+        if not policy.should_retry(self.attempt, process.error):
+            return False
+        
+        delay = policy.delay(self.attempt)
+        reason = ": {}".format(process.error) if process.error is not None else ""
+        # Old process has finished, its logger writes to the same log as the next attempt
+        process.log("[RETRY] Attempt {} of {} failed{}; retrying in {:.1f} s".format(
+            self.attempt, policy.max_attempts, reason, delay))
+        self.wizard_app.root.after(int(delay * 1000), lambda: self._retry(process))
+        return True
+    
+    def _retry(self, failed_process):
+        """Start next attempt in place (content is not recreated)"""
+        if self.process is not failed_process or self.status != StepStatus.RUNNING:
+            return  # Step was rendered again or wizard is shutting down
+        
+        # Without widgets (headless runner, not rendered yet) output keeps its redirection
+        headless = getattr(self.wizard_app, 'headless', False) or self._detached
+        process = self.create_headless_process() if headless else self.create_process()
+        if process is None:
+            self._on_process_complete(False)
+            return
+        if headless:
+            # Keep console output redirected by the headless runner
+            process.logger = failed_process.logger
+            process.progress_interface = failed_process.progress_interface
+        if not process.root:
+            process.root = self.wizard_app.root
+        
+        self.attempt += 1
+        self.process = process
+        self._bind_state_callback(process)
+        self.wizard_app.processes.register(self, process)
+        self.wizard_app.on_step_retry(self)
+        process.start()
+    
     def can_proceed(self):
         """Whether can proceed to next step"""
+        # Content is not created until prepared data is ready
+        if not self.is_prepared():
+            return False
+        
+        # Inputs are being checked or were rejected
+        if self.validation is not None and not self.validation.is_valid():
+            return False
+        
+        # Process waits for steps it depends on
+        if self.status == StepStatus.PENDING and not self.dependencies_met():
+            return False
+        
         # If no process, can proceed immediately
         if not self.process:
             return True
         
+        # Background process keeps running after the user moves on
+        if self.background and self.status == StepStatus.RUNNING:
+            return True
+        
         # If process completed successfully, can proceed
         return self.status == StepStatus.SUCCESS
     
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+import unittest
+
+from wizard import WizardStep, WizardProcess
+from wizard.enums import StepStatus
+from wizard.headless import HeadlessRoot
+from wizard.process_registry import ProcessRegistry
+from wizard.speculation import CaptureLog, CaptureProgress
+from wizard.state import StateStore
+from wizard.step_graph import StepGraph
+
+
+class App:
+    """Minimal stand-in for WizardApp"""
+    
+    def __init__(self):
+        self.root = HeadlessRoot()
+        self.processes = ProcessRegistry()
+        self.steps = []
+        self.state = StateStore(self.root)
+        self.graph = StepGraph(self.steps, state=self.state)
+    
+    def on_step_status_changed(self, step):
+        pass
+    
+    def run_until(self, condition, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            self.root.run_pending(timeout=0.01)
+
+
+class TextLog:
+    """Text widget stand-in"""
+    
+    def __init__(self):
+        self.text = ""
+    
+    def insert(self, index, text):
+        self.text += text
+    
+    def see(self, index):
+        pass
+    
+    def get(self, start, end):
+        return self.text
+
+
+class Value:
+
+    def __init__(self, value):
+        self.value = value
+    
+    def get(self):
+        return self.value
+
+
+class Progress:
+    """Progress bar stand-in (percent is read back from progress_var)"""
+    
+    def __init__(self):
+        self.percent = None
+        self.progress_var = Value(0)
+    
+    def set_percent(self, percent):
+        self.percent = percent
+        self.progress_var.value = percent
+    
+    def set_eta(self, seconds):
+        pass
+    
+    def set_elapsed_time(self, seconds):
+        pass
+    
+    def get_elapsed(self):
+        return 5.0
+
+
+class DownloadProcess(WizardProcess):
+
+    def __init__(self, gate, **kwargs):
+        super().__init__(**kwargs)
+        self.gate = gate
+    
+    def run(self):
+        self.log("first")
+        self.update_progress(30)
+        self.gate.wait(2)
+        self.log("second")
+        self.set_success(True)
+
+
+class DownloadStep(WizardStep):
+
+    background = True
+    
+    def __init__(self, wizard_app):
+        super().__init__(wizard_app)
+        self.gate = threading.Event()
+        self.log_text = None
+        self.progress = None
+    
+    def create_content(self, content_frame):
+        self.log_text = TextLog()
+        self.progress = Progress()
+    
+    def create_process(self):
+        return DownloadProcess(self.gate, logger=self.log_text, progress_interface=self.progress,
+                               state_callback=self._on_process_complete)
+
+
+class BackgroundStepTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = App()
+        self.step = DownloadStep(self.app)
+        self.app.steps.append(self.step)
+    
+    def tearDown(self):
+        self.step.gate.set()
+    
+    def test_running_background_step_can_proceed(self):
+        self.step.render(None)
+        self.assertEqual(self.step.status, StepStatus.RUNNING)
+        self.assertTrue(self.step.can_proceed())
+        self.step.background = False
+        self.assertFalse(self.step.can_proceed())
+    
+    def test_output_is_kept_while_step_is_not_shown(self):
+        self.step.render(None)
+        process = self.step.process
+        self.app.run_until(lambda: self.step.progress.percent == 30)
+        
+        self.step.detach_content()
+        self.assertIsInstance(process.logger, CaptureLog)
+        self.assertIsInstance(process.progress_interface, CaptureProgress)
+        self.assertEqual(process.logger.lines, ["first"])
+        self.assertEqual(process.progress_interface.percent, 30)
+        self.assertGreaterEqual(process.progress_interface.get_elapsed(), 5.0)
+        
+        self.step.gate.set()
+        self.app.run_until(lambda: self.step.status == StepStatus.SUCCESS)
+        self.assertEqual(process.logger.lines, ["first", "second"])
+        
+        # Returning to the step replays the output into its new widgets
+        self.step.render(None)
+        self.assertIs(self.step.process, process)
+        self.assertEqual(self.step.log_text.text, "first\nsecond\n")
+        self.assertEqual(self.step.progress.percent, 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
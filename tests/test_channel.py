@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import threading
+import unittest
+
+from wizard.channel import Channel, ChannelClosed, ChannelCancelled
+
+
+class ChannelTest(unittest.TestCase):
+
+    def test_items_come_out_in_order_until_closed(self):
+        channel = Channel(capacity=4)
+        for item in range(3):
+            channel.put(item)
+        channel.close()
+        self.assertEqual(list(channel), [0, 1, 2])
+        with self.assertRaises(ChannelClosed):
+            channel.get(timeout=0)
+        with self.assertRaises(ChannelClosed):
+            channel.put(3)
+    
+    def test_full_channel_times_out(self):
+        channel = Channel(capacity=1, name="data")
+        channel.put("a")
+        with self.assertRaises(TimeoutError):
+            channel.put("b", timeout=0.01)
+        self.assertEqual(channel.stats()['producer_waits'], 1)
+    
+    def test_empty_channel_times_out(self):
+        channel = Channel()
+        with self.assertRaises(TimeoutError):
+            channel.get(timeout=0.01)
+        self.assertEqual(channel.stats()['consumer_waits'], 1)
+    
+    def test_put_blocks_until_consumer_reads(self):
+        channel = Channel(capacity=2)
+        received = []
+        
+        def consume():
+            for item in channel:
+                received.append(item)
+        
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        for item in range(50):
+            channel.put(item, timeout=2)
+        channel.close()
+        consumer.join(2)
+        self.assertEqual(received, list(range(50)))
+        stats = channel.stats()
+        self.assertEqual(stats['items_put'], 50)
+        self.assertLessEqual(stats['max_depth'], 2)
+        self.assertEqual(stats['depth'], 0)
+    
+    def test_cancel_wakes_waiting_producer(self):
+        channel = Channel(capacity=1)
+        channel.put("a")
+        errors = []
+        
+        def produce():
+            try:
+                channel.put("b", timeout=2)
+            except ChannelCancelled as e:
+                errors.append(str(e))
+        
+        producer = threading.Thread(target=produce)
+        producer.start()
+        channel.cancel("consumer failed")
+        producer.join(2)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("consumer failed", errors[0])
+        self.assertTrue(channel.is_cancelled())
+        self.assertEqual(len(channel), 0)
+    
+    def test_cancel_drops_remaining_items(self):
+        channel = Channel()
+        channel.put("a")
+        channel.close()
+        channel.cancel("producer failed")
+        with self.assertRaises(ChannelCancelled):
+            channel.get(timeout=0)
+        # First reason is kept
+        channel.cancel("again")
+        self.assertEqual(channel.error, "producer failed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from wizard.processes import CopyFilesProcess
+from wizard.processes import copy_files
+
+
+class CopyFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base)
+        self.source = os.path.join(self.base, "payload")
+        self.destination = os.path.join(self.base, "destination")
+        os.makedirs(os.path.join(self.source, "lib", "plugins"))
+        self.write("bin.sh", b"#!/bin/sh\n", mode=0o755)
+        self.write("lib/small.dat", b"s" * 100)
+        self.write("lib/plugins/large.dat", os.urandom(300 * 1024))
+        os.symlink("lib/small.dat", os.path.join(self.source, "current"))
+        os.utime(os.path.join(self.source, "lib"), (1000000000, 1000000000))
+    
+    def write(self, name, data, mode=None):
+        path = os.path.join(self.source, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(path, mode)
+        return path
+    
+    def copy(self, **kwargs):
+        process = CopyFilesProcess([self.source], self.destination, small_file_size=64 * 1024,
+                                   chunk_size=64 * 1024, **kwargs)
+        process.run()
+        return process
+    
+    def assert_same_tree(self):
+        target = os.path.join(self.destination, "payload")
+        for name in ("bin.sh", "lib/small.dat", "lib/plugins/large.dat"):
+            with open(os.path.join(self.source, name), 'rb') as f, open(os.path.join(target, name), 'rb') as g:
+                self.assertEqual(f.read(), g.read(), name)
+        self.assertEqual(os.readlink(os.path.join(target, "current")), "lib/small.dat")
+    
+    def test_copies_tree_with_metadata(self):
+        process = self.copy()
+        self.assertTrue(process.success)
+        self.assert_same_tree()
+        self.assertEqual(process.files_copied, 3)
+        self.assertEqual(process.done_bytes, process.total_bytes)
+        target = os.path.join(self.destination, "payload")
+        self.assertEqual(os.stat(os.path.join(target, "bin.sh")).st_mode & 0o777, 0o755)
+        self.assertEqual(os.stat(os.path.join(target, "lib")).st_mtime, 1000000000)
+    
+    def test_copies_by_reading_without_kernel_copy(self):
+        with mock.patch.object(copy_files, "_KERNEL_COPY", ()):
+            process = self.copy(workers=1)
+        self.assertTrue(process.success)
+        self.assert_same_tree()
+    
+    def test_single_file_source(self):
+        source = os.path.join(self.source, "bin.sh")
+        process = CopyFilesProcess(source, self.destination, preserve_metadata=False)
+        process.run()
+        with open(os.path.join(self.destination, "bin.sh"), 'rb') as f:
+            self.assertEqual(f.read(), b"#!/bin/sh\n")
+    
+    def test_cancelled_copy_leaves_no_files(self):
+        process = CopyFilesProcess([self.source], self.destination)
+        process.cancel(notify=False)
+        process.run()
+        self.assertFalse(os.path.exists(self.destination))
+    
+    def test_format_size(self):
+        self.assertEqual(copy_files.format_size(100), "100 B")
+        self.assertEqual(copy_files.format_size(1536), "1.5 KB")
+        self.assertEqual(copy_files.format_size(3 * 1024 ** 3), "3.0 GB")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import shutil
+import stat
+import subprocess
+import tarfile
+import tempfile
+import unittest
+import zipfile
+
+from wizard.processes import ExtractArchiveProcess
+
+
+def add_tar_member(archive, name, data=None, link=None, directory=False):
+    info = tarfile.TarInfo(name)
+    if directory:
+        info.type = tarfile.DIRTYPE
+        info.mode = 0o755
+    elif link is not None:
+        info.type = tarfile.SYMTYPE
+        info.linkname = link
+    else:
+        info.size = len(data)
+    archive.addfile(info, io.BytesIO(data) if data is not None else None)
+
+
+def add_zip_link(archive, name, link):
+    info = zipfile.ZipInfo(name)
+    info.external_attr = (stat.S_IFLNK | 0o777) << 16
+    archive.writestr(info, link)
+
+
+class ExtractArchiveTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base)
+        self.destination = os.path.join(self.base, "destination")
+        os.makedirs(os.path.join(self.base, "outside"))
+        with open(os.path.join(self.base, "outside", "victim"), 'w') as f:
+            f.write("victim")
+    
+    def extract(self, archive):
+        process = ExtractArchiveProcess(archive, self.destination)
+        process.run()
+        return process
+    
+    def make_tar(self, build):
+        path = os.path.join(self.base, "archive.tar.gz")
+        with tarfile.open(path, "w:gz") as archive:
+            build(archive)
+        return path
+    
+    def make_zip(self, build):
+        path = os.path.join(self.base, "archive.zip")
+        with zipfile.ZipFile(path, "w") as archive:
+            build(archive)
+        return path
+    
+    def assert_rejected(self, archive):
+        with self.assertRaises(ValueError):
+            self.extract(archive)
+        self.assertEqual(os.listdir(self.base + "/outside"), ["victim"])
+    
+    def test_tar_with_dot_members(self):
+        def build(archive):
+            add_tar_member(archive, "./", directory=True)
+            add_tar_member(archive, "./a.txt", b"a")
+            add_tar_member(archive, "./d/", directory=True)
+            add_tar_member(archive, "./d/b", b"b")
+        process = self.extract(self.make_tar(build))
+        self.assertTrue(process.success)
+        self.assertEqual(process.files_extracted, 2)
+        with open(os.path.join(self.destination, "d", "b")) as f:
+            self.assertEqual(f.read(), "b")
+    
+    @unittest.skipUnless(shutil.which("tar"), "tar command not available")
+    def test_tar_created_with_change_directory(self):
+        source = os.path.join(self.base, "source")
+        os.makedirs(os.path.join(source, "d"))
+        for name in ("a.txt", os.path.join("d", "b")):
+            with open(os.path.join(source, name), 'w') as f:
+                f.write(name)
+        archive = os.path.join(self.base, "x.tgz")
+        subprocess.check_call(["tar", "czf", archive, "-C", source, "."])
+        process = self.extract(archive)
+        self.assertTrue(process.success)
+        self.assertTrue(os.path.isfile(os.path.join(self.destination, "d", "b")))
+    
+    def test_tar_rejects_parent_directory(self):
+        self.assert_rejected(self.make_tar(lambda archive: add_tar_member(archive, "../evil", b"x")))
+    
+    def test_tar_rejects_absolute_path(self):
+        evil = os.path.join(self.base, "outside", "absolute")
+        self.assert_rejected(self.make_tar(lambda archive: add_tar_member(archive, evil, b"x")))
+    
+    def test_tar_rejects_absolute_link(self):
+        self.assert_rejected(self.make_tar(lambda archive: add_tar_member(archive, "l", link="/etc")))
+    
+    def test_tar_rejects_write_through_link(self):
+        def build(archive):
+            add_tar_member(archive, "l", link=".")
+            add_tar_member(archive, "l/../../outside/evil", b"x")
+        self.assert_rejected(self.make_tar(build))
+    
+    def test_tar_rejects_chained_links(self):
+        def build(archive):
+            add_tar_member(archive, "sub", link=".")
+            add_tar_member(archive, "up", link="sub/..")
+            add_tar_member(archive, "v", link="up/../outside/victim")
+        self.assert_rejected(self.make_tar(build))
+        self.assertFalse(os.path.lexists(os.path.join(self.destination, "v")))
+    
+    def test_tar_allows_links_inside(self):
+        def build(archive):
+            add_tar_member(archive, "d/f", b"f")
+            add_tar_member(archive, "sub", link=".")
+            add_tar_member(archive, "l", link="sub/d/f")
+        self.assertTrue(self.extract(self.make_tar(build)).success)
+        with open(os.path.join(self.destination, "l")) as f:
+            self.assertEqual(f.read(), "f")
+    
+    def test_zip_rejects_parent_directory(self):
+        self.assert_rejected(self.make_zip(lambda archive: archive.writestr("../../evil", "x")))
+    
+    def test_zip_rejects_chained_links(self):
+        def build(archive):
+            add_zip_link(archive, "sub", ".")
+            add_zip_link(archive, "up", "sub/..")
+            add_zip_link(archive, "v", "up/../outside/victim")
+        self.assert_rejected(self.make_zip(build))
+        self.assertFalse(os.path.lexists(os.path.join(self.destination, "v")))
+    
+    def test_zip_extracts_files(self):
+        def build(archive):
+            archive.writestr("d/a.txt", "a" * 1000)
+            archive.writestr("b.txt", "b")
+        process = self.extract(self.make_zip(build))
+        self.assertTrue(process.success)
+        self.assertEqual(process.done_bytes, process.total_bytes)
+        with open(os.path.join(self.destination, "d", "a.txt")) as f:
+            self.assertEqual(f.read(), "a" * 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import shutil
+import tempfile
+import tkinter as tk
+import unittest
+
+from wizard import WizardStep, WizardProcess
+from wizard.channel import ChannelCancelled
+from wizard.enums import StepStatus
+from wizard.headless import HeadlessRoot, HeadlessRunner, StreamLogger
+
+
+class WorkProcess(WizardProcess):
+
+    def __init__(self, succeed, **kwargs):
+        super().__init__(**kwargs)
+        self.succeed = succeed
+    
+    def run(self):
+        self.log("working")
+        self.update_progress(50)
+        self.update_progress(100)
+        self.set_success(self.succeed)
+
+
+class WorkStep(WizardStep):
+
+    def __init__(self, wizard_app):
+        super().__init__(wizard_app)
+        self.outcome = "ok"
+    
+    def create_content(self, content_frame):
+        pass
+    
+    def create_process(self):
+        return WorkProcess(self.outcome == "ok", state_callback=self._on_process_complete)
+
+
+class BrokenPrepareStep(WorkStep):
+
+    def prepare(self):
+        raise RuntimeError("no data")
+
+
+class SkippedStep(WorkStep):
+
+    def is_enabled(self):
+        return False
+
+
+class Value:
+    """Tk variable stand-in"""
+    
+    def __init__(self, value):
+        self.value = value
+    
+    def get(self):
+        return self.value
+    
+    def trace_add(self, mode, callback):
+        pass
+
+
+class PathStep(WorkStep):
+
+    def __init__(self, wizard_app):
+        super().__init__(wizard_app)
+        self.add_validator("path", self.check_path, Value("relative"))
+    
+    def check_path(self, path):
+        return None if path.startswith("/") else "Path must be absolute"
+
+
+class ProduceProcess(WizardProcess):
+
+    def run(self):
+        for chunk in range(20):
+            self.send(chunk)
+        self.set_success(True)
+
+
+class ConsumeProcess(WizardProcess):
+
+    def __init__(self, step, **kwargs):
+        super().__init__(**kwargs)
+        self.step = step
+    
+    def run(self):
+        for chunk in self.receive():
+            if chunk == self.step.fail_at:
+                raise RuntimeError("bad chunk")
+            self.step.received.append(chunk)
+        self.set_success(True)
+
+
+class ProduceStep(WorkStep):
+
+    stream_capacity = 2
+    
+    def create_process(self):
+        return ProduceProcess(state_callback=self._on_process_complete)
+
+
+class ConsumeStep(WorkStep):
+
+    interactive = False
+    stream_from = ProduceStep
+    
+    def __init__(self, wizard_app):
+        super().__init__(wizard_app)
+        self.received = []
+        self.fail_at = None
+    
+    def create_process(self):
+        return ConsumeProcess(self, state_callback=self._on_process_complete)
+
+
+class SkippedConsumeStep(ConsumeStep):
+
+    def is_enabled(self):
+        return False
+
+
+class FormConsumeStep(ConsumeStep):
+
+    interactive = True
+
+
+class HeadlessRootTest(unittest.TestCase):
+
+    def test_runs_due_callbacks_in_order(self):
+        root = HeadlessRoot()
+        calls = []
+        root.after(20, calls.append, "late")
+        root.after(0, calls.append, "early")
+        cancelled = root.after(0, calls.append, "cancelled")
+        root.after_cancel(cancelled)
+        self.assertEqual(root.pending_count(), 2)
+        self.assertEqual(root.run_pending(timeout=0), 1)
+        self.assertEqual(root.run_pending(timeout=1), 1)
+        self.assertEqual(calls, ["early", "late"])
+        self.assertEqual(root.pending_count(), 0)
+
+
+class StreamLoggerTest(unittest.TestCase):
+
+    def test_writes_prefixed_lines_to_stream_and_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "install.log")
+        stream = io.StringIO()
+        logger = StreamLogger(stream, path)
+        child = StreamLogger(prefix="    ", parent=logger)
+        child.insert(tk.END, "one\ntwo\n")
+        logger.close()
+        self.assertEqual(stream.getvalue(), "    one\n    two\n")
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), "    one\n    two\n")
+
+
+class HeadlessRunnerTest(unittest.TestCase):
+
+    def run_wizard(self, step_classes, answers=None):
+        self.output = io.StringIO()
+        self.runner = HeadlessRunner(answers=answers, stream=self.output)
+        self.steps = [step_class(self.runner) for step_class in step_classes]
+        self.runner.set_steps(self.steps)
+        return self.runner.run()
+    
+    def test_success(self):
+        self.assertTrue(self.run_wizard([WorkStep, WorkStep]))
+        output = self.output.getvalue()
+        self.assertIn("    working", output)
+        self.assertIn("100%", output)
+        self.assertIn("Wizard completed successfully", output)
+        self.assertIs(self.runner.steps[self.runner.current_step_index], self.runner._end_success_step)
+    
+    def test_failure_routes_to_end_fail_step(self):
+        self.assertFalse(self.run_wizard([WorkStep], {"WorkStep": {"outcome": "fail"}}))
+        self.assertIs(self.runner.failed_step, self.steps[0])
+        self.assertIs(self.runner.steps[self.runner.current_step_index], self.runner._end_fail_step)
+        self.assertIn("Wizard completed with errors", self.output.getvalue())
+    
+    def test_unknown_answer_fails_step(self):
+        self.assertFalse(self.run_wizard([WorkStep], {"WorkStep": {"missing": 1}}))
+        self.assertIn("Invalid answers", self.output.getvalue())
+    
+    def test_prepare_error_fails_step(self):
+        self.assertFalse(self.run_wizard([BrokenPrepareStep]))
+        self.assertIn("Preparation failed: no data", self.output.getvalue())
+    
+    def test_tk_default_root_is_restored(self):
+        previous = getattr(tk, '_default_root', None)
+        self.assertTrue(self.run_wizard([WorkStep]))
+        self.assertIs(getattr(tk, '_default_root', None), previous)
+    
+    def test_disabled_step_is_skipped(self):
+        self.assertTrue(self.run_wizard([WorkStep, SkippedStep]))
+        output = self.output.getvalue()
+        self.assertNotIn("Skipped", output)
+        self.assertIsNone(self.steps[1].process)
+    
+    def test_invalid_input_fails_step(self):
+        self.assertFalse(self.run_wizard([PathStep]))
+        self.assertIn("Invalid input 'path': Path must be absolute", self.output.getvalue())
+        self.assertIsNone(self.steps[0].process)
+    
+    def test_streaming_steps_run_together(self):
+        self.assertTrue(self.run_wizard([ProduceStep, ConsumeStep]))
+        self.assertEqual(self.steps[1].received, list(range(20)))
+        self.assertIn("Streaming to 'Consume'", self.output.getvalue())
+        self.assertLessEqual(self.steps[0].process.output.stats()['max_depth'], 2)
+    
+    def test_failed_consumer_stops_producer(self):
+        self.assertFalse(self.run_wizard([ProduceStep, ConsumeStep], {"ConsumeStep": {"fail_at": 3}}))
+        self.assertEqual(self.steps[1].received, [0, 1, 2])
+        self.assertTrue(self.steps[0].is_failed())
+        self.assertIsInstance(self.steps[0].process.error, ChannelCancelled)
+    
+    
+    def test_interactive_consumer_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.run_wizard([ProduceStep, FormConsumeStep])
+        with self.assertRaises(ValueError):
+            self.run_wizard([ProduceStep, WorkStep, ConsumeStep])
+    
+    def test_skipped_consumer_does_not_block_producer(self):
+        self.assertTrue(self.run_wizard([ProduceStep, SkippedConsumeStep]))
+        self.assertIsNone(self.steps[0].process.output)
+        self.assertIsNone(self.steps[1].process)
+    
+    def test_consumer_that_already_ran_does_not_block_producer(self):
+        self.output = io.StringIO()
+        self.runner = HeadlessRunner(stream=self.output)
+        producer, consumer = ProduceStep(self.runner), ConsumeStep(self.runner)
+        self.runner.set_steps([producer, consumer])
+        consumer.status = StepStatus.SUCCESS
+        self.assertTrue(self.runner.run())
+        self.assertIsNone(producer.process.output)
+        self.assertEqual(consumer.received, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
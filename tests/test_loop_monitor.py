@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import time
+import unittest
+
+from wizard.headless import HeadlessRoot
+from wizard.loop_monitor import EventLoopMonitor
+
+
+def run_loop(root, seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        root.run_pending(timeout=0.01)
+
+
+class EventLoopMonitorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = HeadlessRoot()
+        self.monitor = EventLoopMonitor(self.root, interval_ms=10, stall_threshold_ms=100)
+        self.addCleanup(self.monitor.stop)
+    
+    def test_collects_latency_samples(self):
+        self.monitor.start()
+        run_loop(self.root, 0.2)
+        self.assertGreater(self.monitor.samples, 5)
+        self.assertEqual(sum(count for bound, count in self.monitor.histogram()), self.monitor.samples)
+        self.assertEqual(self.monitor.stalls, [])
+    
+    def test_stall_reports_main_thread_stack(self):
+        def blocking_callback():
+            time.sleep(0.4)
+        
+        self.monitor.start()
+        self.root.after(0, blocking_callback)
+        run_loop(self.root, 0.5)
+        self.assertEqual(len(self.monitor.stalls), 1)
+        self.assertIn("blocking_callback", self.monitor.stalls[0]['stack'])
+        self.assertGreaterEqual(self.monitor.max_ms, 100)
+    
+    def test_percentile_uses_bucket_bounds(self):
+        self.monitor.counts[0] = 3  # Up to 1 ms
+        self.monitor.counts[5] = 1  # Up to 50 ms
+        self.monitor.samples = 4
+        self.assertEqual(self.monitor.percentile(50), 1)
+        self.assertEqual(self.monitor.percentile(100), 50)
+    
+    def test_stop_cancels_tick(self):
+        self.monitor.start()
+        self.monitor.stop()
+        self.assertEqual(self.root.pending_count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
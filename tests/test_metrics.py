@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+from wizard import WizardProcess
+from wizard.headless import HeadlessRoot
+from wizard.metrics import MetricsRegistry, TextfileExporter, WIZARD_METRICS
+
+
+class MetricsRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+    
+    def test_counter_with_labels(self):
+        counter = self.registry.counter("installs_total", "Installs", ("result",))
+        counter.inc(result="ok")
+        counter.inc(2, result="ok")
+        counter.inc(result="fail")
+        self.assertEqual(counter.get(result="ok"), 3)
+        self.assertEqual(self.registry.render(),
+                         '# HELP installs_total Installs\n'
+                         '# TYPE installs_total counter\n'
+                         'installs_total{result="ok"} 3\n'
+                         'installs_total{result="fail"} 1\n')
+    
+    def test_wrong_labels_raise(self):
+        counter = self.registry.counter("installs_total", labelnames=("result",))
+        with self.assertRaises(ValueError):
+            counter.inc(step="Copy")
+    
+    def test_same_name_returns_same_metric(self):
+        self.assertIs(self.registry.counter("a"), self.registry.counter("a"))
+        with self.assertRaises(ValueError):
+            self.registry.gauge("a")
+    
+    def test_gauge_function(self):
+        self.registry.gauge("answer", function=lambda: 42)
+        self.assertIn("answer 42\n", self.registry.render())
+    
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.registry.histogram("seconds", "Durations", buckets=(1, 5))
+        for value in (0.5, 2, 10):
+            histogram.observe(value)
+        self.assertEqual(histogram.get_count(), 3)
+        lines = self.registry.render().splitlines()[2:]
+        self.assertEqual(lines, [
+            'seconds_bucket{le="1"} 1',
+            'seconds_bucket{le="5"} 2',
+            'seconds_bucket{le="+Inf"} 3',
+            'seconds_sum 12.5',
+            'seconds_count 3',
+        ])
+    
+    def test_label_values_are_escaped(self):
+        self.registry.counter("c", labelnames=("step",)).inc(step='a"b\\c\nd')
+        self.assertIn('c{step="a\\"b\\\\c\\nd"} 1', self.registry.render())
+    
+    def test_textfile_exporter_writes_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "wizard.prom")
+        self.registry.counter("c").inc()
+        exporter = TextfileExporter(self.registry, path, interval=60)
+        exporter.start()
+        exporter.stop()
+        with open(path, encoding='utf-8') as f:
+            self.assertIn("c 1\n", f.read())
+        self.assertEqual(os.listdir(directory), ["wizard.prom"])
+
+
+class WizardMetricsTest(unittest.TestCase):
+
+    def test_progress_outcomes_are_counted(self):
+        updates = WIZARD_METRICS['progress_updates']
+        before = {outcome: updates.get(outcome=outcome) for outcome in ("applied", "coalesced", "dropped")}
+        root = HeadlessRoot()
+        process = WizardProcess(progress_interface=type("Progress", (), {
+            'set_percent': lambda self, percent: None, 'set_eta': lambda self, eta: None})(), root=root)
+        for percent in (10, 20, 30):
+            process.update_progress(percent)
+        root.run_pending(timeout=0)
+        WizardProcess().update_progress(10)  # No progress interface
+        self.assertEqual(updates.get(outcome="applied") - before["applied"], 1)
+        self.assertEqual(updates.get(outcome="coalesced") - before["coalesced"], 2)
+        self.assertEqual(updates.get(outcome="dropped") - before["dropped"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
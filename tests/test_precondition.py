@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+import unittest
+
+from wizard.headless import HeadlessRoot
+from wizard.steps.precondition_step import PreconditionCheck, PreconditionProcess
+
+
+class Log:
+
+    def __init__(self):
+        self.lines = []
+    
+    def insert(self, index, text):
+        self.lines.extend(text.splitlines())
+    
+    def see(self, index):
+        pass
+
+
+def check_disk_space():
+    return "120 GB free"
+
+
+def check_port():
+    return False
+
+
+def check_permissions():
+    raise PermissionError("cannot write /opt")
+
+
+class PreconditionProcessTest(unittest.TestCase):
+
+    def run_checks(self, checks, **kwargs):
+        root = HeadlessRoot()
+        outcome = []
+        updates = []
+        process = PreconditionProcess(checks, root=root, logger=Log(), state_callback=outcome.append,
+                                      result_callback=updates.extend, **kwargs)
+        process.start()
+        deadline = time.monotonic() + 5
+        while not outcome and time.monotonic() < deadline:
+            root.run_pending(timeout=0.01)
+        root.run_pending(timeout=0)
+        self.updates = updates
+        return process, outcome
+    
+    def test_check_names(self):
+        self.assertEqual(PreconditionCheck(check_disk_space).name, "Disk space")
+        self.assertEqual(PreconditionCheck(check_port, name="Port 8080 free").name, "Port 8080 free")
+    
+    def test_results_of_passed_failed_and_warning_checks(self):
+        process, outcome = self.run_checks([
+            PreconditionCheck(check_disk_space),
+            PreconditionCheck(check_port),
+            PreconditionCheck(check_permissions, required=False),
+        ])
+        self.assertEqual(outcome, [False])
+        statuses = [(result['status'], result['detail']) for result in process.results]
+        self.assertEqual(statuses, [("passed", "120 GB free"), ("failed", ""),
+                                    ("warning", "cannot write /opt")])
+        self.assertIn("[WARN] Permissions", "\n".join(process.logger.lines))
+        self.assertIn("1 of 3 checks passed", process.logger.lines)
+        self.assertEqual(set(self.updates), {0, 1, 2})
+    
+    def test_warnings_do_not_fail(self):
+        process, outcome = self.run_checks([
+            PreconditionCheck(check_disk_space),
+            PreconditionCheck(check_port, required=False),
+        ])
+        self.assertEqual(outcome, [True])
+    
+    def test_slow_check_times_out(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        started = time.monotonic()
+        process, outcome = self.run_checks([
+            PreconditionCheck(lambda: release.wait(5), name="Slow", timeout=0.1),
+            PreconditionCheck(check_disk_space),
+        ])
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(outcome, [False])
+        self.assertEqual(process.results[0]['status'], "failed")
+        self.assertEqual(process.results[0]['detail'], "timed out")
+        self.assertEqual(process.results[1]['status'], "passed")
+    
+    def test_checks_run_concurrently_up_to_max_workers(self):
+        lock = threading.Lock()
+        active = [0, 0]  # current, maximum
+        
+        def check():
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+        
+        process, outcome = self.run_checks([PreconditionCheck(check, name=str(i)) for i in range(6)],
+                                           max_workers=3)
+        self.assertEqual(outcome, [True])
+        self.assertEqual(active[1], 3)
+    
+    def test_max_workers_below_one_runs_checks_one_at_a_time(self):
+        process, outcome = self.run_checks([PreconditionCheck(check_disk_space),
+                                            PreconditionCheck(check_disk_space, name="Again")], max_workers=0)
+        self.assertEqual(process.max_workers, 1)
+        self.assertEqual(outcome, [True])
+
+
+if __name__ == "__main__":
+    unittest.main()
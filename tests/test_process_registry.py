@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+import unittest
+
+from wizard import WizardProcess
+from wizard.enums import ProcessPolicy
+from wizard.process_registry import ProcessRegistry
+
+
+class BlockingProcess(WizardProcess):
+    """Runs until released or cancelled"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.release_event = threading.Event()
+    
+    def run(self):
+        while not self.release_event.wait(0.01):
+            if self.is_cancelled():
+                return
+        self.set_success(True)
+
+
+class StubbornProcess(WizardProcess):
+    """Ignores cancel for a while"""
+    
+    def run(self):
+        time.sleep(0.5)
+
+
+class Step:
+    """Minimal step owning processes"""
+    
+    process_policy = ProcessPolicy.CANCEL
+    
+    def __init__(self):
+        self.process = None
+        self.results = []
+    
+    def get_display_name(self):
+        return "Step"
+    
+    def start(self, registry, process_class=BlockingProcess):
+        self.process = process_class(state_callback=self.results.append)
+        registry.register(self, self.process)
+        self.process.start()
+        return self.process
+
+
+class ProcessRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = ProcessRegistry(join_timeout=2.0)
+        self.step = Step()
+        self.addCleanup(self.registry.cancel_all, 1.0)
+    
+    def test_register_and_release(self):
+        process = self.step.start(self.registry)
+        self.assertIs(process.owner, self.step)
+        self.assertIs(self.registry.owned_by(self.step), process)
+        self.assertEqual(self.registry.live(), [process])
+        process.release_event.set()
+        process.wait(1)
+        self.assertEqual(self.registry.live(), [])
+        self.assertIsNone(self.registry.owned_by(self.step))
+        self.assertEqual(process.result, "success")
+    
+    def test_cancel_policy_stops_previous_process(self):
+        process = self.step.start(self.registry)
+        self.assertIsNone(self.registry.retire(self.step, ProcessPolicy.CANCEL))
+        process.wait(1)
+        self.assertFalse(process.is_alive())
+        self.assertTrue(process.is_cancelled())
+        self.assertEqual(self.step.results, [])  # cancel(notify=False)
+    
+    def test_cancel_policy_does_not_wait_for_thread(self):
+        self.registry.join_timeout = 0.05
+        process = self.step.start(self.registry, StubbornProcess)
+        started = time.monotonic()
+        self.assertIsNone(self.registry.retire(self.step, ProcessPolicy.CANCEL))
+        self.assertLess(time.monotonic() - started, 0.2)
+        self.assertTrue(process.is_alive())
+        self.assertEqual(self.registry.reap(), [])
+        
+        time.sleep(0.06)
+        with self.assertLogs("wizard.process_registry", level="WARNING"):
+            self.assertEqual(self.registry.reap(), [process])
+        self.assertEqual(self.registry.reap(), [])  # Reported once
+        process.wait(1)
+    
+    def test_reap_forgets_processes_that_exited(self):
+        self.registry.join_timeout = 0.0
+        process = self.step.start(self.registry)
+        self.registry.retire(self.step, ProcessPolicy.CANCEL)
+        process.wait(1)
+        self.assertEqual(self.registry.reap(), [])
+    
+    def test_reuse_policy_keeps_running_process(self):
+        process = self.step.start(self.registry)
+        self.assertIs(self.registry.retire(self.step, ProcessPolicy.REUSE), process)
+        self.assertFalse(process.is_cancelled())
+    
+    def test_reuse_policy_keeps_successful_process(self):
+        process = self.step.start(self.registry)
+        process.release_event.set()
+        process.wait(1)
+        self.assertIs(self.registry.retire(self.step, ProcessPolicy.REUSE), process)
+    
+    def test_adopt_policy_detaches_running_process(self):
+        process = self.step.start(self.registry)
+        self.assertIsNone(self.registry.retire(self.step, ProcessPolicy.ADOPT))
+        self.assertIsNone(process.state_callback)
+        self.assertIsNone(self.registry.owned_by(self.step))
+        self.assertEqual([worker['state'] for worker in self.registry.snapshot()], ["adopted"])
+        process.release_event.set()
+        process.wait(1)
+        self.assertEqual(self.registry.live(), [])
+        self.assertEqual(self.step.results, [])
+    
+    def test_snapshot_lists_workers_oldest_first(self):
+        first = self.step.start(self.registry)
+        time.sleep(0.02)
+        second = Step().start(self.registry)
+        second.heartbeat()
+        workers = self.registry.snapshot()
+        self.assertEqual([worker['state'] for worker in workers], ["running", "running"])
+        self.assertGreater(workers[0]['age'], workers[1]['age'])
+        self.assertEqual(workers[0]['process'], "BlockingProcess")
+        self.assertIsNotNone(workers[1]['last_heartbeat'])
+        second.pause()
+        self.assertEqual(self.registry.snapshot()[1]['state'], "paused")
+        first.cancel(notify=False)
+        self.assertEqual(self.registry.snapshot()[0]['state'], "cancelling")
+        second.resume()
+    
+    def test_cancel_all_returns_stragglers(self):
+        self.step.start(self.registry, StubbornProcess)
+        stragglers = self.registry.cancel_all(timeout=0.05)
+        self.assertEqual(len(stragglers), 1)
+        stragglers[0].wait(1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import io
+import unittest
+
+from wizard import WizardStep, WizardProcess, HeadlessRunner
+from wizard.retry import RetryPolicy
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def test_delays_grow_exponentially_up_to_max(self):
+        policy = RetryPolicy(max_attempts=10, initial_delay=1.0, multiplier=2.0, max_delay=5.0, jitter=0)
+        self.assertEqual([policy.delay(attempt) for attempt in range(1, 6)], [1.0, 2.0, 4.0, 5.0, 5.0])
+    
+    def test_jitter_stays_within_fraction(self):
+        policy = RetryPolicy(initial_delay=10.0, jitter=0.2)
+        delays = [policy.delay(1) for i in range(200)]
+        self.assertTrue(all(8.0 <= delay <= 12.0 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+    
+    def test_attempt_limit(self):
+        policy = RetryPolicy(max_attempts=3)
+        error = RuntimeError()
+        self.assertTrue(policy.should_retry(1, error))
+        self.assertTrue(policy.should_retry(2, error))
+        self.assertFalse(policy.should_retry(3, error))
+    
+    def test_retryable_exception_classes(self):
+        policy = RetryPolicy(retryable=(ConnectionError, TimeoutError))
+        self.assertTrue(policy.should_retry(1, ConnectionResetError()))
+        self.assertFalse(policy.should_retry(1, ValueError()))
+    
+    def test_retryable_callable(self):
+        policy = RetryPolicy(retryable=lambda error: "busy" in str(error))
+        self.assertTrue(policy.should_retry(1, OSError("resource busy")))
+        self.assertFalse(policy.should_retry(1, OSError("denied")))
+    
+    def test_failures_without_exception(self):
+        self.assertFalse(RetryPolicy().should_retry(1, None))
+        self.assertTrue(RetryPolicy(retry_failures=True).should_retry(1, None))
+
+
+class FlakyProcess(WizardProcess):
+
+    def __init__(self, step, **kwargs):
+        super().__init__(**kwargs)
+        self.step = step
+    
+    def run(self):
+        self.step.runs += 1
+        if self.step.runs < self.step.succeed_on:
+            raise ConnectionError("refused")
+        self.set_success(True)
+
+
+class FlakyStep(WizardStep):
+
+    retry_policy = RetryPolicy(max_attempts=3, initial_delay=0.01, jitter=0)
+    
+    def __init__(self, wizard_app, succeed_on):
+        super().__init__(wizard_app)
+        self.runs = 0
+        self.succeed_on = succeed_on
+    
+    def create_content(self, content_frame):
+        pass
+    
+    def create_process(self):
+        return FlakyProcess(self, state_callback=self._on_process_complete)
+
+
+class StepRetryTest(unittest.TestCase):
+
+    def run_wizard(self, succeed_on):
+        output = io.StringIO()
+        runner = HeadlessRunner(stream=output)
+        step = FlakyStep(runner, succeed_on)
+        runner.set_steps([step])
+        return runner.run(), step, output.getvalue()
+    
+    def test_step_succeeds_on_later_attempt(self):
+        success, step, output = self.run_wizard(succeed_on=3)
+        self.assertTrue(success)
+        self.assertEqual((step.runs, step.attempt), (3, 3))
+        self.assertEqual(output.count("[RETRY]"), 2)
+    
+    def test_step_fails_after_last_attempt(self):
+        success, step, output = self.run_wizard(succeed_on=10)
+        self.assertFalse(success)
+        self.assertEqual(step.runs, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
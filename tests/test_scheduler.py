@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+import unittest
+
+from wizard import WizardStep, WizardProcess
+from wizard.enums import StepStatus
+from wizard.headless import HeadlessRoot
+from wizard.process_registry import ProcessRegistry
+from wizard.scheduler import StepScheduler
+from wizard.state import StateStore
+from wizard.step_graph import StepGraph
+
+
+class App:
+    """Minimal stand-in for WizardApp"""
+    
+    def __init__(self):
+        self.root = HeadlessRoot()
+        self.processes = ProcessRegistry()
+        self.steps = []
+        self.state = StateStore(self.root)
+        self.graph = StepGraph(self.steps, state=self.state)
+        self.current_step_index = 0
+        self.scheduler = StepScheduler(self)
+        self.changed = []
+    
+    def on_step_status_changed(self, step):
+        self.changed.append(step)
+        self.scheduler.on_step_finished(step)
+    
+    def on_step_retry(self, step):
+        pass
+    
+    def run_until(self, condition, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            self.root.run_pending(timeout=0.01)
+
+
+class GateProcess(WizardProcess):
+
+    def __init__(self, step, **kwargs):
+        super().__init__(**kwargs)
+        self.step = step
+    
+    def run(self):
+        self.step.gate.wait(2)
+        if self.is_cancelled():
+            return
+        self.set_success(self.step.succeed)
+
+
+class WorkStep(WizardStep):
+
+    interactive = False
+    
+    def __init__(self, wizard_app, depends_on=(), succeed=True):
+        super().__init__(wizard_app)
+        self.depends_on = depends_on
+        self.succeed = succeed
+        self.gate = threading.Event()
+    
+    def create_content(self, content_frame):
+        pass
+    
+    def create_process(self):
+        return GateProcess(self)
+
+
+class FormStep(WorkStep):
+
+    interactive = True
+
+
+class SkippedStep(WorkStep):
+
+    def is_enabled(self):
+        return False
+
+
+class WidgetStep(WorkStep):
+    """create_process() needs widgets made in create_content()"""
+    
+    def create_content(self, content_frame):
+        self.output = object()
+    
+    def create_process(self):
+        return GateProcess(self, logger=self.output)
+
+
+class SendProcess(GateProcess):
+
+    def run(self):
+        self.step.gate.wait(2)
+        for chunk in range(20):
+            self.send(chunk)
+        self.set_success(True)
+
+
+class ReceiveProcess(GateProcess):
+
+    def run(self):
+        self.step.received = list(self.receive())
+        self.set_success(True)
+
+
+class SendStep(WorkStep):
+
+    stream_capacity = 2
+    
+    def create_process(self):
+        return SendProcess(self)
+
+
+class ReceiveStep(WorkStep):
+
+    def __init__(self, wizard_app, stream_from=None):
+        super().__init__(wizard_app)
+        self.stream_from = stream_from
+        self.received = None
+    
+    def create_process(self):
+        return ReceiveProcess(self)
+
+
+class SchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = App()
+        # Step the user is on; its process is started when it is rendered
+        self.current = self.add(FormStep)
+    
+    def add(self, step_class=WorkStep, **kwargs):
+        step = step_class(self.app, **kwargs)
+        self.app.steps.append(step)
+        return step
+    
+    def tearDown(self):
+        for step in self.app.steps:
+            step.gate.set()
+    
+    def test_independent_steps_run_concurrently(self):
+        first = self.add()
+        second = self.add()
+        dependent = self.add(depends_on=(first, second))
+        
+        started = self.app.scheduler.schedule()
+        self.assertEqual(started, [first, second])
+        self.assertEqual(dependent.status, StepStatus.PENDING)
+        self.assertEqual(self.app.scheduler.running(), [first, second])
+        
+        first.gate.set()
+        self.app.run_until(lambda: first.status == StepStatus.SUCCESS)
+        self.assertEqual(dependent.status, StepStatus.PENDING)
+        
+        second.gate.set()
+        self.app.run_until(lambda: dependent.status == StepStatus.RUNNING)
+        self.assertEqual(dependent.status, StepStatus.RUNNING)
+        dependent.gate.set()
+        self.app.run_until(lambda: not self.app.scheduler.busy())
+        self.assertEqual([first.status, second.status, dependent.status], [StepStatus.SUCCESS] * 3)
+    
+    def test_consumer_starts_with_producer(self):
+        self.app.scheduler.max_concurrent = 1
+        producer = self.add(SendStep)
+        consumer = self.add(ReceiveStep, stream_from=producer)
+        
+        self.assertEqual(self.app.scheduler.schedule(), [producer, consumer])
+        self.assertIs(consumer.process.input, producer.process.output)
+        producer.gate.set()
+        self.app.run_until(lambda: consumer.status != StepStatus.RUNNING)
+        self.assertEqual(consumer.received, list(range(20)))
+    
+    def test_producer_drops_chunks_when_consumer_cannot_start(self):
+        self.app.scheduler.max_concurrent = 1
+        blocker = self.add()
+        producer = self.add(SendStep)
+        consumer = self.add(ReceiveStep, stream_from=producer)
+        
+        self.assertEqual(self.app.scheduler.schedule(), [blocker])
+        # Consumer's process can't be created; producer must not wait for it
+        consumer.create_process = lambda: 1 / 0
+        blocker.gate.set()
+        with self.assertLogs("wizard.wizard_step", level="ERROR"):
+            self.app.run_until(lambda: producer.status == StepStatus.RUNNING)
+        self.assertEqual(consumer.status, StepStatus.FAILED)
+        self.assertIsNone(producer.process.output)
+        producer.gate.set()
+        self.app.run_until(lambda: producer.status != StepStatus.RUNNING)
+        self.assertEqual(producer.status, StepStatus.SUCCESS)
+    
+    def test_interactive_step_stops_reachable_run(self):
+        first = self.add()
+        self.add(FormStep)
+        after_form = self.add()
+        
+        self.assertEqual(self.app.scheduler.schedule(), [first])
+        self.assertEqual(after_form.status, StepStatus.PENDING)
+    
+    def test_max_concurrent_limits_started_steps(self):
+        self.app.scheduler.max_concurrent = 2
+        for _ in range(3):
+            self.add()
+        self.assertEqual(len(self.app.scheduler.schedule()), 2)
+        self.assertEqual(self.app.steps[3].status, StepStatus.PENDING)
+    
+    def test_dependencies_given_as_classes(self):
+        class Base(WorkStep):
+            pass
+        
+        base = self.add(Base)
+        dependent = self.add(depends_on=(Base,))
+        self.assertEqual(dependent.get_dependencies(), [base])
+        self.assertFalse(dependent.dependencies_met())
+    
+    def test_skipped_steps_are_not_started_and_do_not_block(self):
+        skipped = self.add(SkippedStep)
+        dependent = self.add(depends_on=(skipped,))
+        
+        self.assertEqual(self.app.scheduler.schedule(), [dependent])
+        self.assertEqual(skipped.status, StepStatus.PENDING)
+    
+    def test_step_whose_process_needs_widgets_fails(self):
+        broken = self.add(WidgetStep)
+        dependent = self.add(depends_on=(broken,))
+        independent = self.add()
+        
+        with self.assertLogs("wizard.wizard_step", level="ERROR"):
+            self.assertEqual(self.app.scheduler.schedule(), [broken, independent])
+        self.assertEqual(broken.status, StepStatus.FAILED)
+        self.app.root.run_pending(timeout=0)
+        self.assertEqual(dependent.status, StepStatus.FAILED)
+        self.assertEqual(independent.status, StepStatus.RUNNING)
+    
+    def test_failure_cancels_dependents_only(self):
+        failing = self.add(succeed=False)
+        independent = self.add()
+        dependent = self.add(depends_on=(failing,))
+        indirect = self.add(depends_on=(dependent,))
+        
+        self.app.scheduler.schedule()
+        self.assertEqual(self.app.scheduler.dependents(failing), [dependent, indirect])
+        
+        failing.gate.set()
+        self.app.run_until(lambda: failing.status == StepStatus.FAILED)
+        self.assertEqual(dependent.status, StepStatus.FAILED)
+        self.assertEqual(indirect.status, StepStatus.FAILED)
+        self.assertEqual(independent.status, StepStatus.RUNNING)
+        # Cancelled steps are reported once each, so the sidebar shows them failed
+        self.assertEqual(self.app.changed, [failing, dependent, indirect])
+        
+        independent.gate.set()
+        self.app.run_until(lambda: independent.status != StepStatus.RUNNING)
+        self.assertEqual(independent.status, StepStatus.SUCCESS)
+
+
+if __name__ == "__main__":
+    unittest.main()
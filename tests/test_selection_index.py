@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from wizard.steps import SelectionIndex
+
+
+OPTIONS = ["python3-dev", "python3-pip", "Pillow", "pytest", "numpy", "pandas"]
+
+
+class SelectionIndexTest(unittest.TestCase):
+
+    def test_empty_query_returns_all(self):
+        index = SelectionIndex(OPTIONS)
+        self.assertEqual(index.filter(""), list(range(len(OPTIONS))))
+        self.assertEqual(len(index), len(OPTIONS))
+    
+    def test_prefix_mode(self):
+        index = SelectionIndex(OPTIONS, match_mode="prefix")
+        self.assertEqual(index.filter("py"), [0, 1, 3])
+        self.assertEqual(index.filter("PYTHON3-D"), [0])
+        self.assertEqual(index.filter("x"), [])
+    
+    def test_fuzzy_mode(self):
+        index = SelectionIndex(OPTIONS, match_mode="fuzzy")
+        self.assertEqual(index.filter("pdv"), [0])
+        self.assertEqual(index.filter("pas"), [5])
+    
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            SelectionIndex(OPTIONS, match_mode="regex")
+    
+    def test_extended_query_refines_cached_result(self):
+        index = SelectionIndex(OPTIONS, match_mode="prefix")
+        index.filter("p")
+        index._lookup = None  # A full scan would fail from here on
+        self.assertEqual(index.filter("py"), [0, 1, 3])
+        self.assertEqual(index.filter("pyt"), [0, 1, 3])
+        self.assertEqual([query for query, result in index._stack], ["p", "py", "pyt"])
+    
+    def test_deleting_characters_returns_cached_result(self):
+        index = SelectionIndex(OPTIONS)
+        cached = index.filter("pa")
+        index.filter("pan")
+        self.assertIs(index.filter("pa"), cached)
+        self.assertEqual([query for query, result in index._stack], ["pa"])
+    
+    def test_unrelated_query_drops_stack(self):
+        index = SelectionIndex(OPTIONS)
+        index.filter("py")
+        self.assertEqual(index.filter("num"), [4])
+        self.assertEqual([query for query, result in index._stack], ["num"])
+
+
+if __name__ == "__main__":
+    unittest.main()
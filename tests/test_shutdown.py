@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import time
+import unittest
+
+from wizard import WizardProcess
+from wizard.process_registry import ProcessRegistry
+from wizard.shutdown import ShutdownCoordinator
+
+
+class CooperativeProcess(WizardProcess):
+    """Stops soon after cancel and records cleanup"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.cleaned = False
+    
+    def run(self):
+        while not self.is_cancelled():
+            time.sleep(0.01)
+    
+    def cleanup(self):
+        self.cleaned = True
+
+
+class StubbornProcess(CooperativeProcess):
+    """Ignores cancel for a while"""
+    
+    def run(self):
+        time.sleep(0.5)
+
+
+class Sink:
+
+    def __init__(self, calls, fail=False):
+        self.calls = calls
+        self.fail = fail
+    
+    def flush(self):
+        self.calls.append("flush")
+        if self.fail:
+            raise OSError("disk full")
+
+
+class ShutdownCoordinatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = ProcessRegistry()
+        self.coordinator = ShutdownCoordinator(self.registry, deadline=1.0)
+    
+    def start(self, process_class):
+        process = process_class()
+        self.registry.register(None, process)
+        process.start()
+        self.addCleanup(process.wait, 1)
+        return process
+    
+    def test_cancels_processes_then_flushes_and_cleans_up_in_order(self):
+        calls = []
+        process = self.start(CooperativeProcess)
+        self.coordinator.add_sink(Sink(calls))
+        self.coordinator.add_cleanup(lambda: calls.append("first"))
+        self.coordinator.add_cleanup(lambda: calls.append("second"))
+        report = self.coordinator.shutdown()
+        self.assertFalse(process.is_alive())
+        self.assertTrue(process.cleaned)
+        self.assertEqual(calls, ["flush", "second", "first"])
+        self.assertEqual(report['missed'], [])
+        self.assertEqual(report['errors'], [])
+    
+    def test_deadline_reports_stragglers_without_cleaning_them(self):
+        process = self.start(StubbornProcess)
+        started = time.monotonic()
+        report = self.coordinator.shutdown(deadline=0.05)
+        self.assertLess(time.monotonic() - started, 0.4)
+        self.assertEqual(report['missed'], ["StubbornProcess"])
+        self.assertFalse(process.cleaned)
+    
+    def test_errors_are_collected_and_do_not_stop_shutdown(self):
+        calls = []
+        self.coordinator.add_sink(Sink(calls, fail=True))
+        
+        def broken():
+            raise RuntimeError("locked")
+        
+        self.coordinator.add_cleanup(lambda: calls.append("cleanup"))
+        self.coordinator.add_cleanup(broken)
+        report = self.coordinator.shutdown()
+        self.assertEqual(calls, ["flush", "cleanup"])
+        self.assertEqual(len(report['errors']), 2)
+    
+    def test_runs_only_once(self):
+        calls = []
+        self.coordinator.add_cleanup(lambda: calls.append("cleanup"))
+        first = self.coordinator.shutdown()
+        self.assertIs(self.coordinator.shutdown(), first)
+        self.assertEqual(calls, ["cleanup"])
+
+
+if __name__ == "__main__":
+    unittest.main()
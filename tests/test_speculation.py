@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+import unittest
+
+from wizard import WizardStep, WizardProcess
+from wizard.enums import StepStatus
+from wizard.headless import HeadlessRoot
+from wizard.process_registry import ProcessRegistry
+from wizard.speculation import CaptureLog, CaptureProgress
+from wizard.state import StateStore
+from wizard.step_graph import StepGraph
+
+
+class App:
+    """Minimal stand-in for WizardApp"""
+    
+    def __init__(self):
+        self.root = HeadlessRoot()
+        self.processes = ProcessRegistry()
+        self.steps = []
+        self.state = StateStore(self.root)
+        self.graph = StepGraph(self.steps, state=self.state)
+        self.changed = []
+    
+    def on_step_status_changed(self, step):
+        self.changed.append(step.status)
+    
+    def run_until(self, condition, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            self.root.run_pending(timeout=0.01)
+
+
+class TextLog:
+
+    def __init__(self):
+        self.text = ""
+    
+    def insert(self, index, text):
+        self.text += text
+    
+    def see(self, index):
+        pass
+
+
+class LookupProcess(WizardProcess):
+
+    def __init__(self, gate, **kwargs):
+        super().__init__(**kwargs)
+        self.gate = gate
+    
+    def run(self):
+        self.gate.wait(2)
+        self.log("looked up")
+        self.update_progress(100)
+        self.set_success(True)
+
+
+class LookupStep(WizardStep):
+
+    side_effect_free = True
+    
+    def __init__(self, wizard_app):
+        super().__init__(wizard_app)
+        self.created = 0
+        self.key = "a"
+        self.log_text = TextLog()
+        self.gate = threading.Event()
+    
+    def create_content(self, content_frame):
+        pass
+    
+    def speculation_key(self):
+        return self.key
+    
+    def create_process(self):
+        self.created += 1
+        return LookupProcess(self.gate, logger=self.log_text, state_callback=self._on_process_complete)
+
+
+class StateLookupStep(LookupStep):
+
+    def speculation_key(self):
+        return self.wizard_app.state.get("source")
+
+
+class CaptureTest(unittest.TestCase):
+
+    def test_capture_log_replays_lines(self):
+        capture = CaptureLog()
+        capture.insert("end", "one\ntwo\n")
+        log = TextLog()
+        capture.replay(log)
+        self.assertEqual(log.text, "one\ntwo\n")
+    
+    def test_capture_progress_replays_last_values(self):
+        capture = CaptureProgress()
+        capture.set_percent(10)
+        capture.set_percent(40)
+        capture.set_eta(5)
+        target = CaptureProgress()
+        capture.replay(target)
+        self.assertEqual((target.percent, target.eta, target.start_time), (40, 5, capture.start_time))
+
+
+class SpeculationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = App()
+        self.step = LookupStep(self.app)
+    
+    def test_finished_speculation_is_adopted_on_render(self):
+        self.step.gate.set()
+        self.step.start_speculation()
+        process = self.step._speculation[1]
+        self.app.run_until(lambda: self.step._speculation_outcome is not None)
+        self.assertEqual(self.step.status, StepStatus.PENDING)
+        
+        self.step.render(None)
+        self.app.run_until(lambda: self.step.status != StepStatus.RUNNING)
+        self.assertIs(self.step.process, process)
+        self.assertEqual(self.step.status, StepStatus.SUCCESS)
+        self.assertEqual(self.app.changed, [StepStatus.SUCCESS])
+        self.assertIn("looked up", self.step.log_text.text)
+        # One process for the speculation, one unstarted for attach_process()
+        self.assertEqual(self.step.created, 2)
+    
+    def test_changed_key_drops_speculation(self):
+        self.step.start_speculation()
+        process = self.step._speculation[1]
+        self.step.key = "b"
+        self.step.render(None)
+        self.assertIsNot(self.step.process, process)
+        self.assertTrue(process.is_cancelled())
+        self.step.gate.set()
+        self.app.run_until(lambda: self.step.status != StepStatus.RUNNING)
+        self.assertEqual(self.step.status, StepStatus.SUCCESS)
+    
+    def test_step_with_side_effects_is_not_speculated(self):
+        self.step.side_effect_free = False
+        self.step.start_speculation()
+        self.assertIsNone(self.step._speculation)
+        self.assertEqual(self.step.created, 0)
+    
+    
+    def test_changed_state_key_drops_speculation(self):
+        self.app.state.set("source", "a")
+        step = StateLookupStep(self.app)
+        step.start_speculation()
+        process = step._speculation[1]
+        step.on_state_changed({"other": 1})
+        self.assertIsNotNone(step._speculation)
+        
+        self.app.state.set("source", "b")
+        step.on_state_changed({"source": "b"})
+        self.assertIsNone(step._speculation)
+        self.assertTrue(process.is_cancelled())
+        step.gate.set()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+import threading
+import unittest
+
+from wizard.headless import HeadlessRoot
+from wizard.state import StateStore
+
+
+class Variable:
+    """Tk variable stand-in"""
+    
+    def __init__(self, value):
+        self.value = value
+        self.traces = []
+    
+    def get(self):
+        return self.value
+    
+    def set(self, value):
+        self.value = value
+        for callback in self.traces:
+            callback("name", "", "write")
+    
+    def trace_add(self, mode, callback):
+        self.traces.append(callback)
+
+
+class StateStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = HeadlessRoot()
+        self.state = StateStore(self.root)
+        self.changes = []
+    
+    def test_define_sets_default_and_type(self):
+        self.state.define("install_dir", str, "/opt/app")
+        self.assertEqual(self.state.get("install_dir"), "/opt/app")
+        with self.assertRaises(TypeError):
+            self.state.set("install_dir", 5)
+        self.state.set("install_dir", None)
+        self.assertIsNone(self.state.get("install_dir"))
+    
+    def test_define_keeps_existing_value(self):
+        self.state.set("port", 8080)
+        self.state.define("port", int, 80)
+        self.assertEqual(self.state.get("port"), 8080)
+    
+    def test_missing_key(self):
+        with self.assertRaises(KeyError):
+            self.state.get("missing")
+        self.assertEqual(self.state.get("missing", "default"), "default")
+        self.assertNotIn("missing", self.state)
+    
+    def test_changes_are_batched_per_idle_cycle(self):
+        self.state.subscribe(None, self.changes.append)
+        self.state.set("a", 1)
+        self.state.set("a", 2)
+        self.state.update({"b": 3, "c": 4})
+        self.assertEqual(self.root.pending_count(), 1)
+        self.root.run_pending(timeout=0)
+        self.assertEqual(self.changes, [{"a": 2, "b": 3, "c": 4}])
+    
+    def test_unchanged_value_does_not_notify(self):
+        self.state.set("a", 1)
+        self.root.run_pending(timeout=0)
+        self.state.subscribe("a", self.changes.append)
+        self.state.set("a", 1)
+        self.assertEqual(self.root.pending_count(), 0)
+        self.assertEqual(self.changes, [])
+    
+    def test_subscriber_gets_only_its_keys(self):
+        unsubscribe = self.state.subscribe(["a", "b"], self.changes.append)
+        self.state.update({"a": 1, "c": 2})
+        self.state.flush()
+        self.state.set("c", 3)
+        self.state.flush()
+        self.assertEqual(self.changes, [{"a": 1}])
+        unsubscribe()
+        self.state.set("a", 5)
+        self.state.flush()
+        self.assertEqual(self.changes, [{"a": 1}])
+    
+    def test_failing_subscriber_does_not_stop_others(self):
+        def broken(changes):
+            raise RuntimeError("broken")
+        self.state.subscribe(None, broken)
+        self.state.subscribe(None, self.changes.append)
+        with self.assertLogs("wizard.state", level="ERROR"):
+            self.state.set("a", 1)
+            self.state.flush()
+        self.assertEqual(self.changes, [{"a": 1}])
+    
+    def test_without_root_subscribers_are_called_from_set(self):
+        state = StateStore()
+        state.subscribe("a", self.changes.append)
+        state.set("a", 1)
+        self.assertEqual(self.changes, [{"a": 1}])
+    
+    def test_track_records_read_versions(self):
+        self.state.set("a", 1)
+        self.state.set("b", 1)
+        with self.state.track() as inputs:
+            self.state.get("a")
+            self.state.get("missing", None)
+        self.assertEqual(set(inputs), {"a", "missing"})
+        self.assertFalse(self.state.changed_since(inputs))
+        self.state.set("b", 2)
+        self.assertFalse(self.state.changed_since(inputs))
+        self.state.set("missing", 1)
+        self.assertTrue(self.state.changed_since(inputs))
+    
+    def test_track_is_per_thread(self):
+        self.state.set("a", 1)
+        with self.state.track() as inputs:
+            thread = threading.Thread(target=self.state.get, args=("a",))
+            thread.start()
+            thread.join()
+        self.assertEqual(inputs, {})
+    
+    def test_computed_is_memoized_until_input_changes(self):
+        self.state.set("a", 1)
+        self.state.set("b", 10)
+        calls = []
+        
+        def total():
+            calls.append(1)
+            return self.state.get("a") * 2
+        
+        computed = self.state.computed(total)
+        self.assertEqual(computed.get(), 2)
+        self.assertEqual(computed.get(), 2)
+        self.state.set("b", 20)
+        self.assertEqual(computed.get(), 2)
+        self.assertEqual(len(calls), 1)
+        self.state.set("a", 3)
+        self.assertEqual(computed.get(), 6)
+        self.assertEqual(len(calls), 2)
+        computed.invalidate()
+        computed.get()
+        self.assertEqual(len(calls), 3)
+    
+    def test_cached_computed_counts_as_read(self):
+        self.state.set("a", 1)
+        computed = self.state.computed(lambda: self.state.get("a"))
+        computed.get()
+        with self.state.track() as inputs:
+            computed.get()
+        self.assertIn("a", inputs)
+    
+    def test_bind_syncs_variable_both_ways(self):
+        variable = Variable(False)
+        self.state.bind("flag", variable)
+        self.assertIs(self.state.get("flag"), False)
+        variable.set(True)
+        self.assertIs(self.state.get("flag"), True)
+        self.root.run_pending(timeout=0)
+        self.state.set("flag", False)
+        self.root.run_pending(timeout=0)
+        self.assertIs(variable.get(), False)
+    
+    def test_bind_takes_existing_value(self):
+        self.state.set("flag", True)
+        variable = Variable(False)
+        self.state.bind("flag", variable)
+        self.assertIs(variable.get(), True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from wizard import WizardStep
+from wizard.enums import StepRole
+from wizard.state import StateStore
+from wizard.step_graph import StepGraph
+
+
+class App:
+    """Minimal stand-in for WizardApp"""
+    
+    def __init__(self):
+        self.state = StateStore()
+
+
+class PlainStep(WizardStep):
+
+    def create_content(self, content_frame):
+        pass
+    
+    def create_process(self):
+        return None
+
+
+class OptionalStep(PlainStep):
+
+    def __init__(self, wizard_app):
+        super().__init__(wizard_app)
+        self.evaluated = 0
+    
+    def is_enabled(self):
+        self.evaluated += 1
+        return self.wizard_app.state.get("custom", False)
+
+
+class StepGraphTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = App()
+        self.welcome = PlainStep(self.app)
+        self.optional = OptionalStep(self.app)
+        self.work = PlainStep(self.app)
+        self.success = PlainStep(self.app)
+        self.fail = PlainStep(self.app)
+        self.steps = [self.welcome, self.optional, self.work, self.success]
+        self.graph = StepGraph(self.steps, roles={
+            StepRole.WELCOME: self.welcome,
+            StepRole.SUCCESS: self.success,
+            StepRole.FAIL: self.fail,
+        }, state=self.app.state)
+    
+    def test_roles_and_indices(self):
+        self.assertIs(self.graph.step_for(StepRole.FAIL), self.fail)
+        self.assertEqual(self.graph.role_of(self.success), StepRole.SUCCESS)
+        self.assertIsNone(self.graph.role_of(self.work))
+        self.assertIsNone(self.graph.role_of(None))
+        self.assertEqual(self.graph.index_of(self.work), 2)
+        self.assertIsNone(self.graph.index_of(self.fail))
+        self.assertTrue(self.graph.has_conditions)
+    
+    def test_disabled_step_is_skipped_both_ways(self):
+        self.assertEqual(self.graph.next_index(0), 2)
+        self.assertEqual(self.graph.prev_index(2), 0)
+        self.assertEqual(self.graph.following(0), [2, 3])
+        self.assertEqual(self.graph.following(0, count=1), [2])
+        self.assertIsNone(self.graph.next_index(3))
+        self.assertIsNone(self.graph.prev_index(0))
+    
+    def test_condition_is_memoized_until_state_changes(self):
+        self.graph.next_index(0)
+        self.graph.next_index(0)
+        self.graph.prev_index(2)
+        self.assertEqual(self.optional.evaluated, 1)
+        
+        self.app.state.set("custom", True)
+        self.assertEqual(self.graph.next_index(0), 1)
+        self.assertEqual(self.graph.prev_index(2), 1)
+        self.assertEqual(self.optional.evaluated, 2)
+    
+    def test_invalidate_evaluates_conditions_again(self):
+        self.graph.next_index(0)
+        self.graph.invalidate()
+        self.graph.next_index(0)
+        self.assertEqual(self.optional.evaluated, 2)
+    
+    def test_conditions_are_evaluated_only_when_reached(self):
+        self.graph.next_index(2)
+        self.assertEqual(self.optional.evaluated, 0)
+    
+    def test_append_adds_fail_step_once(self):
+        self.assertEqual(self.graph.append(self.fail), 4)
+        self.assertEqual(self.graph.append(self.fail), 4)
+        self.assertEqual(len(self.steps), 5)
+        # End fail step is never the next step
+        self.assertIsNone(self.graph.next_index(3))
+    
+    def test_direct_list_changes_are_noticed(self):
+        extra = PlainStep(self.app)
+        self.steps.insert(0, extra)
+        self.assertEqual(self.graph.index_of(self.work), 3)
+        self.assertEqual(self.graph.index_of(extra), 0)
+        self.assertEqual(self.graph.next_index(0), 1)
+    
+    def test_without_state_conditions_are_not_memoized(self):
+        graph = StepGraph(self.steps)
+        graph.next_index(0)
+        graph.next_index(0)
+        self.assertEqual(self.optional.evaluated, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from wizard.tracing import TraceRecorder, get_recorder, set_recorder, traced
+
+
+class TraceRecorderTest(unittest.TestCase):
+
+    def test_span_records_name_category_and_args(self):
+        recorder = TraceRecorder()
+        with recorder.span("load", category="prepare", step="Packages"):
+            pass
+        (name, category, start, end, thread_id, args), = recorder.spans()
+        self.assertEqual((name, category, args), ("load", "prepare", {'step': "Packages"}))
+        self.assertLessEqual(start, end)
+        self.assertEqual(thread_id, threading.get_ident())
+    
+    def test_disabled_recorder_records_nothing(self):
+        recorder = TraceRecorder(enabled=False)
+        with recorder.span("load"):
+            pass
+        recorder.record("process", "process", 0, 1)
+        self.assertEqual(recorder.spans(), [])
+    
+    def test_capacity_keeps_latest_spans(self):
+        recorder = TraceRecorder(capacity=2)
+        for i in range(3):
+            recorder.record("span{}".format(i), "test", i, i + 1)
+        self.assertEqual([span[0] for span in recorder.spans()], ["span1", "span2"])
+    
+    def test_chrome_trace_export(self):
+        recorder = TraceRecorder()
+        start = recorder.now()
+        recorder.record("process", "process", start, start + 2000000, thread_id=7, args={'result': "success"})
+        recorder.name_thread(7, "Worker")
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "trace.json")
+        recorder.dump_chrome_trace(path)
+        with open(path, encoding='utf-8') as f:
+            trace = json.load(f)
+        metadata = [event for event in trace['traceEvents'] if event['ph'] == 'M']
+        spans = [event for event in trace['traceEvents'] if event['ph'] == 'X']
+        self.assertEqual(metadata[0]['args'], {'name': "Worker"})
+        self.assertEqual(spans[0]['name'], "process")
+        self.assertEqual(spans[0]['dur'], 2000.0)
+        self.assertEqual(spans[0]['tid'], 7)
+        self.assertEqual(spans[0]['args'], {'result': "success"})
+    
+    def test_traced_decorator_uses_current_recorder(self):
+        previous = get_recorder()
+        recorder = TraceRecorder()
+        set_recorder(recorder)
+        self.addCleanup(set_recorder, previous)
+        
+        @traced("compute", category="ui")
+        def compute(value):
+            return value * 2
+        
+        self.assertEqual(compute(2), 4)
+        self.assertEqual([(span[0], span[1]) for span in recorder.spans()], [("compute", "ui")])
+
+
+if __name__ == "__main__":
+    unittest.main()
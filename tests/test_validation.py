@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+import itertools
+import threading
+import time
+import unittest
+
+from wizard.headless import HeadlessRoot
+from wizard.validation import FormValidation, ValidationError
+
+
+class Variable:
+    """Tk variable stand-in"""
+    
+    def __init__(self, value):
+        self.value = value
+        self.traces = {}
+        self.trace_ids = itertools.count()
+    
+    def get(self):
+        return self.value
+    
+    def set(self, value):
+        self.value = value
+        for callback in list(self.traces.values()):
+            callback("name", "", "write")
+    
+    def trace_add(self, mode, callback):
+        trace_id = "trace{}".format(next(self.trace_ids))
+        self.traces[trace_id] = callback
+        return trace_id
+    
+    def trace_remove(self, mode, trace_id):
+        del self.traces[trace_id]
+
+
+def check_path(path):
+    if not path.startswith("/"):
+        return "Path must be absolute"
+    return None
+
+
+class FormValidationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = HeadlessRoot()
+        self.changes = []
+        self.validation = FormValidation(self.root, on_change=lambda: self.changes.append(self.validation.is_valid()))
+    
+    def run_until(self, condition, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            self.root.run_pending(timeout=0.01)
+    
+    def test_validate_runs_in_background(self):
+        path = Variable("relative")
+        message = Variable("")
+        self.validation.add("path", check_path, path, message_var=message)
+        self.assertFalse(self.validation.is_valid())
+        self.assertTrue(self.validation.is_pending())
+        
+        self.validation.validate()
+        self.run_until(lambda: not self.validation.is_pending())
+        self.assertEqual(self.validation.errors(), {"path": "Path must be absolute"})
+        self.assertEqual(message.get(), "Path must be absolute")
+        
+        path.set("/opt/app")
+        self.run_until(lambda: not self.validation.is_pending())
+        self.assertTrue(self.validation.is_valid())
+        self.assertEqual(message.get(), "")
+        self.assertEqual(self.changes, [False, True])
+    
+    def test_changes_are_debounced(self):
+        calls = []
+        
+        def record(value):
+            calls.append(value)
+        
+        name = Variable("")
+        self.validation.add("name", record, name, delay_ms=20)
+        for value in ("a", "ab", "abc"):
+            name.set(value)
+        self.assertEqual(self.root.pending_count(), 1)
+        self.run_until(lambda: not self.validation.is_pending())
+        self.assertEqual(calls, ["abc"])
+    
+    def test_superseded_result_is_discarded(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        
+        def slow(value):
+            calls.append(value)
+            if value == "old":
+                started.set()
+                release.wait(2)
+                return "old is invalid"
+            return None
+        
+        value = Variable("old")
+        self.validation.add("value", slow, value, delay_ms=0)
+        self.validation.validate()
+        started.wait(2)
+        value.set("new")
+        release.set()
+        self.run_until(lambda: not self.validation.is_pending())
+        self.assertEqual(calls, ["old", "new"])
+        self.assertTrue(self.validation.is_valid())
+    
+    def test_validation_error_and_unexpected_exception(self):
+        def reject(value):
+            raise ValidationError("Port is in use")
+        
+        def broken(value):
+            raise OSError("disk error")
+        
+        port = Variable(80)
+        self.validation.add("port", reject, port)
+        self.validation.add("disk", broken, [port])
+        with self.assertLogs("wizard.validation", level="ERROR"):
+            errors = self.validation.validate_sync()
+        self.assertEqual(errors, {"port": "Port is in use", "disk": "disk error"})
+    
+    def test_validate_skips_inputs_with_result(self):
+        calls = []
+        value = Variable("/a")
+        self.validation.add("value", lambda v: calls.append(v), value)
+        self.validation.validate_sync()
+        self.validation.validate()
+        self.assertEqual(self.root.pending_count(), 0)
+        self.assertEqual(calls, ["/a"])
+    
+    
+    def test_added_again_replaces_validator_and_trace(self):
+        calls = []
+        path = Variable("/a")
+        for attempt in range(3):
+            # create_content() adds the validator on every render
+            self.validation.add("path", lambda v, attempt=attempt: calls.append((attempt, v)), path, delay_ms=0)
+        self.assertEqual(len(path.traces), 1)
+        path.set("/b")
+        self.run_until(lambda: not self.validation.is_pending())
+        self.assertEqual(calls, [(2, "/b")])
+    
+    def test_unwatch_while_step_is_not_shown(self):
+        path = Variable("/a")
+        self.validation.add("path", check_path, path, delay_ms=0)
+        self.validation.validate_sync()
+        self.validation.unwatch()
+        self.assertEqual(path.traces, {})
+        path.set("relative")
+        self.assertTrue(self.validation.is_valid())
+        
+        self.validation.watch()
+        self.validation.watch()
+        self.assertEqual(len(path.traces), 1)
+        path.set("relative")
+        self.run_until(lambda: not self.validation.is_pending())
+        self.assertEqual(self.validation.errors(), {"path": "Path must be absolute"})
+    
+    def test_checks_share_worker_threads(self):
+        names = []
+        values = [Variable(str(i)) for i in range(10)]
+        for i, value in enumerate(values):
+            self.validation.add(str(i), lambda v: names.append(threading.current_thread().name), value)
+        self.validation.validate()
+        self.run_until(lambda: not self.validation.is_pending())
+        self.assertEqual(len(names), 10)
+        self.assertLessEqual(len(set(names)), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+
+from wizard.processes import VerifyChecksumsProcess
+from wizard.processes.verify_checksums import load_manifest
+
+
+class VerifyChecksumsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base)
+        self.files = {
+            "small.txt": b"small file\n",
+            "data/large.bin": os.urandom(200 * 1024),
+            "data/empty": b"",
+        }
+        os.makedirs(os.path.join(self.base, "data"))
+        for name, data in self.files.items():
+            with open(os.path.join(self.base, name), 'wb') as f:
+                f.write(data)
+        self.manifest = {name: hashlib.sha256(data).hexdigest() for name, data in self.files.items()}
+    
+    def verify(self, manifest=None, **kwargs):
+        process = VerifyChecksumsProcess(manifest or self.manifest, base_dir=self.base,
+                                         buffer_size=64 * 1024, **kwargs)
+        process.run()
+        return process
+    
+    def test_all_files_match(self):
+        process = self.verify()
+        self.assertTrue(process.success)
+        self.assertEqual(process.mismatches, [])
+        self.assertEqual(process.done_bytes, sum(len(data) for data in self.files.values()))
+    
+    def test_manifest_file(self):
+        path = os.path.join(self.base, "SHA256SUMS")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("# checksums\n\n")
+            for name, digest in self.manifest.items():
+                f.write("{} *{}\n".format(digest.upper(), name))
+        self.assertEqual(load_manifest(path), {name: digest.upper() for name, digest in self.manifest.items()})
+        process = VerifyChecksumsProcess(path)
+        process.run()
+        self.assertTrue(process.success)
+    
+    def test_mismatch_and_missing_file(self):
+        manifest = dict(self.manifest)
+        manifest["small.txt"] = "0" * 64
+        manifest["missing"] = "0" * 64
+        process = self.verify(manifest, stop_on_mismatch=False)
+        self.assertFalse(process.success)
+        actual = hashlib.sha256(self.files["small.txt"]).hexdigest()
+        self.assertEqual(sorted(process.mismatches), [("missing", "0" * 64, None),
+                                                      ("small.txt", "0" * 64, actual)])
+    
+    def test_stop_on_first_mismatch(self):
+        manifest = dict(self.manifest)
+        manifest["missing"] = "0" * 64
+        process = self.verify(manifest)
+        self.assertFalse(process.success)
+        self.assertEqual(process.mismatches, [("missing", "0" * 64, None)])
+        # Missing file is found before hashing starts
+        self.assertEqual(process.done_bytes, 0)
+    
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            VerifyChecksumsProcess(self.manifest, algorithm="no-such-hash")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+import unittest
+
+from wizard import WizardProcess
+from wizard.enums import ProcessPolicy
+from wizard.process_registry import ProcessRegistry
+from wizard.watchdog import ProcessWatchdog
+
+
+class HangingProcess(WizardProcess):
+    """Sends one heartbeat, then blocks until released"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.release_event = threading.Event()
+    
+    def run(self):
+        self.heartbeat()
+        self.hang()
+    
+    def hang(self):
+        self.release_event.wait(5)
+
+
+class ChattyProcess(HangingProcess):
+    """Sends heartbeats until released"""
+    
+    def hang(self):
+        while not self.release_event.wait(0.01):
+            self.heartbeat()
+
+
+class ProcessWatchdogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = ProcessRegistry()
+        self.results = []
+    
+    def start(self, process_class, stall_timeout=None):
+        process = process_class(state_callback=self.results.append)
+        process.stall_timeout = stall_timeout
+        self.registry.register(None, process)
+        process.start()
+        self.addCleanup(process.release_event.set)
+        time.sleep(0.02)
+        return process
+    
+    def test_silent_process_is_failed_with_diagnostics(self):
+        process = self.start(HangingProcess)
+        watchdog = ProcessWatchdog(self.registry, stall_timeout=0.05)
+        time.sleep(0.1)
+        self.assertEqual(watchdog.check(), [process])
+        self.assertEqual(self.results, [False])
+        self.assertEqual(process.result, "stalled")
+        self.assertTrue(process.is_cancelled())
+        self.assertIn("in hang", process.diagnostics['stack'])
+        self.assertGreaterEqual(process.diagnostics['silent_seconds'], 0.05)
+        self.assertEqual(watchdog.stalls, [process.diagnostics])
+        self.assertEqual(watchdog.check(), [])  # Failed only once
+    
+    def test_process_sending_heartbeats_is_not_failed(self):
+        self.start(ChattyProcess)
+        watchdog = ProcessWatchdog(self.registry, stall_timeout=0.05)
+        time.sleep(0.1)
+        self.assertEqual(watchdog.check(), [])
+        self.assertEqual(self.results, [])
+    
+    def test_process_timeout_overrides_default(self):
+        self.start(HangingProcess, stall_timeout=10)
+        time.sleep(0.1)
+        self.assertEqual(ProcessWatchdog(self.registry, stall_timeout=0.05).check(), [])
+    
+    def test_without_default_only_processes_with_timeout_are_watched(self):
+        self.start(HangingProcess)
+        watched = self.start(HangingProcess, stall_timeout=0.05)
+        time.sleep(0.1)
+        self.assertEqual(ProcessWatchdog(self.registry).check(), [watched])
+    
+    def test_detached_process_is_not_failed(self):
+        process = self.start(HangingProcess)
+        process.detach()
+        time.sleep(0.1)
+        self.assertEqual(ProcessWatchdog(self.registry, stall_timeout=0.05).check(), [])
+    
+    def test_paused_process_is_not_failed(self):
+        process = self.start(HangingProcess)
+        process.pause()
+        time.sleep(0.1)
+        self.assertEqual(ProcessWatchdog(self.registry, stall_timeout=0.05).check(), [])
+        process.resume()
+    
+    def test_cancelled_process_that_does_not_stop_is_reported(self):
+        class Step:
+            process_policy = ProcessPolicy.CANCEL
+            
+            def get_display_name(self):
+                return "Step"
+        
+        step = Step()
+        step.process = process = HangingProcess()
+        self.registry.register(step, process)
+        process.start()
+        self.addCleanup(process.release_event.set)
+        self.registry.join_timeout = 0.0
+        self.registry.retire(step)
+        with self.assertLogs("wizard.process_registry", level="WARNING") as logs:
+            ProcessWatchdog(self.registry).check()
+        self.assertIn("HangingProcess of step Step did not stop", logs.output[0])
+    
+    def test_thread_checks_periodically(self):
+        process = self.start(HangingProcess)
+        watchdog = ProcessWatchdog(self.registry, stall_timeout=0.05, interval=0.02)
+        watchdog.start()
+        self.addCleanup(watchdog.stop)
+        deadline = time.monotonic() + 2
+        while process.result is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(process.result, "stalled")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+import unittest
+
+from wizard import WizardProcess
+from wizard.headless import HeadlessRoot
+
+
+class RecordingProgress:
+
+    def __init__(self):
+        self.percents = []
+    
+    def set_percent(self, percent):
+        self.percents.append(percent)
+    
+    def set_eta(self, seconds):
+        pass
+
+
+class ProgressCoalescingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = HeadlessRoot()
+        self.progress = RecordingProgress()
+        self.process = WizardProcess(progress_interface=self.progress, root=self.root)
+    
+    def test_updates_waiting_for_main_thread_are_coalesced(self):
+        for percent in range(100):
+            self.process.update_progress(percent)
+        self.assertEqual(self.root.pending_count(), 1)
+        self.root.run_pending(timeout=0)
+        self.assertEqual(self.progress.percents, [99])
+    
+    def test_update_after_applied_one_schedules_again(self):
+        self.process.update_progress(10)
+        self.root.run_pending(timeout=0)
+        self.process.update_progress(20)
+        self.root.run_pending(timeout=0)
+        self.assertEqual(self.progress.percents, [10, 20])
+    
+    def test_cancelled_process_drops_updates(self):
+        self.process.update_progress(10)
+        self.process.cancel()
+        self.process.update_progress(20)
+        self.root.run_pending(timeout=0)
+        self.assertEqual(self.progress.percents, [])
+
+
+
+class CountingProcess(WizardProcess):
+    """Counts loop iterations until released"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.count = 0
+        self.release_event = threading.Event()
+    
+    def run(self):
+        while not self.release_event.is_set():
+            if self.is_cancelled():
+                return
+            self.count += 1
+            time.sleep(0.005)
+        self.set_success(True)
+
+
+class PauseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.process = CountingProcess()
+        self.process.start()
+        self.addCleanup(self.process.cancel, False)
+        time.sleep(0.03)
+    
+    def test_paused_process_stops_at_is_cancelled(self):
+        self.process.pause()
+        self.assertTrue(self.process.is_paused())
+        time.sleep(0.03)
+        count = self.process.count
+        time.sleep(0.05)
+        self.assertEqual(self.process.count, count)
+        self.process.resume()
+        self.assertFalse(self.process.is_paused())
+        time.sleep(0.03)
+        self.assertGreater(self.process.count, count)
+        self.assertGreaterEqual(self.process.paused_seconds, 0.08)
+    
+    def test_cancel_wakes_paused_process(self):
+        self.process.pause()
+        time.sleep(0.02)
+        self.process.cancel(notify=False)
+        self.process.wait(1)
+        self.assertFalse(self.process.is_alive())
+        self.assertFalse(self.process.is_paused())
+        self.assertGreaterEqual(self.process.paused_seconds, 0.02)
+    
+    def test_failing_paused_process_ends_pause(self):
+        self.process.pause()
+        self.assertTrue(self.process.fail("stalled"))
+        self.process.wait(1)
+        self.assertFalse(self.process.is_paused())
+        self.assertGreater(self.process.paused_seconds, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
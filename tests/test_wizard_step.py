@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+import unittest
+
+from wizard import WizardStep, WizardProcess
+from wizard.enums import StepStatus
+from wizard.headless import HeadlessRoot
+from wizard.process_registry import ProcessRegistry
+from wizard.state import StateStore
+from wizard.step_graph import StepGraph
+
+
+class App:
+    """Minimal stand-in for WizardApp"""
+    
+    def __init__(self):
+        self.root = HeadlessRoot()
+        self.processes = ProcessRegistry()
+        self.steps = []
+        self.state = StateStore(self.root)
+        self.graph = StepGraph(self.steps, state=self.state)
+        self.changed = []
+    
+    def on_step_status_changed(self, step):
+        self.changed.append(step.status)
+    
+    def run_until(self, condition, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            self.root.run_pending(timeout=0.01)
+
+
+class OutcomeProcess(WizardProcess):
+
+    def __init__(self, succeed, gate, **kwargs):
+        super().__init__(**kwargs)
+        self.succeed = succeed
+        self.gate = gate
+    
+    def run(self):
+        self.gate.wait(2)
+        self.set_success(self.succeed)
+
+
+class InstallStep(WizardStep):
+
+    def __init__(self, wizard_app):
+        super().__init__(wizard_app)
+        self.outcomes = []  # (succeed, gate) of processes to create
+    
+    def create_content(self, content_frame):
+        pass
+    
+    def create_process(self):
+        succeed, gate = self.outcomes.pop(0)
+        return OutcomeProcess(succeed, gate, state_callback=self._on_process_complete)
+
+
+class ProcessCallbackTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = App()
+        self.step = InstallStep(self.app)
+        self.app.steps.append(self.step)
+    
+    def test_queued_callback_of_replaced_process_is_ignored(self):
+        done = threading.Event()
+        done.set()
+        gate = threading.Event()
+        self.addCleanup(gate.set)
+        self.step.outcomes = [(False, done), (True, gate)]
+        
+        self.step.render(None)
+        first = self.step.process
+        first.wait(1)
+        # Failure callback of the first process waits in the event queue
+        self.assertEqual(self.app.root.pending_count(), 1)
+        
+        self.step.render(None)
+        self.assertIsNot(self.step.process, first)
+        self.app.root.run_pending(timeout=0)
+        self.assertEqual(self.step.status, StepStatus.RUNNING)
+        self.assertEqual(self.app.changed, [])
+        
+        gate.set()
+        self.app.run_until(lambda: self.step.status != StepStatus.RUNNING)
+        self.assertEqual(self.step.status, StepStatus.SUCCESS)
+        self.assertEqual(self.app.changed, [StepStatus.SUCCESS])
+    
+    def test_cancel_of_current_process_fails_step(self):
+        gate = threading.Event()
+        self.addCleanup(gate.set)
+        self.step.outcomes = [(True, gate)]
+        self.step.render(None)
+        self.step.process.cancel()
+        self.assertEqual(self.step.status, StepStatus.FAILED)
+
+
+if __name__ == "__main__":
+    unittest.main()